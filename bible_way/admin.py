@@ -20,6 +20,7 @@ from .models import (
     ReadingProgress,
     ReadingNote,
     Highlight,
+    BookIngestionJob,
 )
 
 
@@ -177,6 +178,15 @@ class BookContentAdmin(admin.ModelAdmin):
     raw_id_fields = ('book',)
 
 
+@admin.register(BookIngestionJob)
+class BookIngestionJobAdmin(admin.ModelAdmin):
+    list_display = ('job_id', 'markdown_file_name', 'status', 'stage', 'progress', 'chapters_found', 'attempts', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('markdown_file_name', 'error_message')
+    readonly_fields = ('job_id', 'created_at', 'updated_at', 'started_at', 'finished_at')
+    raw_id_fields = ('created_by', 'book')
+
+
 @admin.register(ReadingProgress)
 class ReadingProgressAdmin(admin.ModelAdmin):
     list_display = ('reading_progress_id', 'user', 'book', 'progress_percentage', 'last_read_at', 'updated_at')
@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def create_verse_search_index(sender, **kwargs):
+    # The FTS5 table and its triggers are not Django models, so create them after every migrate
+    from bible_way.storage import verse_search
+    verse_search.ensure_index()
 
 
 class BibleWayConfig(AppConfig):
     name = 'bible_way'
+
+    def ready(self):
+        post_migrate.connect(create_verse_search_index, sender=self)
@@ -1,4 +1,5 @@
 from bible_way.storage import UserDB
+from bible_way.storage import catalog_cache
 from bible_way.presenters.admin.create_age_group_response import CreateAgeGroupResponse
 from bible_way.storage.s3_utils import upload_file_to_s3 as s3_upload_file
 from bible_way.models.book_reading import AgeGroupChoices
@@ -49,6 +50,7 @@ class CreateAgeGroupInteractor:
                 description=description or '',
                 display_order=display_order
             )
+            catalog_cache.invalidate()
             
             # Build response data
             age_group_data = {
@@ -1,4 +1,5 @@
 from bible_way.storage import UserDB
+from bible_way.storage import catalog_cache
 from bible_way.presenters.admin.create_category_response import CreateCategoryResponse
 from bible_way.storage.s3_utils import upload_file_to_s3 as s3_upload_file
 from bible_way.models.book_reading import CategoryChoices
@@ -49,6 +50,7 @@ class CreateCategoryInteractor:
                 description=description or '',
                 display_order=display_order
             )
+            catalog_cache.invalidate()
             
             # Build response data
             category_data = {
@@ -1,11 +1,16 @@
 from bible_way.storage import UserDB
 from bible_way.presenters.admin.create_promotion_response import CreatePromotionResponse
 from bible_way.storage.s3_utils import upload_file_to_s3 as s3_upload_file
+from bible_way.storage.s3_utils import upload_files_to_s3 as s3_upload_files
+from bible_way.storage.s3_utils import delete_files_from_s3
 from rest_framework.response import Response
 from decimal import Decimal
 import json
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 class CreatePromotionInteractor:
     def __init__(self, storage: UserDB, response: CreatePromotionResponse):
@@ -35,6 +40,7 @@ class CreatePromotionInteractor:
                 return self.response.validation_error_response("Invalid JSON format for meta_data")
         
         media_id = None
+        media_key = None
         if media_file:
             try:
                 media_type = self.storage.get_media_type_from_file(media_file)
@@ -61,17 +67,21 @@ class CreatePromotionInteractor:
                 media_id=media_id
             )
             
-            image_urls = []
             if image_files:
-                for index, image_file in enumerate(image_files):
-                    try:
-                        image_key = f"promotions/images/{promotion.promotion_id}/{os.urandom(8).hex()}/{image_file.name}"
-                        image_url = s3_upload_file(image_file, image_key)
-                        image_urls.append(image_url)
-                    except Exception as e:
-                        return self.response.error_response(f"Failed to upload image {index + 1}: {str(e)}")
-            
-            if image_urls:
+                image_uploads = [
+                    (image_file, f"promotions/images/{promotion.promotion_id}/{os.urandom(8).hex()}/{image_file.name}")
+                    for image_file in image_files
+                ]
+                try:
+                    image_urls = s3_upload_files(image_uploads)
+                except Exception as e:
+                    self.storage.delete_promotion(str(promotion.promotion_id))
+                    # The main media was uploaded before the images; don't leave it behind either
+                    if media_id:
+                        self.storage.delete_media(media_id)
+                        self._delete_uploaded_media(media_key)
+                    return self.response.error_response(f"Failed to upload images: {str(e)}")
+                
                 self.storage.create_promotion_images(promotion, image_urls)
             
             return self.response.promotion_created_successfully_response(str(promotion.promotion_id))
@@ -81,3 +91,8 @@ class CreatePromotionInteractor:
                 return self.response.validation_error_response("Media not found")
             return self.response.error_response(f"Failed to create promotion: {error_message}")
 
+    def _delete_uploaded_media(self, media_key: str) -> None:
+        try:
+            delete_files_from_s3([media_key])
+        except Exception:
+            logger.exception("Could not remove promotion media %s from S3", media_key)
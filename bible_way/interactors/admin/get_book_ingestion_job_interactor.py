@@ -0,0 +1,19 @@
+from bible_way.storage import UserDB
+from bible_way.presenters.admin.get_book_ingestion_job_response import GetBookIngestionJobResponse
+from rest_framework.response import Response
+
+
+class GetBookIngestionJobInteractor:
+    def __init__(self, storage: UserDB, response: GetBookIngestionJobResponse):
+        self.storage = storage
+        self.response = response
+    
+    def get_book_ingestion_job_interactor(self, job_id: str) -> Response:
+        try:
+            job = self.storage.get_ingestion_job(job_id)
+            if not job:
+                return self.response.job_not_found_response()
+            
+            return self.response.job_retrieved_successfully_response(self.storage.format_ingestion_job(job))
+        except Exception as e:
+            return self.response.error_response(f"Failed to retrieve ingestion job: {str(e)}")
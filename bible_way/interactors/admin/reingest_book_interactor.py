@@ -0,0 +1,50 @@
+from bible_way.storage import UserDB
+from bible_way.presenters.admin.reingest_book_response import ReingestBookResponse
+from bible_way.interactors.admin.run_book_ingestion_interactor import REINGEST_MODE
+from bible_way.models import Book
+from rest_framework.response import Response
+import uuid
+
+
+class ReingestBookInteractor:
+    def __init__(self, storage: UserDB, response: ReingestBookResponse):
+        self.storage = storage
+        self.response = response
+    
+    def reingest_book_interactor(self, book_id: str, markdown_file, title: str = None,
+                                 created_by_id: str = None) -> Response:
+        if not markdown_file:
+            return self.response.validation_error_response("Markdown file is required")
+        
+        if not markdown_file.name.lower().endswith('.md'):
+            return self.response.validation_error_response("File must be a .md (markdown) file")
+        
+        try:
+            book = self.storage.get_book_by_id(book_id)
+        except Book.DoesNotExist:
+            return self.response.book_not_found_response()
+        except Exception as e:
+            return self.response.error_response(f"Error retrieving book: {str(e)}")
+        
+        job_id = uuid.uuid4()
+        params = {
+            'mode': REINGEST_MODE,
+            'title': title
+        }
+        
+        try:
+            # Parsing and the chapter diff run in the ingestion worker
+            staged_markdown_path = self.storage.stage_ingestion_file(markdown_file, str(job_id), markdown_file.name)
+            job = self.storage.create_ingestion_job(
+                job_id=job_id,
+                created_by_id=created_by_id,
+                params=params,
+                staged_markdown_path=staged_markdown_path,
+                markdown_file_name=markdown_file.name,
+                markdown_content_type=getattr(markdown_file, 'content_type', None),
+                book=book
+            )
+        except Exception as e:
+            return self.response.error_response(f"Failed to queue book re-ingestion: {str(e)}")
+        
+        return self.response.book_reingestion_queued_response(self.storage.format_ingestion_job(job))
@@ -0,0 +1,372 @@
+from bible_way.storage import UserDB
+from bible_way.storage import catalog_cache
+from bible_way.storage.s3_utils import upload_file_to_s3 as s3_upload_file
+from bible_way.utils.markdown_parser import MarkdownBookParser
+from bible_way.models import BookIngestionJob, BookIngestionJobStatusChoices
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connection, transaction
+from django.utils import timezone
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+# Share of overall progress given to each pipeline step
+PARSE_PROGRESS_END = 50
+UPLOAD_PROGRESS_END = 65
+SAVE_PROGRESS_END = 95
+
+# Default seconds between heartbeats; keep well below the worker's --stale-after
+HEARTBEAT_INTERVAL = 30
+
+
+class IngestionError(Exception):
+    """A job failure whose message is safe to show to the admin."""
+
+
+class IngestionLockLost(Exception):
+    """The job was requeued and claimed by another worker; stop without touching it."""
+
+
+class _Heartbeat:
+    """
+    Refreshes the job's locked_at from a background thread while it runs.
+
+    Stage changes alone are too sparse: a single parse or S3 upload can outlast
+    --stale-after and get a live job requeued to a second worker.
+    """
+
+    def __init__(self, storage: UserDB, job: BookIngestionJob, interval: float):
+        self._storage = storage
+        self._job = job
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"ingestion-heartbeat-{job.job_id}", daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        try:
+            while not self._stopped.wait(self._interval):
+                try:
+                    if not self._storage.touch_ingestion_job(self._job.job_id, self._job.locked_by):
+                        # Requeued elsewhere; the next job update raises IngestionLockLost
+                        return
+                except Exception:
+                    logger.exception("Heartbeat of ingestion job %s failed", self._job.job_id)
+        finally:
+            # The thread got its own connection from Django; don't leak it
+            connection.close()
+
+
+class _ProgressReader:
+    """
+    Wraps the staged markdown file and reports how far the parser has read.
+
+    Progress is written at most once per `step` percent so a large file does
+    not turn into thousands of UPDATEs.
+    """
+
+    def __init__(self, file_obj, total_size: int, on_progress, step: int = 5):
+        self._file = file_obj
+        self._total_size = max(total_size, 1)
+        self._on_progress = on_progress
+        self._step = step
+        self._last_reported = 0
+
+    def readline(self, *args):
+        line = self._file.readline(*args)
+        percent = int(self._file.tell() * 100 / self._total_size)
+        if percent - self._last_reported >= self._step:
+            self._last_reported = percent
+            self._on_progress(percent)
+        return line
+
+    def read(self, *args):
+        return self._file.read(*args)
+
+    def seek(self, *args):
+        return self._file.seek(*args)
+
+    def tell(self):
+        return self._file.tell()
+
+
+REINGEST_MODE = 'reingest'
+
+
+class RunBookIngestionInteractor:
+    """
+    Worker side of book ingestion: parses a claimed job's upload into a new
+    Book, or diffs it against an existing Book's chapters (re-ingestion).
+    """
+
+    def __init__(self, storage: UserDB, heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.storage = storage
+        self.heartbeat_interval = heartbeat_interval
+
+    def run_book_ingestion_interactor(self, job: BookIngestionJob) -> bool:
+        """
+        Process a job already claimed by this worker (status RUNNING, locked_by set).
+
+        Every job update is conditioned on job.locked_by; if the job was
+        requeued and claimed elsewhere meanwhile, processing stops and the new
+        owner's state and staged files are left alone.
+
+        Returns True if the book was created or updated, False if the job failed.
+        """
+        try:
+            with _Heartbeat(self.storage, job, self.heartbeat_interval):
+                return self._run(job)
+        except IngestionLockLost:
+            logger.warning("Ingestion job %s was taken over by another worker, stopping", job.job_id)
+            return False
+
+    def _run(self, job: BookIngestionJob) -> bool:
+        try:
+            if (job.params or {}).get('mode') == REINGEST_MODE:
+                book_data = self._reingest(job)
+            else:
+                book_data = self._ingest(job)
+        except IngestionLockLost:
+            raise
+        except IngestionError as e:
+            return self._fail(job, str(e))
+        except UnicodeDecodeError:
+            return self._fail(job, "File encoding error. Please ensure the file is UTF-8 encoded.")
+        except Exception as e:
+            logger.exception("Book ingestion job %s failed", job.job_id)
+            return self._fail(job, f"Failed to create book: {str(e)}")
+
+        self._update(
+            job,
+            status=BookIngestionJobStatusChoices.SUCCEEDED,
+            stage='done',
+            progress=100,
+            result=book_data,
+            finished_at=timezone.now()
+        )
+        self._cleanup(job)
+        return True
+
+    def _fail(self, job: BookIngestionJob, error_message: str) -> bool:
+        self._update(
+            job,
+            status=BookIngestionJobStatusChoices.FAILED,
+            error_message=error_message,
+            finished_at=timezone.now()
+        )
+        self._cleanup(job)
+        return False
+
+    def _update(self, job: BookIngestionJob, **fields) -> None:
+        if not self.storage.update_ingestion_job(job.job_id, job.locked_by, **fields):
+            raise IngestionLockLost()
+
+    def _ensure_lock(self, job: BookIngestionJob) -> None:
+        """Inside the save transaction: hold the job row so it cannot be requeued before commit."""
+        if not self.storage.lock_held_ingestion_job(job.job_id, job.locked_by):
+            raise IngestionLockLost()
+
+    def _cleanup(self, job: BookIngestionJob) -> None:
+        try:
+            self.storage.remove_staged_ingestion_files(job)
+        except OSError:
+            logger.warning("Could not remove staged files of ingestion job %s", job.job_id)
+
+    def _report(self, job: BookIngestionJob, stage: str, progress: int, **fields) -> None:
+        self._update(job, stage=stage, progress=progress, **fields)
+
+    def _parse(self, job: BookIngestionJob, title: str = None):
+        """Parse the staged markdown; returns (parser, detected_title, chapters)."""
+        self._report(job, 'parsing', 0)
+        with open(job.staged_markdown_path, 'rb') as markdown_file:
+            reader = _ProgressReader(
+                markdown_file,
+                total_size=os.path.getsize(job.staged_markdown_path),
+                on_progress=lambda percent: self._report(job, 'parsing', percent * PARSE_PROGRESS_END // 100)
+            )
+            parser = MarkdownBookParser(reader)
+            detected_title = parser.detect_book_title(provided_title=title, filename=job.markdown_file_name)
+
+            # Parse chapters
+            chapters = parser.parse_chapters(book_title=title or detected_title)
+
+        if not chapters:
+            raise IngestionError("No chapters detected in markdown file. Please ensure the file contains chapter markers.")
+
+        self._report(job, 'uploading', PARSE_PROGRESS_END, chapters_found=len(chapters))
+        return parser, detected_title, chapters
+
+    def _upload_markdown(self, job: BookIngestionJob, key_prefix: str) -> str:
+        markdown_key = f"books/markdown/{key_prefix}/{job.markdown_file_name}"
+        try:
+            return self._upload_staged_file(
+                job.staged_markdown_path, job.markdown_file_name, job.markdown_content_type, markdown_key
+            )
+        except Exception as e:
+            raise IngestionError(f"Failed to upload markdown file to S3: {str(e)}")
+
+    def _chapters_data(self, chapters: list) -> list:
+        return [
+            {
+                'chapter_number': chapter['chapter_number'],
+                'chapter_title': chapter['chapter_title'],
+                'content': chapter['content'],
+                'content_order': chapter['content_order'],
+                'metadata': chapter.get('metadata', {}),
+                'verses': chapter.get('verses', [])
+            }
+            for chapter in chapters
+        ]
+
+    def _ingest(self, job: BookIngestionJob) -> dict:
+        params = job.params or {}
+        title = params.get('title')
+        filename = job.markdown_file_name
+
+        parser, detected_title, chapters = self._parse(job, title)
+        book_title = title or detected_title
+
+        # Upload markdown file to S3
+        book_id_preview = os.urandom(8).hex()
+        source_file_url = self._upload_markdown(job, book_id_preview)
+
+        # Upload cover image to S3 if provided
+        cover_image_url = None
+        if job.staged_cover_path:
+            try:
+                cover_key = f"books/cover_images/{book_id_preview}/{job.cover_file_name}"
+                cover_image_url = self._upload_staged_file(
+                    job.staged_cover_path, job.cover_file_name, job.cover_content_type, cover_key
+                )
+            except Exception as e:
+                raise IngestionError(f"Failed to upload cover image: {str(e)}")
+
+        self._report(job, 'saving', UPLOAD_PROGRESS_END)
+
+        # Create book and chapters in transaction
+        with transaction.atomic():
+            self._ensure_lock(job)
+            book = self.storage.create_book(
+                title=book_title,
+                category_id=params.get('category_id'),
+                age_group_id=params.get('age_group_id'),
+                language_id=params.get('language_id'),
+                cover_image_url=cover_image_url,
+                description=params.get('description') or '',
+                author=params.get('author') or '',
+                book_order=params.get('book_order', 0),
+                source_file_name=filename,
+                source_file_url=source_file_url,
+                metadata=params.get('metadata') or {}
+            )
+
+            # Bulk create chapters
+            self.storage.bulk_create_book_contents(book, self._chapters_data(chapters))
+
+            # Update book parsing status
+            total_chapters = len(chapters)
+            book = self.storage.update_book_parsed_status(
+                book_id=str(book.book_id),
+                total_chapters=total_chapters,
+                parsed_at=timezone.now()
+            )
+
+        self._report(job, 'saving', SAVE_PROGRESS_END, book=book)
+        catalog_cache.invalidate()
+
+        # Get parsing info
+        parsing_info = parser.get_parsing_info()
+
+        return {
+            "book_id": str(book.book_id),
+            "title": book.title,
+            "detected_title": detected_title,
+            "category_id": str(book.category.category_id),
+            "age_group_id": str(book.age_group.age_group_id),
+            "language_id": str(book.language.language_id),
+            "parsing_info": {
+                "pattern_detected": parsing_info.get('pattern_detected'),
+                "chapters_found": total_chapters,
+                "parsing_method": "auto_detected"
+            },
+            "total_chapters": total_chapters,
+            "is_parsed": book.is_parsed,
+            "parsed_at": book.parsed_at.isoformat() if book.parsed_at else None,
+            "source_file_name": book.source_file_name,
+            "source_file_url": book.source_file_url
+        }
+
+    def _reingest(self, job: BookIngestionJob) -> dict:
+        """
+        Re-parse an existing book and update only the chapters that changed.
+
+        Unchanged chapters are not written, and changed ones keep their
+        book_content_id, so readers' progress, notes and highlights survive.
+        """
+        if job.book_id is None:
+            raise IngestionError("Book not found")
+
+        params = job.params or {}
+        title = params.get('title')
+
+        parser, detected_title, chapters = self._parse(job, title)
+        source_file_url = self._upload_markdown(job, str(job.book_id))
+
+        self._report(job, 'saving', UPLOAD_PROGRESS_END)
+
+        with transaction.atomic():
+            self._ensure_lock(job)
+            # Two re-ingests of one book on different workers would diff against
+            # the same snapshot and both create the new chapters; take turns
+            book = self.storage.get_book_by_id_for_update(str(job.book_id))
+            changes = self.storage.sync_book_contents(book, self._chapters_data(chapters))
+            self.storage.update_book_source_file(
+                book_id=str(book.book_id),
+                source_file_name=job.markdown_file_name,
+                source_file_url=source_file_url,
+                title=title
+            )
+            book = self.storage.update_book_parsed_status(
+                book_id=str(book.book_id),
+                total_chapters=len(chapters),
+                parsed_at=timezone.now()
+            )
+
+        self._report(job, 'saving', SAVE_PROGRESS_END)
+        # Book details list chapter timestamps and the source file; chapter
+        # responses carry per-chapter ETags, so unchanged chapters stay cached
+        catalog_cache.invalidate()
+
+        return {
+            "book_id": str(book.book_id),
+            "title": book.title,
+            "detected_title": detected_title,
+            "parsing_info": {
+                "pattern_detected": parser.get_parsing_info().get('pattern_detected'),
+                "chapters_found": len(chapters),
+                "parsing_method": "auto_detected"
+            },
+            **changes,
+            "total_chapters": book.total_chapters,
+            "is_parsed": book.is_parsed,
+            "parsed_at": book.parsed_at.isoformat() if book.parsed_at else None,
+            "source_file_name": book.source_file_name,
+            "source_file_url": book.source_file_url
+        }
+
+    def _upload_staged_file(self, path: str, name: str, content_type: str, key: str) -> str:
+        with open(path, 'rb') as staged_file:
+            upload = UploadedFile(file=staged_file, name=name, content_type=content_type or 'application/octet-stream', size=os.path.getsize(path))
+            return s3_upload_file(upload, key)
@@ -19,27 +19,30 @@ class CreatePostInteractor:
                 description=description
             )
             
+            media_files = [
+                media_file for media_file in media_files or []
+                if media_file and hasattr(media_file, 'name')
+            ]
             if media_files:
-                for media_file in media_files:
-                    try:
-                        if not media_file or not hasattr(media_file, 'name'):
-                            continue
-                        
-                        media_type = self.storage.get_media_type_from_file(media_file)
-                        
-                        s3_url = self.storage.upload_file_to_s3(
-                            post=post,
-                            media_file=media_file,
-                            user_id=user_id
-                        )
-                        
-                        self.storage.create_media(
-                            post=post,
-                            s3_url=s3_url,
-                            media_type=media_type
-                        )
-                    except Exception as e:
-                        return self.response.s3_upload_error_response(str(e))
+                try:
+                    # Uploaded concurrently; on failure the storage removes what did upload
+                    # and the post is dropped so no post is left without its media
+                    s3_urls = self.storage.upload_post_media_to_s3(
+                        post=post,
+                        media_files=media_files,
+                        user_id=user_id
+                    )
+                except Exception as e:
+                    self.storage.delete_post(str(post.post_id), user_id)
+                    return self.response.s3_upload_error_response(str(e))
+                
+                self.storage.bulk_create_media(
+                    post=post,
+                    media_items=[
+                        (s3_url, self.storage.get_media_type_from_file(media_file))
+                        for s3_url, media_file in zip(s3_urls, media_files)
+                    ]
+                )
             
             return self.response.post_created_successfully_response(str(post.post_id))
             
@@ -1,4 +1,5 @@
 from bible_way.storage import UserDB
+from bible_way.storage import catalog_cache
 from bible_way.presenters.get_age_groups_response import GetAgeGroupsResponse
 from rest_framework.response import Response
 
@@ -8,24 +9,35 @@ class GetAgeGroupsInteractor:
         self.storage = storage
         self.response = response
 
-    def get_age_groups_interactor(self) -> Response:
+    def get_age_groups_interactor(self, if_none_match: str = None) -> Response:
         try:
-            age_groups = self.storage.get_all_age_groups()
+            cache_key = catalog_cache.make_key('age_groups')
+            entry = catalog_cache.get_entry(cache_key)
+            if entry is None:
+                entry = catalog_cache.store_entry(cache_key, self._build_age_groups_data())
             
-            age_groups_data = []
-            for age_group in age_groups:
-                age_groups_data.append({
-                    "age_group_id": str(age_group.age_group_id),
-                    "age_group_name": age_group.age_group_name,
-                    "display_name": age_group.get_age_group_name_display(),
-                    "cover_image_url": age_group.cover_image_url,
-                    "description": age_group.description,
-                    "display_order": age_group.display_order,
-                    "created_at": age_group.age_group_created_at.isoformat() if age_group.age_group_created_at else None,
-                    "updated_at": age_group.age_group_updated_at.isoformat() if age_group.age_group_updated_at else None
-                })
+            if catalog_cache.etag_matches(if_none_match, entry['etag']):
+                return self.response.not_modified_response(entry['etag'])
             
-            return self.response.age_groups_retrieved_successfully_response(age_groups_data)
+            return self.response.age_groups_retrieved_successfully_response(entry['data'], etag=entry['etag'])
         except Exception as e:
             return self.response.error_response(f"Failed to retrieve age groups: {str(e)}")
 
+    def _build_age_groups_data(self) -> list:
+        age_groups = self.storage.get_all_age_groups()
+        
+        age_groups_data = []
+        for age_group in age_groups:
+            age_groups_data.append({
+                "age_group_id": str(age_group.age_group_id),
+                "age_group_name": age_group.age_group_name,
+                "display_name": age_group.get_age_group_name_display(),
+                "cover_image_url": age_group.cover_image_url,
+                "description": age_group.description,
+                "display_order": age_group.display_order,
+                "created_at": age_group.age_group_created_at.isoformat() if age_group.age_group_created_at else None,
+                "updated_at": age_group.age_group_updated_at.isoformat() if age_group.age_group_updated_at else None
+            })
+        
+        return age_groups_data
+
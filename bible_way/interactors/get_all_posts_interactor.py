@@ -8,11 +8,26 @@ class GetAllPostsInteractor:
         self.storage = storage
         self.response = response
 
-    def get_all_posts_interactor(self, limit: int = 10, offset: int = 0, current_user_id: str = None) -> Response:
+    def get_all_posts_interactor(self, limit: int = 10, offset: int = 0, current_user_id: str = None, cursor: str = None) -> Response:
         try:
             if limit < 1:
                 return self.response.validation_error_response("Limit must be greater than 0")
             
+            if cursor is not None:
+                try:
+                    result = self.storage.get_all_posts_by_cursor(limit=limit, cursor=cursor, current_user_id=current_user_id)
+                except ValueError:
+                    return self.response.validation_error_response("Invalid cursor")
+                
+                return self.response.posts_retrieved_successfully_response(
+                    posts_data=result['posts'],
+                    pagination_data={
+                        'limit': result['limit'],
+                        'next_cursor': result['next_cursor'],
+                        'has_next': result['has_next']
+                    }
+                )
+            
             if offset < 0:
                 return self.response.validation_error_response("Offset must be greater than or equal to 0")
             
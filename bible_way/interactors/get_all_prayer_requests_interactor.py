@@ -8,15 +8,30 @@ class GetAllPrayerRequestsInteractor:
         self.storage = storage
         self.response = response
 
-    def get_all_prayer_requests_interactor(self, limit: int = 10, offset: int = 0) -> Response:
+    def get_all_prayer_requests_interactor(self, limit: int = 10, offset: int = 0, current_user_id: str = None, cursor: str = None) -> Response:
         try:
             if limit < 1:
                 return self.response.validation_error_response("Limit must be greater than 0")
             
+            if cursor is not None:
+                try:
+                    result = self.storage.get_all_prayer_requests_by_cursor(limit=limit, cursor=cursor, current_user_id=current_user_id)
+                except ValueError:
+                    return self.response.validation_error_response("Invalid cursor")
+                
+                return self.response.prayer_requests_retrieved_successfully_response(
+                    prayer_requests_data=result['prayer_requests'],
+                    pagination_data={
+                        'limit': result['limit'],
+                        'next_cursor': result['next_cursor'],
+                        'has_next': result['has_next']
+                    }
+                )
+            
             if offset < 0:
                 return self.response.validation_error_response("Offset must be greater than or equal to 0")
             
-            result = self.storage.get_all_prayer_requests(limit=limit, offset=offset)
+            result = self.storage.get_all_prayer_requests(limit=limit, offset=offset, current_user_id=current_user_id)
             
             return self.response.prayer_requests_retrieved_successfully_response(
                 prayer_requests_data=result['prayer_requests'],
@@ -1,4 +1,5 @@
 from bible_way.storage import UserDB
+from bible_way.storage import catalog_cache
 from bible_way.presenters.get_book_details_response import GetBookDetailsResponse
 from bible_way.models import Book
 from rest_framework.response import Response
@@ -9,7 +10,24 @@ class GetBookDetailsInteractor:
         self.storage = storage
         self.response = response
 
-    def get_book_details_interactor(self, book_id: str) -> Response:
+    def get_book_details_interactor(self, book_id: str, if_none_match: str = None) -> Response:
+        cache_key = catalog_cache.make_key('book_details', book_id)
+        entry = catalog_cache.get_entry(cache_key)
+        if entry is None:
+            result = self._build_book_details(book_id)
+            if isinstance(result, Response):
+                return result
+            entry = catalog_cache.store_entry(cache_key, result)
+        
+        if catalog_cache.etag_matches(if_none_match, entry['etag']):
+            return self.response.not_modified_response(entry['etag'])
+        
+        return self.response.book_details_retrieved_successfully_response(
+            entry['data']['book'], entry['data']['chapters'], etag=entry['etag']
+        )
+
+    def _build_book_details(self, book_id: str):
+        """Returns {"book": ..., "chapters": ...}, or an error Response (never cached)."""
         try:
             book = self.storage.get_book_by_id(book_id)
         except Book.DoesNotExist:
@@ -60,7 +78,7 @@ class GetBookDetailsInteractor:
                     "updated_at": chapter.updated_at.isoformat() if chapter.updated_at else None
                 })
             
-            return self.response.book_details_retrieved_successfully_response(book_data, chapters_data)
+            return {"book": book_data, "chapters": chapters_data}
         except Exception as e:
             return self.response.error_response(f"Failed to retrieve book details: {str(e)}")
 
@@ -1,4 +1,5 @@
 from bible_way.storage import UserDB
+from bible_way.storage import catalog_cache
 from bible_way.presenters.get_categories_response import GetCategoriesResponse
 from rest_framework.response import Response
 
@@ -8,24 +9,35 @@ class GetCategoriesInteractor:
         self.storage = storage
         self.response = response
 
-    def get_categories_interactor(self) -> Response:
+    def get_categories_interactor(self, if_none_match: str = None) -> Response:
         try:
-            categories = self.storage.get_all_categories()
+            cache_key = catalog_cache.make_key('categories')
+            entry = catalog_cache.get_entry(cache_key)
+            if entry is None:
+                entry = catalog_cache.store_entry(cache_key, self._build_categories_data())
             
-            categories_data = []
-            for category in categories:
-                categories_data.append({
-                    "category_id": str(category.category_id),
-                    "category_name": category.category_name,
-                    "display_name": category.get_category_name_display(),
-                    "cover_image_url": category.cover_image_url,
-                    "description": category.description,
-                    "display_order": category.display_order,
-                    "created_at": category.created_at.isoformat() if category.created_at else None,
-                    "updated_at": category.updated_at.isoformat() if category.updated_at else None
-                })
+            if catalog_cache.etag_matches(if_none_match, entry['etag']):
+                return self.response.not_modified_response(entry['etag'])
             
-            return self.response.categories_retrieved_successfully_response(categories_data)
+            return self.response.categories_retrieved_successfully_response(entry['data'], etag=entry['etag'])
         except Exception as e:
             return self.response.error_response(f"Failed to retrieve categories: {str(e)}")
 
+    def _build_categories_data(self) -> list:
+        categories = self.storage.get_all_categories()
+        
+        categories_data = []
+        for category in categories:
+            categories_data.append({
+                "category_id": str(category.category_id),
+                "category_name": category.category_name,
+                "display_name": category.get_category_name_display(),
+                "cover_image_url": category.cover_image_url,
+                "description": category.description,
+                "display_order": category.display_order,
+                "created_at": category.created_at.isoformat() if category.created_at else None,
+                "updated_at": category.updated_at.isoformat() if category.updated_at else None
+            })
+        
+        return categories_data
+
@@ -0,0 +1,103 @@
+from django.conf import settings
+from bible_way.storage import UserDB
+from bible_way.storage import catalog_cache
+from bible_way.presenters.get_chapter_content_response import GetChapterContentResponse
+from bible_way.utils import chapter_payload
+import uuid
+
+
+class GetChapterContentInteractor:
+    def __init__(self, storage: UserDB, response: GetChapterContentResponse):
+        self.storage = storage
+        self.response = response
+    
+    def get_chapter_interactor(self, book_id: str, chapter_number: int, accept_encoding: str = None,
+                               if_none_match: str = None):
+        if not self._is_valid_book_id(book_id):
+            return self.response.validation_error_response("Invalid book_id")
+        
+        encoding = chapter_payload.choose_encoding(accept_encoding)
+        
+        try:
+            chapters = self.storage.get_book_chapters_for_reading(
+                book_id=book_id,
+                start_chapter=chapter_number,
+                end_chapter=chapter_number,
+                encoding=encoding
+            )
+        except Exception as e:
+            return self.response.error_response(f"Failed to retrieve chapter: {str(e)}")
+        
+        if not chapters:
+            return self.response.chapter_not_found_response()
+        
+        etag = self._get_etag(chapters, encoding)
+        if catalog_cache.etag_matches(if_none_match, etag):
+            return self.response.not_modified_response(etag)
+        
+        chapter = chapters[0]
+        if encoding == chapter_payload.BROTLI:
+            body = bytes(chapter.content_brotli)
+        elif encoding == chapter_payload.GZIP:
+            body = chapter_payload.single_chapter_gzip(self._get_fragment(chapter))
+        else:
+            body = chapter_payload.single_chapter_body(chapter_payload.render_chapter(chapter))
+        
+        return self.response.chapter_content_response(body, encoding, etag=etag)
+    
+    def get_chapter_range_interactor(self, book_id: str, start_chapter: int, end_chapter: int, accept_encoding: str = None,
+                                     if_none_match: str = None):
+        if not self._is_valid_book_id(book_id):
+            return self.response.validation_error_response("Invalid book_id")
+        
+        if start_chapter is None or end_chapter is None:
+            return self.response.validation_error_response("start and end are required")
+        
+        if start_chapter < 1 or end_chapter < start_chapter:
+            return self.response.validation_error_response("Invalid chapter range")
+        
+        max_chapters = getattr(settings, 'BOOK_CHAPTER_RANGE_MAX', 20)
+        if end_chapter - start_chapter + 1 > max_chapters:
+            return self.response.validation_error_response(f"A range can contain at most {max_chapters} chapters")
+        
+        # Brotli payloads are stored per chapter and cannot be concatenated
+        encoding = chapter_payload.choose_encoding(accept_encoding, allow_brotli=False)
+        
+        try:
+            chapters = self.storage.get_book_chapters_for_reading(
+                book_id=book_id,
+                start_chapter=start_chapter,
+                end_chapter=end_chapter,
+                encoding=encoding
+            )
+        except Exception as e:
+            return self.response.error_response(f"Failed to retrieve chapters: {str(e)}")
+        
+        if not chapters:
+            return self.response.chapter_not_found_response()
+        
+        etag = self._get_etag(chapters, encoding)
+        if catalog_cache.etag_matches(if_none_match, etag):
+            return self.response.not_modified_response(etag)
+        
+        if encoding == chapter_payload.GZIP:
+            body = chapter_payload.chapter_range_gzip([self._get_fragment(chapter) for chapter in chapters])
+        else:
+            body = chapter_payload.chapter_range_body([chapter_payload.render_chapter(chapter) for chapter in chapters])
+        
+        return self.response.chapter_content_response(body, encoding, etag=etag)
+    
+    def _is_valid_book_id(self, book_id) -> bool:
+        try:
+            uuid.UUID(str(book_id))
+        except ValueError:
+            return False
+        return True
+    
+    def _get_etag(self, chapters: list, encoding: str) -> str:
+        # Derived from content hashes, so re-ingesting a book only changes the ETags of edited chapters
+        chapter_keys = [f"{chapter.book_content_id}:{chapter.content_hash}" for chapter in chapters]
+        return chapter_payload.chapter_etag(chapter_keys, encoding)
+    
+    def _get_fragment(self, chapter) -> chapter_payload.Fragment:
+        return bytes(chapter.content_deflate), chapter.content_crc32, chapter.content_size
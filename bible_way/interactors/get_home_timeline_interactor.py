@@ -0,0 +1,30 @@
+from bible_way.storage import UserDB
+from bible_way.presenters.get_home_timeline_response import GetHomeTimelineResponse
+from rest_framework.response import Response
+
+
+class GetHomeTimelineInteractor:
+    def __init__(self, storage: UserDB, response: GetHomeTimelineResponse):
+        self.storage = storage
+        self.response = response
+    
+    def get_home_timeline_interactor(self, current_user_id: str, limit: int = 10, cursor: str = None) -> Response:
+        try:
+            if limit < 1:
+                return self.response.validation_error_response("Limit must be greater than 0")
+            
+            try:
+                result = self.storage.get_home_timeline(current_user_id=current_user_id, limit=limit, cursor=cursor)
+            except ValueError:
+                return self.response.validation_error_response("Invalid cursor")
+            
+            return self.response.home_timeline_retrieved_successfully_response(
+                posts_data=result['posts'],
+                pagination_data={
+                    'limit': result['limit'],
+                    'next_cursor': result['next_cursor'],
+                    'has_next': result['has_next']
+                }
+            )
+        except Exception as e:
+            return self.response.error_response(f"Failed to retrieve home timeline: {str(e)}")
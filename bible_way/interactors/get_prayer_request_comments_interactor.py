@@ -8,12 +8,12 @@ class GetPrayerRequestCommentsInteractor:
         self.storage = storage
         self.response = response
 
-    def get_prayer_request_comments_interactor(self, prayer_request_id: str) -> Response:
+    def get_prayer_request_comments_interactor(self, prayer_request_id: str, current_user_id: str = None) -> Response:
         if not prayer_request_id:
             return self.response.validation_error_response("Prayer request ID is required")
         
         try:
-            comments_data = self.storage.get_prayer_request_comments(prayer_request_id=prayer_request_id)
+            comments_data = self.storage.get_prayer_request_comments(prayer_request_id=prayer_request_id, current_user_id=current_user_id)
             
             return self.response.comments_retrieved_successfully_response(
                 prayer_request_id=prayer_request_id,
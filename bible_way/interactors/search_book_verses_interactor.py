@@ -0,0 +1,58 @@
+from bible_way.storage import UserDB
+from bible_way.presenters.search_book_verses_response import SearchBookVersesResponse
+from rest_framework.response import Response
+import uuid
+
+
+MAX_QUERY_LENGTH = 200
+MAX_LIMIT = 50
+
+
+class SearchBookVersesInteractor:
+    def __init__(self, storage: UserDB, response: SearchBookVersesResponse):
+        self.storage = storage
+        self.response = response
+    
+    def search_book_verses_interactor(self, query: str, book_id: str = None, language_id: str = None,
+                                      age_group_id: str = None, limit: int = 20, offset: int = 0) -> Response:
+        query = (query or '').strip()
+        if not query:
+            return self.response.validation_error_response("Search query (q) is required")
+        
+        if len(query) > MAX_QUERY_LENGTH:
+            return self.response.validation_error_response(f"Search query must be at most {MAX_QUERY_LENGTH} characters")
+        
+        if limit < 1 or limit > MAX_LIMIT:
+            return self.response.validation_error_response(f"Limit must be between 1 and {MAX_LIMIT}")
+        
+        if offset < 0:
+            return self.response.validation_error_response("Offset must be greater than or equal to 0")
+        
+        for name, value in (('book_id', book_id), ('language_id', language_id), ('age_group_id', age_group_id)):
+            if value:
+                try:
+                    uuid.UUID(value)
+                except ValueError:
+                    return self.response.validation_error_response(f"Invalid {name}")
+        
+        try:
+            result = self.storage.search_book_verses(
+                query=query,
+                book_id=book_id,
+                language_id=language_id,
+                age_group_id=age_group_id,
+                limit=limit,
+                offset=offset
+            )
+        except Exception as e:
+            return self.response.error_response(f"Failed to search verses: {str(e)}")
+        
+        return self.response.verses_found_successfully_response(
+            results=result['results'],
+            pagination_data={
+                'limit': result['limit'],
+                'offset': result['offset'],
+                'has_next': result['has_next'],
+                'has_previous': result['has_previous']
+            }
+        )
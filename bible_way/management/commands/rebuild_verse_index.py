@@ -0,0 +1,67 @@
+"""
+Rebuild the verse search index from stored chapter content.
+
+Verses are normally extracted when a book is parsed. This command re-splits
+Bible-format chapters into BookVerse rows (e.g. for books ingested before
+verse search existed) and rebuilds the FTS5 index. On backends without
+FTS5 only the verses are re-extracted (search then scans them directly).
+
+Usage:
+    python manage.py rebuild_verse_index
+    python manage.py rebuild_verse_index --book <book_id>
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from bible_way.models import Book, BookContent, BookVerse
+from bible_way.storage import verse_search
+from bible_way.utils.markdown_parser import MarkdownBookParser
+
+
+class Command(BaseCommand):
+    help = "Re-extract verses from Bible-format chapters and rebuild the full-text verse index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--book',
+            help="Only rebuild the verses of this book_id"
+        )
+
+    def handle(self, *args, **options):
+        verse_search.ensure_index()
+        parser = MarkdownBookParser('')
+
+        books = Book.objects.all()
+        if options['book']:
+            books = books.filter(book_id=options['book'])
+
+        total_verses = 0
+        for book in books.iterator():
+            chapters = BookContent.objects.filter(
+                book=book,
+                metadata__pattern_type='bible_format'
+            ).only('book_content_id', 'chapter_number', 'content')
+
+            verses = []
+            for chapter in chapters.iterator():
+                for verse in parser.extract_verses(chapter.content, chapter.chapter_number):
+                    verses.append(BookVerse(
+                        book=book,
+                        book_content=chapter,
+                        chapter_number=chapter.chapter_number,
+                        verse_number=verse['verse_number'],
+                        text=verse['text']
+                    ))
+
+            with transaction.atomic():
+                BookVerse.objects.filter(book=book).delete()
+                BookVerse.objects.bulk_create(verses, batch_size=500)
+
+            total_verses += len(verses)
+            self.stdout.write(f"{book.title}: {len(verses)} verses")
+
+        if not verse_search.is_supported():
+            self.stdout.write(self.style.SUCCESS(f"Extracted {total_verses} verses (no FTS5 index on this database)"))
+            return
+
+        verse_search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total_verses} verses"))
@@ -0,0 +1,86 @@
+"""
+Recompute denormalized like/comment counters and repair drift.
+
+Counters are maintained incrementally by UserDB, but cascaded deletes
+(e.g. deleting a user removes their reactions and comments) bypass those
+code paths. This command compares every counter with the real row count
+and rewrites only the rows that drifted.
+
+Usage:
+    python manage.py recompute_counters
+    python manage.py recompute_counters --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from bible_way.models import Post, Comment, PrayerRequest, Reaction
+
+
+# (model, counter field, child model, child foreign key)
+COUNTER_SPECS = [
+    (Post, 'likes_count', Reaction, 'post'),
+    (Post, 'comments_count', Comment, 'post'),
+    (Comment, 'likes_count', Reaction, 'comment'),
+    (PrayerRequest, 'comments_count', Comment, 'prayer_request'),
+    (PrayerRequest, 'reactions_count', Reaction, 'prayer_request'),
+]
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized like/comment counters on posts, comments and prayer requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Number of drifted rows to rewrite per transaction (default: 500)"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report drifted rows, do not write"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        for model, field, child_model, child_fk in COUNTER_SPECS:
+            actual_count = Coalesce(
+                Subquery(
+                    child_model.objects.filter(**{child_fk: OuterRef('pk')})
+                    .order_by()
+                    .values(child_fk)
+                    .annotate(total=Count('pk'))
+                    .values('total')
+                ),
+                Value(0)
+            )
+            drifted = model.objects.annotate(actual_count=actual_count).exclude(
+                **{field: F('actual_count')}
+            ).values_list('pk', 'actual_count')
+
+            label = f"{model.__name__}.{field}"
+            repaired = 0
+            batch = []
+            for pk, count in drifted.iterator(chunk_size=batch_size):
+                batch.append(model(pk=pk, **{field: count}))
+                if len(batch) >= batch_size:
+                    repaired += self._write_batch(model, field, batch, dry_run)
+                    batch = []
+            if batch:
+                repaired += self._write_batch(model, field, batch, dry_run)
+
+            verb = "would repair" if dry_run else "repaired"
+            self.stdout.write(f"{label}: {verb} {repaired} row(s)")
+
+        self.stdout.write(self.style.SUCCESS("Counter recompute complete"))
+
+    def _write_batch(self, model, field: str, batch: list, dry_run: bool) -> int:
+        if dry_run:
+            return len(batch)
+        with transaction.atomic():
+            model.objects.bulk_update(batch, [field])
+        return len(batch)
@@ -0,0 +1,86 @@
+"""
+Process queued book uploads (BookIngestionJob rows).
+
+The database is the queue: each loop recovers jobs abandoned by crashed
+workers, claims the oldest PENDING job and runs the ingestion pipeline.
+Several workers can run side by side; a claim is a conditional UPDATE, so a
+job is never processed twice concurrently. A running job's lock is refreshed
+by a heartbeat thread, and every update checks the worker still holds it.
+
+Usage:
+    python manage.py run_book_ingestion_worker
+    python manage.py run_book_ingestion_worker --once
+"""
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from bible_way.storage import UserDB
+from bible_way.interactors.admin.run_book_ingestion_interactor import HEARTBEAT_INTERVAL, RunBookIngestionInteractor
+
+
+class Command(BaseCommand):
+    help = "Run the book ingestion worker (database-backed queue, no external broker)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Drain the queue and exit instead of polling forever"
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty (default: 2)"
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help="Seconds without a heartbeat after which a RUNNING job is considered abandoned (default: 600)"
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=3,
+            help="Attempts before an abandoned job is marked FAILED (default: 3)"
+        )
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        storage = UserDB()
+        # Several heartbeats per --stale-after window, so one late beat is not fatal
+        interactor = RunBookIngestionInteractor(
+            storage=storage,
+            heartbeat_interval=max(1, min(HEARTBEAT_INTERVAL, options['stale_after'] / 4))
+        )
+
+        self.stdout.write(f"Book ingestion worker {worker_id} started")
+
+        while True:
+            close_old_connections()
+
+            recovered = storage.requeue_stale_ingestion_jobs(
+                stale_after_seconds=options['stale_after'],
+                max_attempts=options['max_attempts']
+            )
+            if recovered:
+                self.stdout.write(f"Recovered {recovered} abandoned job(s)")
+
+            job = storage.claim_next_ingestion_job(worker_id)
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"Processing job {job.job_id} ({job.markdown_file_name})")
+            if interactor.run_book_ingestion_interactor(job):
+                self.stdout.write(self.style.SUCCESS(f"Job {job.job_id} succeeded"))
+            else:
+                self.stdout.write(self.style.ERROR(f"Job {job.job_id} failed"))
+
+        self.stdout.write(self.style.SUCCESS("Ingestion queue drained"))
@@ -16,9 +16,12 @@ from .book_reading import (
     AgeGroup,
     Book,
     BookContent,
+    BookVerse,
     ReadingProgress,
     ReadingNote,
     Highlight,
+    BookIngestionJob,
+    BookIngestionJobStatusChoices,
     LanguageChoices,
     CategoryChoices,
     AgeGroupChoices,
@@ -29,6 +32,7 @@ __all__ = [
     'CategoryChoices',
     'AgeGroupChoices',
     'AuthProviderChoices',
+    'BookIngestionJobStatusChoices',
     'User',
     'UserFollowers',
     'Post',
@@ -45,8 +49,10 @@ __all__ = [
     'AgeGroup',
     'Book',
     'BookContent',
+    'BookVerse',
     'ReadingProgress',
     'ReadingNote',
     'Highlight',
+    'BookIngestionJob',
 ]
 
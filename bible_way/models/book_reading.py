@@ -164,6 +164,11 @@ class BookContent(models.Model):
         default=dict,
         help_text="Additional metadata (e.g., verse_range: '1:1-1:31', raw_markdown_title: '__[Genesis 1]__')"
     )
+    content_deflate = models.BinaryField(null=True, blank=True, editable=False, help_text="Pre-rendered chapter JSON as a sync-flushed raw deflate fragment (stitched into gzip responses)")
+    content_crc32 = models.BigIntegerField(null=True, blank=True, editable=False, help_text="CRC-32 of the pre-rendered chapter JSON")
+    content_size = models.IntegerField(null=True, blank=True, editable=False, help_text="Byte length of the pre-rendered chapter JSON")
+    content_brotli = models.BinaryField(null=True, blank=True, editable=False, help_text="Brotli-compressed single-chapter response body (only when brotli is installed)")
+    content_hash = models.CharField(max_length=64, blank=True, default='', editable=False, help_text="SHA-256 of title, order, content and metadata; used to skip unchanged chapters on re-ingestion")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -182,6 +187,32 @@ class BookContent(models.Model):
         return f"{self.book.title} - {self.chapter_title}"
 
 
+class BookVerse(models.Model):
+    """
+    One verse of a Bible-format chapter, split at its {chapter:verse} marker.
+
+    Rows are indexed by the bible_way_verse_fts FTS5 table (kept in sync by
+    triggers, see bible_way/storage/verse_search.py), so verse_id is an
+    integer key usable as the FTS rowid.
+    """
+    verse_id = models.BigAutoField(primary_key=True)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='verses')
+    book_content = models.ForeignKey(BookContent, on_delete=models.CASCADE, related_name='verses')
+    chapter_number = models.IntegerField()
+    verse_number = models.IntegerField()
+    text = models.TextField(help_text="Verse text with markdown formatting removed")
+
+    class Meta:
+        db_table = 'bible_way_book_verse'
+        ordering = ['chapter_number', 'verse_number']
+        indexes = [
+            models.Index(fields=['book_content', 'verse_number']),
+        ]
+
+    def __str__(self):
+        return f"{self.book.title} {self.chapter_number}:{self.verse_number}"
+
+
 class ReadingProgress(models.Model):
     reading_progress_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reading_progresses')
@@ -251,3 +282,59 @@ class Highlight(models.Model):
         return f"Highlight {self.highlight_id} by {self.user.user_name} on {self.book.title}"
 
 
+
+
+class BookIngestionJobStatusChoices(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    RUNNING = 'RUNNING', 'Running'
+    SUCCEEDED = 'SUCCEEDED', 'Succeeded'
+    FAILED = 'FAILED', 'Failed'
+
+
+class BookIngestionJob(models.Model):
+    """
+    A queued markdown upload waiting to be parsed into a Book, or re-parsed
+    into an existing one (params mode 'reingest', with book set).
+
+    The table doubles as the work queue: the ingestion worker claims the
+    oldest PENDING row, so no external broker is needed.
+    """
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(
+        max_length=10,
+        choices=BookIngestionJobStatusChoices.choices,
+        default=BookIngestionJobStatusChoices.PENDING
+    )
+    stage = models.CharField(max_length=30, blank=True, default='queued', help_text="Current pipeline step (queued, parsing, uploading, saving, done)")
+    progress = models.IntegerField(default=0, help_text="Completion percentage (0-100)")
+    chapters_found = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True, default='')
+    result = models.JSONField(default=dict, blank=True, help_text="Created book summary once the job has succeeded")
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='book_ingestion_jobs')
+    book = models.ForeignKey(Book, on_delete=models.SET_NULL, null=True, blank=True, related_name='ingestion_jobs')
+    # Request parameters, applied by the worker when it creates the book
+    params = models.JSONField(default=dict, help_text="category_id, age_group_id, language_id, title, description, author, book_order, metadata")
+    # Uploads are staged on local disk so the request returns without touching S3
+    staged_markdown_path = models.CharField(max_length=500)
+    markdown_file_name = models.CharField(max_length=255)
+    markdown_content_type = models.CharField(max_length=100, blank=True, default='text/markdown')
+    staged_cover_path = models.CharField(max_length=500, blank=True, default='')
+    cover_file_name = models.CharField(max_length=255, blank=True, default='')
+    cover_content_type = models.CharField(max_length=100, blank=True, default='')
+    attempts = models.IntegerField(default=0)
+    locked_by = models.CharField(max_length=255, blank=True, default='', help_text="Worker that claimed the job")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'bible_way_book_ingestion_job'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Ingestion {self.job_id} ({self.status})"
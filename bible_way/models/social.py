@@ -8,11 +8,16 @@ class Post(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
     title = models.CharField(max_length=255, blank=True)
     description = models.TextField(blank=True)
+    likes_count = models.IntegerField(default=0, help_text="Denormalized reaction count, maintained by like/unlike")
+    comments_count = models.IntegerField(default=0, help_text="Denormalized comment count, maintained by create/delete comment")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'bible_way_post'
+        indexes = [
+            models.Index(fields=['-created_at', '-post_id']),
+        ]
 
     def __str__(self):
         return f"Post {self.post_id} by {self.user}"
@@ -38,11 +43,16 @@ class PrayerRequest(models.Model):
     email = models.EmailField(default="anonymous@example.com")
     phone_number = models.CharField(max_length=20, null=True, blank=True)
     description = models.TextField()
+    comments_count = models.IntegerField(default=0, help_text="Denormalized comment count, maintained by create/delete comment")
+    reactions_count = models.IntegerField(default=0, help_text="Denormalized reaction count, maintained by like/unlike")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'bible_way_prayer_request'
+        indexes = [
+            models.Index(fields=['-created_at', '-prayer_request_id']),
+        ]
 
     def __str__(self):
         return f"Prayer Request {self.prayer_request_id} by {self.user}"
@@ -83,6 +93,7 @@ class Comment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="comments")
     prayer_request = models.ForeignKey(PrayerRequest, on_delete=models.CASCADE, related_name="comments", null=True, blank=True)
     description = models.TextField()
+    likes_count = models.IntegerField(default=0, help_text="Denormalized reaction count, maintained by like/unlike")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -15,6 +15,17 @@ class CreateBookResponse:
             status=status.HTTP_201_CREATED
         )
 
+    @staticmethod
+    def book_ingestion_queued_response(job_data: dict) -> Response:
+        return Response(
+            {
+                "success": True,
+                "message": "Book upload accepted and queued for ingestion",
+                "data": job_data
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+
     @staticmethod
     def validation_error_response(error_message: str) -> Response:
         return Response(
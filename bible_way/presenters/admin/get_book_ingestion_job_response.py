@@ -0,0 +1,38 @@
+from rest_framework.response import Response
+from rest_framework import status
+
+
+class GetBookIngestionJobResponse:
+
+    @staticmethod
+    def job_retrieved_successfully_response(job_data: dict) -> Response:
+        return Response(
+            {
+                "success": True,
+                "message": "Ingestion job retrieved successfully",
+                "data": job_data
+            },
+            status=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def job_not_found_response() -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": "Ingestion job not found",
+                "error_code": "JOB_NOT_FOUND"
+            },
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    @staticmethod
+    def error_response(error_message: str) -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": error_message,
+                "error_code": "INTERNAL_ERROR"
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -11,13 +11,7 @@ class GetAllPostsResponse:
                 "success": True,
                 "message": "Posts retrieved successfully",
                 "data": posts_data,
-                "pagination": {
-                    "limit": pagination_data['limit'],
-                    "offset": pagination_data['offset'],
-                    "total_count": pagination_data['total_count'],
-                    "has_next": pagination_data['has_next'],
-                    "has_previous": pagination_data['has_previous']
-                }
+                "pagination": pagination_data
             },
             status=status.HTTP_200_OK
         )
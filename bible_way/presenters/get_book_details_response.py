@@ -5,8 +5,8 @@ from rest_framework import status
 class GetBookDetailsResponse:
 
     @staticmethod
-    def book_details_retrieved_successfully_response(book_data: dict, chapters_data: list) -> Response:
-        return Response(
+    def book_details_retrieved_successfully_response(book_data: dict, chapters_data: list, etag: str = None) -> Response:
+        response = Response(
             {
                 "success": True,
                 "message": "Book details retrieved successfully",
@@ -17,6 +17,10 @@ class GetBookDetailsResponse:
             },
             status=status.HTTP_200_OK
         )
+        if etag:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
 
     @staticmethod
     def book_not_found_response() -> Response:
@@ -29,6 +33,13 @@ class GetBookDetailsResponse:
             status=status.HTTP_404_NOT_FOUND
         )
 
+    @staticmethod
+    def not_modified_response(etag: str) -> Response:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
     @staticmethod
     def error_response(error_message: str) -> Response:
         return Response(
@@ -5,8 +5,8 @@ from rest_framework import status
 class GetBooksByCategoryResponse:
 
     @staticmethod
-    def books_retrieved_successfully_response(books_data: list) -> Response:
-        return Response(
+    def books_retrieved_successfully_response(books_data: list, etag: str = None) -> Response:
+        response = Response(
             {
                 "success": True,
                 "message": "Books retrieved successfully",
@@ -14,6 +14,10 @@ class GetBooksByCategoryResponse:
             },
             status=status.HTTP_200_OK
         )
+        if etag:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
 
     @staticmethod
     def validation_error_response(error_message: str) -> Response:
@@ -37,6 +41,13 @@ class GetBooksByCategoryResponse:
             status=status.HTTP_200_OK
         )
 
+    @staticmethod
+    def not_modified_response(etag: str) -> Response:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
     @staticmethod
     def error_response(error_message: str) -> Response:
         return Response(
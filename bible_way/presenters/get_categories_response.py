@@ -5,8 +5,8 @@ from rest_framework import status
 class GetCategoriesResponse:
 
     @staticmethod
-    def categories_retrieved_successfully_response(categories_data: list) -> Response:
-        return Response(
+    def categories_retrieved_successfully_response(categories_data: list, etag: str = None) -> Response:
+        response = Response(
             {
                 "success": True,
                 "message": "Categories retrieved successfully",
@@ -14,6 +14,17 @@ class GetCategoriesResponse:
             },
             status=status.HTTP_200_OK
         )
+        if etag:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @staticmethod
+    def not_modified_response(etag: str) -> Response:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
     @staticmethod
     def error_response(error_message: str) -> Response:
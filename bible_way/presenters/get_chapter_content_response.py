@@ -0,0 +1,60 @@
+from django.http import HttpResponse
+from rest_framework.response import Response
+from rest_framework import status
+from bible_way.utils import chapter_payload
+
+
+class GetChapterContentResponse:
+
+    @staticmethod
+    def chapter_content_response(body: bytes, encoding: str, etag: str = None) -> HttpResponse:
+        # The body is already serialized (and possibly compressed), so bypass DRF rendering
+        response = HttpResponse(body, content_type='application/json; charset=utf-8', status=status.HTTP_200_OK)
+        if encoding != chapter_payload.IDENTITY:
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        if etag:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @staticmethod
+    def not_modified_response(etag: str) -> HttpResponse:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @staticmethod
+    def chapter_not_found_response() -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": "Chapter not found",
+                "error_code": "CHAPTER_NOT_FOUND"
+            },
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    @staticmethod
+    def validation_error_response(error_message: str) -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": error_message,
+                "error_code": "VALIDATION_ERROR"
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    @staticmethod
+    def error_response(error_message: str) -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": error_message,
+                "error_code": "INTERNAL_ERROR"
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,40 @@
+from rest_framework.response import Response
+from rest_framework import status
+
+
+class GetHomeTimelineResponse:
+
+    @staticmethod
+    def home_timeline_retrieved_successfully_response(posts_data: list, pagination_data: dict) -> Response:
+        return Response(
+            {
+                "success": True,
+                "message": "Home timeline retrieved successfully",
+                "data": posts_data,
+                "pagination": pagination_data
+            },
+            status=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def validation_error_response(error_message: str) -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": error_message,
+                "error_code": "VALIDATION_ERROR"
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    @staticmethod
+    def error_response(error_message: str) -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": error_message,
+                "error_code": "INTERNAL_ERROR"
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
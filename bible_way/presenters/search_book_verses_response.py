@@ -0,0 +1,44 @@
+from rest_framework.response import Response
+from rest_framework import status
+
+
+class SearchBookVersesResponse:
+
+    @staticmethod
+    def verses_found_successfully_response(results: list, pagination_data: dict) -> Response:
+        return Response(
+            {
+                "success": True,
+                "message": "Search results retrieved successfully",
+                "data": results,
+                "pagination": {
+                    "limit": pagination_data['limit'],
+                    "offset": pagination_data['offset'],
+                    "has_next": pagination_data['has_next'],
+                    "has_previous": pagination_data['has_previous']
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def validation_error_response(error_message: str) -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": error_message,
+                "error_code": "VALIDATION_ERROR"
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    @staticmethod
+    def error_response(error_message: str) -> Response:
+        return Response(
+            {
+                "success": False,
+                "error": error_message,
+                "error_code": "INTERNAL_ERROR"
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,134 @@
+"""
+Versioned read-through cache for the book catalog endpoints.
+
+Categories, age groups, books-by-category and book details only change when
+an admin creates a book, category or age group. Every cached payload is
+stored under a key that embeds a global catalog version; the admin create
+interactors bump that version, which makes all previous entries unreachable
+at once (they age out via CATALOG_CACHE_TIMEOUT).
+
+Each entry stores the payload together with a content ETag so views can
+answer `If-None-Match` with 304 Not Modified.
+
+Invalidation also happens outside the web processes: the book ingestion
+worker bumps the version after ingesting or re-ingesting a book. The cache
+backend must therefore be shared between processes (Redis, or the file
+cache used without Redis), never a per-process locmem cache.
+
+Cache errors never fail a request: reads fall back to the database and a
+failed invalidation is logged.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "catalog:version"
+ENTRY_KEY = "catalog:v{version}:{name}:{parts}"
+
+
+def get_timeout() -> int:
+    return getattr(settings, "CATALOG_CACHE_TIMEOUT", 60 * 60)
+
+
+def _new_version() -> int:
+    # Time-based so a version key lost to eviction never restarts at a number
+    # whose entries may still be cached
+    return int(time.time() * 1000)
+
+
+def _get_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # add() so concurrent first readers agree on the initial version
+        cache.add(VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def make_key(name: str, *parts) -> Optional[str]:
+    """
+    Build the cache key for (name, parts) under the current catalog version.
+
+    Resolve the key once per request and reuse it for both the read and the
+    write, so a payload built before an invalidation is never stored under
+    the new version. Returns None if the cache is unavailable.
+    """
+    try:
+        version = _get_version()
+    except Exception:
+        logger.exception("Catalog cache version lookup failed")
+        return None
+    return ENTRY_KEY.format(
+        version=version,
+        name=name,
+        parts=":".join(str(part) if part else "-" for part in parts)
+    )
+
+
+def compute_etag(data) -> str:
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+
+
+def get_entry(key: Optional[str]) -> Optional[dict]:
+    """
+    Return the cached entry {"data": ..., "etag": ...} or None on a miss.
+    """
+    if key is None:
+        return None
+    try:
+        return cache.get(key)
+    except Exception:
+        logger.exception("Catalog cache read failed for %s", key)
+        return None
+
+
+def store_entry(key: Optional[str], data) -> dict:
+    """
+    Store data under key and return the entry (also when caching is unavailable).
+    """
+    entry = {"data": data, "etag": compute_etag(data)}
+    if key is not None:
+        try:
+            cache.set(key, entry, timeout=get_timeout())
+        except Exception:
+            logger.exception("Catalog cache write failed for %s", key)
+    return entry
+
+
+def invalidate() -> None:
+    """Bump the catalog version so every cached catalog response is refetched."""
+    try:
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            # Version key missing (evicted or never read): start a fresh version
+            cache.set(VERSION_KEY, _new_version(), timeout=None)
+    except Exception:
+        logger.exception("Catalog cache invalidation failed")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against etag (RFC 9110).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
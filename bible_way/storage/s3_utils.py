@@ -1,3 +1,6 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
 from django.conf import settings
 
@@ -11,6 +14,14 @@ s3_client = boto3.client(
 BUCKET_NAME = settings.AWS_STORAGE_BUCKET_NAME
 REGION = settings.AWS_S3_REGION_NAME
 
+# Upper bound on concurrent uploads per request (boto3 clients are thread-safe)
+UPLOAD_MAX_WORKERS = getattr(settings, 'S3_UPLOAD_MAX_WORKERS', 6)
+
+# DeleteObjects accepts at most this many keys per request
+DELETE_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
 
 def upload_file_to_s3(file_obj, key: str) -> str:
     """
@@ -30,3 +41,49 @@ def upload_file_to_s3(file_obj, key: str) -> str:
     public_url = f"https://{BUCKET_NAME}.s3.{REGION}.amazonaws.com/{key}"
     return public_url
 
+
+def delete_files_from_s3(keys: list) -> None:
+    """Delete objects by key, batching DeleteObjects requests."""
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        s3_client.delete_objects(
+            Bucket=BUCKET_NAME,
+            Delete={
+                "Objects": [{"Key": key} for key in keys[start:start + DELETE_BATCH_SIZE]],
+                "Quiet": True
+            },
+        )
+
+
+def upload_files_to_s3(uploads: list, max_workers: int = None) -> list:
+    """
+    uploads: list of (file_obj, key) pairs
+    Returns the public URLs, in the order of uploads.
+
+    Files are uploaded concurrently on a pool of at most max_workers
+    threads (UPLOAD_MAX_WORKERS by default), so a request with several
+    files waits for the slowest upload rather than the sum of them. If any
+    upload fails, the files that did upload are deleted and the first
+    error is raised.
+    """
+    if not uploads:
+        return []
+    if len(uploads) == 1:
+        file_obj, key = uploads[0]
+        return [upload_file_to_s3(file_obj, key)]
+
+    workers = min(len(uploads), max_workers or UPLOAD_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-upload") as executor:
+        futures = [executor.submit(upload_file_to_s3, file_obj, key) for file_obj, key in uploads]
+    # Leaving the with block waits for every upload, failed or not
+
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        uploaded_keys = [key for (_, key), future in zip(uploads, futures) if future.exception() is None]
+        if uploaded_keys:
+            try:
+                delete_files_from_s3(uploaded_keys)
+            except Exception:
+                logger.exception("Could not remove %d partially uploaded file(s) from S3", len(uploaded_keys))
+        raise errors[0]
+
+    return [future.result() for future in futures]
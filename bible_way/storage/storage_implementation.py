@@ -1,9 +1,19 @@
 from django.contrib.auth.hashers import make_password, check_password
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count, Q, F
+import logging
 import uuid
 import os
-from bible_way.models import User, UserFollowers, Post, Media, Comment, Reaction, Promotion, PromotionImage, PrayerRequest, Verse, Category, AgeGroup, Book, BookContent, Language
+from collections import defaultdict
+from bible_way.models import User, UserFollowers, Post, Media, Comment, Reaction, Promotion, PromotionImage, PrayerRequest, Verse, Category, AgeGroup, Book, BookContent, BookVerse, Language, BookIngestionJob, BookIngestionJobStatusChoices
 from bible_way.storage.s3_utils import upload_file_to_s3 as s3_upload_file
+from bible_way.storage.s3_utils import upload_files_to_s3 as s3_upload_files
+from bible_way.utils.pagination import encode_cursor, decode_cursor
+from bible_way.utils import chapter_payload
+from bible_way.storage import timeline_state
+from bible_way.storage import verse_search
+
+logger = logging.getLogger(__name__)
 
 
 class UserDB:
@@ -133,7 +143,7 @@ class UserDB:
                 current_user_uuid = None
         
         # Search with priority: exact match > starts with > contains
-        from django.db.models import Case, When, IntegerField, Count
+        from django.db.models import Case, When, IntegerField
         
         # Build base query
         base_query = Q(user_name__iexact=query) | Q(user_name__istartswith=query) | Q(user_name__icontains=query)
@@ -210,6 +220,7 @@ class UserDB:
             follower_id=follower,
             followed_id=followed
         )
+        self._backfill_timeline(follower_uuid, followed_uuid)
         return follow_relationship
     
     def unfollow_user(self, follower_id: str, followed_id: str) -> bool:
@@ -223,9 +234,11 @@ class UserDB:
                 followed_id__user_id=followed_uuid
             )
             follow_relationship.delete()
-            return True
         except UserFollowers.DoesNotExist:
             return False
+        
+        self._prune_timeline(follower_uuid, followed_uuid)
+        return True
     
     def create_post(self, user_id: str, title: str = '', description: str = '') -> Post:
         user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
@@ -236,6 +249,7 @@ class UserDB:
             title=title,
             description=description
         )
+        self._fan_out_post(post)
         return post
     
     def get_media_type_from_file(self, file_obj) -> str:
@@ -276,6 +290,21 @@ class UserDB:
         except Exception as e:
             raise Exception(f"Failed to upload file to S3: {str(e)}")
     
+    def upload_post_media_to_s3(self, post: Post, media_files: list, user_id: str) -> list:
+        """
+        Upload a post's files concurrently; returns their URLs in the same order.
+        
+        On failure nothing stays in S3: files that did upload are deleted.
+        """
+        uploads = [
+            (media_file, self._generate_s3_key(str(user_id), str(post.post_id), media_file.name))
+            for media_file in media_files
+        ]
+        try:
+            return s3_upload_files(uploads)
+        except Exception as e:
+            raise Exception(f"Failed to upload file to S3: {str(e)}")
+    
     def create_media(self, post: Post, s3_url: str, media_type: str) -> Media:
         media = Media.objects.create(
             post=post,
@@ -284,6 +313,13 @@ class UserDB:
         )
         return media
     
+    def bulk_create_media(self, post: Post, media_items: list) -> list:
+        """media_items: list of (s3_url, media_type) pairs"""
+        return Media.objects.bulk_create([
+            Media(post=post, media_type=media_type, url=s3_url)
+            for s3_url, media_type in media_items
+        ])
+    
     def get_post_by_id(self, post_id: str) -> Post | None:
         try:
             post_uuid = uuid.UUID(post_id) if isinstance(post_id, str) else post_id
@@ -326,6 +362,7 @@ class UserDB:
             raise Exception("You are not authorized to delete this post")
         
         post.delete()
+        self._remove_post_from_timelines(post_uuid, user_uuid)
         return True
     
     def create_comment(self, post_id: str, user_id: str, description: str) -> Comment:
@@ -335,11 +372,13 @@ class UserDB:
         post = Post.objects.get(post_id=post_uuid)
         user = User.objects.get(user_id=user_uuid)
         
-        comment = Comment.objects.create(
-            post=post,
-            user=user,
-            description=description.strip()
-        )
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                post=post,
+                user=user,
+                description=description.strip()
+            )
+            self._adjust_counter(Post, {'post_id': post.post_id}, 'comments_count', 1)
         return comment
     
     def get_comments_by_post(self, post_id: str, current_user_id: str = None) -> list:
@@ -350,27 +389,17 @@ class UserDB:
         except Post.DoesNotExist:
             raise Exception("Post not found")
         
-        comments = Comment.objects.select_related('user').filter(post_id=post_uuid).annotate(
-            likes_count=Count('reactions')
-        ).order_by('-created_at')
+        comments = list(Comment.objects.select_related('user').filter(post_id=post_uuid).order_by('-created_at'))
         
-        current_user_uuid = None
-        if current_user_id:
-            try:
-                current_user_uuid = uuid.UUID(current_user_id) if isinstance(current_user_id, str) else current_user_id
-            except (ValueError, TypeError):
-                current_user_uuid = None
+        viewer_state = self.get_viewer_state(
+            current_user_id=current_user_id,
+            target_type='comment',
+            target_ids=[comment.comment_id for comment in comments]
+        )
         
         comments_data = []
         for comment in comments:
-            is_liked = False
-            
-            if current_user_uuid:
-                is_liked = Reaction.objects.filter(
-                    comment=comment,
-                    user__user_id=current_user_uuid,
-                    reaction_type=Reaction.LIKE
-                ).exists()
+            is_liked = comment.comment_id in viewer_state['liked_ids']
             
             comments_data.append({
                 'comment_id': str(comment.comment_id),
@@ -425,9 +454,21 @@ class UserDB:
         if comment.user.user_id != user_uuid:
             raise Exception("You are not authorized to delete this comment")
         
-        comment.delete()
+        with transaction.atomic():
+            if comment.post_id:
+                self._adjust_counter(Post, {'post_id': comment.post_id}, 'comments_count', -1)
+            if comment.prayer_request_id:
+                self._adjust_counter(PrayerRequest, {'prayer_request_id': comment.prayer_request_id}, 'comments_count', -1)
+            comment.delete()
         return True
     
+    def _adjust_counter(self, model, lookup: dict, field: str, delta: int) -> None:
+        """Atomically add delta to a denormalized counter column, never going below zero."""
+        queryset = model.objects.filter(**lookup)
+        if delta < 0:
+            queryset = queryset.filter(**{f"{field}__gte": -delta})
+        queryset.update(**{field: F(field) + delta})
+    
     def check_reaction_exists(self, user_id: str, post_id: str = None, comment_id: str = None) -> Reaction | None:
         user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
         
@@ -457,11 +498,13 @@ class UserDB:
             raise Exception("You have already liked this post")
         
         user = User.objects.get(user_id=user_uuid)
-        reaction = Reaction.objects.create(
-            user=user,
-            post=post,
-            reaction_type=Reaction.LIKE
-        )
+        with transaction.atomic():
+            reaction = Reaction.objects.create(
+                user=user,
+                post=post,
+                reaction_type=Reaction.LIKE
+            )
+            self._adjust_counter(Post, {'post_id': post.post_id}, 'likes_count', 1)
         return reaction
     
     def unlike_post(self, post_id: str, user_id: str) -> bool:
@@ -478,7 +521,9 @@ class UserDB:
         except Reaction.DoesNotExist:
             raise Exception("You have not liked this post")
         
-        reaction.delete()
+        with transaction.atomic():
+            reaction.delete()
+            self._adjust_counter(Post, {'post_id': post.post_id}, 'likes_count', -1)
         return True
     
     def like_comment(self, comment_id: str, user_id: str) -> Reaction:
@@ -495,11 +540,13 @@ class UserDB:
             raise Exception("You have already liked this comment")
         
         user = User.objects.get(user_id=user_uuid)
-        reaction = Reaction.objects.create(
-            user=user,
-            comment=comment,
-            reaction_type=Reaction.LIKE
-        )
+        with transaction.atomic():
+            reaction = Reaction.objects.create(
+                user=user,
+                comment=comment,
+                reaction_type=Reaction.LIKE
+            )
+            self._adjust_counter(Comment, {'comment_id': comment.comment_id}, 'likes_count', 1)
         return reaction
     
     def unlike_comment(self, comment_id: str, user_id: str) -> bool:
@@ -516,23 +563,69 @@ class UserDB:
         except Reaction.DoesNotExist:
             raise Exception("You have not liked this comment")
         
-        reaction.delete()
+        with transaction.atomic():
+            reaction.delete()
+            self._adjust_counter(Comment, {'comment_id': comment.comment_id}, 'likes_count', -1)
         return True
     
-    def get_all_posts_with_counts(self, limit: int = 10, offset: int = 0, current_user_id: str = None) -> dict:
-        total_count = Post.objects.count()
+    def get_viewer_state(self, current_user_id: str, target_type: str, target_ids: list, include_commented: bool = False) -> dict:
+        """
+        Resolve is_liked / is_commented for a whole page of targets at once.
         
-        posts = Post.objects.select_related('user').prefetch_related('media').annotate(
-            likes_count=Count('reactions', filter=Q(reactions__post__isnull=False)),
-            comments_count=Count('comments')
-        ).order_by('-created_at')[offset:offset + limit]
+        Args:
+            current_user_id: Viewer's user_id (None resolves every flag to False)
+            target_type: 'post', 'comment' or 'prayer_request'
+            target_ids: Primary keys of the targets on the page
+            include_commented: Also resolve is_commented (posts and prayer requests only)
         
-        current_user_uuid = None
-        if current_user_id:
-            try:
-                current_user_uuid = uuid.UUID(current_user_id) if isinstance(current_user_id, str) else current_user_id
-            except (ValueError, TypeError):
-                current_user_uuid = None
+        Returns:
+            Dictionary with:
+            - liked_ids: Set of target ids the viewer has liked
+            - commented_ids: Set of target ids the viewer has commented on
+        """
+        viewer_state = {
+            'liked_ids': set(),
+            'commented_ids': set()
+        }
+        
+        if not current_user_id or not target_ids:
+            return viewer_state
+        
+        try:
+            current_user_uuid = uuid.UUID(current_user_id) if isinstance(current_user_id, str) else current_user_id
+        except (ValueError, TypeError):
+            return viewer_state
+        
+        target_field = f"{target_type}_id"
+        
+        viewer_state['liked_ids'] = set(
+            Reaction.objects.filter(
+                user__user_id=current_user_uuid,
+                reaction_type=Reaction.LIKE,
+                **{f"{target_field}__in": target_ids}
+            ).values_list(target_field, flat=True)
+        )
+        
+        if include_commented and target_type != 'comment':
+            viewer_state['commented_ids'] = set(
+                Comment.objects.filter(
+                    user__user_id=current_user_uuid,
+                    **{f"{target_field}__in": target_ids}
+                ).values_list(target_field, flat=True).distinct()
+            )
+        
+        return viewer_state
+    
+    def _get_feed_queryset(self):
+        return Post.objects.select_related('user').prefetch_related('media')
+    
+    def _format_feed_posts(self, posts: list, current_user_id: str = None) -> list:
+        viewer_state = self.get_viewer_state(
+            current_user_id=current_user_id,
+            target_type='post',
+            target_ids=[post.post_id for post in posts],
+            include_commented=True
+        )
         
         posts_data = []
         for post in posts:
@@ -544,20 +637,8 @@ class UserDB:
                     'url': media.url
                 })
             
-            is_liked = False
-            is_commented = False
-            
-            if current_user_uuid:
-                is_liked = Reaction.objects.filter(
-                    post=post,
-                    user__user_id=current_user_uuid,
-                    reaction_type=Reaction.LIKE
-                ).exists()
-                
-                is_commented = Comment.objects.filter(
-                    post=post,
-                    user__user_id=current_user_uuid
-                ).exists()
+            is_liked = post.post_id in viewer_state['liked_ids']
+            is_commented = post.post_id in viewer_state['commented_ids']
             
             posts_data.append({
                 'post_id': str(post.post_id),
@@ -577,6 +658,14 @@ class UserDB:
                 'updated_at': post.updated_at.isoformat()
             })
         
+        return posts_data
+    
+    def get_all_posts_with_counts(self, limit: int = 10, offset: int = 0, current_user_id: str = None) -> dict:
+        total_count = Post.objects.count()
+        
+        posts = list(self._get_feed_queryset().order_by('-created_at')[offset:offset + limit])
+        posts_data = self._format_feed_posts(posts, current_user_id=current_user_id)
+        
         has_next = (offset + limit) < total_count
         has_previous = offset > 0
         
@@ -589,21 +678,257 @@ class UserDB:
             'has_previous': has_previous
         }
     
+    def get_all_posts_by_cursor(self, limit: int = 10, cursor: str = None, current_user_id: str = None) -> dict:
+        """
+        Keyset-paginated feed ordered by (created_at, post_id) descending.
+        
+        Args:
+            limit: Page size
+            cursor: Opaque cursor from a previous page's next_cursor (None for the first page)
+            current_user_id: Viewer's user_id for is_liked / is_commented
+        
+        Returns:
+            Dictionary with:
+            - posts: List of post dictionaries
+            - limit: Page size
+            - next_cursor: Cursor for the next page, or None on the last page
+            - has_next: Whether another page exists
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        queryset = self._get_feed_queryset()
+        
+        if cursor:
+            cursor_created_at, cursor_post_id = decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=cursor_created_at) |
+                Q(created_at=cursor_created_at, post_id__lt=cursor_post_id)
+            )
+        
+        # Fetch one extra row to know whether a next page exists without a COUNT
+        posts = list(queryset.order_by('-created_at', '-post_id')[:limit + 1])
+        has_next = len(posts) > limit
+        posts = posts[:limit]
+        
+        next_cursor = None
+        if has_next and posts:
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].post_id)
+        
+        return {
+            'posts': self._format_feed_posts(posts, current_user_id=current_user_id),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'has_next': has_next
+        }
+    
+    def _get_follower_ids(self, user_uuid) -> list:
+        return [
+            str(follower_id) for follower_id in
+            UserFollowers.objects.filter(followed_id__user_id=user_uuid).values_list('follower_id__user_id', flat=True)
+        ]
+    
+    def _fan_out_post(self, post: Post) -> None:
+        """
+        Push a new post into the home timeline of every follower of its author.
+        
+        Authors above HOME_TIMELINE_FANOUT_MAX_FOLLOWERS are marked as pull
+        authors instead and merged into timelines at read time. Timeline
+        failures are logged and never fail the write; cold timelines are
+        rebuilt from the database on read.
+        """
+        if not timeline_state.is_timeline_enabled():
+            return
+        try:
+            author_uuid = post.user.user_id
+            if timeline_state.is_pull_author(author_uuid):
+                return
+            
+            follower_ids = self._get_follower_ids(author_uuid)
+            if len(follower_ids) > timeline_state.get_fanout_max_followers():
+                timeline_state.mark_pull_author(author_uuid)
+                return
+            
+            timeline_state.add_posts_to_timelines(follower_ids, [(post.post_id, post.created_at)])
+        except Exception:
+            logger.exception("Failed to fan out post %s to home timelines", post.post_id)
+    
+    def _remove_post_from_timelines(self, post_uuid, author_uuid) -> None:
+        if not timeline_state.is_timeline_enabled():
+            return
+        try:
+            if timeline_state.is_pull_author(author_uuid):
+                return
+            timeline_state.remove_posts_from_timelines(self._get_follower_ids(author_uuid), [post_uuid])
+        except Exception:
+            logger.exception("Failed to remove post %s from home timelines", post_uuid)
+    
+    def _get_recent_post_entries(self, limit: int, **filters) -> list:
+        return list(
+            Post.objects.filter(**filters)
+            .order_by('-created_at', '-post_id')
+            .values_list('post_id', 'created_at')[:limit]
+        )
+    
+    def _backfill_timeline(self, follower_uuid, followed_uuid) -> None:
+        """Merge a newly followed author's recent posts into the follower's timeline."""
+        if not timeline_state.is_timeline_enabled():
+            return
+        try:
+            if timeline_state.is_pull_author(followed_uuid):
+                return
+            entries = self._get_recent_post_entries(timeline_state.get_max_length(), user__user_id=followed_uuid)
+            timeline_state.add_posts_to_timelines([str(follower_uuid)], entries)
+        except Exception:
+            logger.exception("Failed to backfill home timeline of user %s", follower_uuid)
+    
+    def _prune_timeline(self, follower_uuid, followed_uuid) -> None:
+        """Drop an unfollowed author's posts from the follower's timeline."""
+        if not timeline_state.is_timeline_enabled():
+            return
+        try:
+            entries = self._get_recent_post_entries(timeline_state.get_max_length(), user__user_id=followed_uuid)
+            timeline_state.remove_posts_from_timelines([str(follower_uuid)], [post_id for post_id, _ in entries])
+        except Exception:
+            logger.exception("Failed to prune home timeline of user %s", follower_uuid)
+    
+    def _get_home_timeline_from_db(self, user_uuid, limit: int, cursor_created_at=None, cursor_post_id=None, author_ids: list = None) -> list:
+        """
+        Pull-on-read path: newest posts by followed authors, strictly older than the cursor.
+        
+        When author_ids is given only those authors are read (used for pull
+        authors); otherwise every author user_uuid follows.
+        """
+        queryset = Post.objects.filter(user__followed__follower_id__user_id=user_uuid)
+        if author_ids is not None:
+            queryset = queryset.filter(user__user_id__in=author_ids)
+        if cursor_created_at is not None:
+            queryset = queryset.filter(
+                Q(created_at__lt=cursor_created_at) |
+                Q(created_at=cursor_created_at, post_id__lt=cursor_post_id)
+            )
+        return list(queryset.order_by('-created_at', '-post_id').values_list('post_id', 'created_at')[:limit])
+    
+    def _rebuild_home_timeline(self, user_uuid, pull_author_ids: list) -> bool:
+        entries = list(
+            Post.objects.filter(user__followed__follower_id__user_id=user_uuid)
+            .exclude(user__user_id__in=pull_author_ids)
+            .order_by('-created_at', '-post_id')
+            .values_list('post_id', 'created_at')[:timeline_state.get_max_length()]
+        )
+        timeline_state.replace_timeline(str(user_uuid), entries)
+        return bool(entries)
+    
+    def get_home_timeline(self, current_user_id: str, limit: int = 10, cursor: str = None) -> dict:
+        """
+        Home timeline of posts by authors the user follows, newest first.
+        
+        Fanned-out posts are read from the user's Redis sorted set and merged
+        with posts from pull authors (high-follower accounts) read from the
+        database. Falls back to a database read when Redis is disabled or the
+        page runs past the trimmed end of the materialized timeline.
+        
+        Args:
+            current_user_id: Viewer's user_id
+            limit: Page size
+            cursor: Opaque cursor from a previous page's next_cursor (None for the first page)
+        
+        Returns:
+            Dictionary with:
+            - posts: List of post dictionaries (same shape as the global feed)
+            - limit: Page size
+            - next_cursor: Cursor for the next page, or None on the last page
+            - has_next: Whether another page exists
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        user_uuid = uuid.UUID(current_user_id) if isinstance(current_user_id, str) else current_user_id
+        
+        cursor_created_at, cursor_post_id = None, None
+        if cursor:
+            cursor_created_at, cursor_post_id = decode_cursor(cursor)
+        
+        # Fetch one extra entry to know whether a next page exists
+        entries = None
+        if timeline_state.is_timeline_enabled():
+            try:
+                entries = self._get_materialized_home_entries(user_uuid, limit + 1, cursor_created_at, cursor_post_id)
+            except Exception:
+                logger.exception("Failed to read home timeline of user %s, falling back to database", user_uuid)
+        if entries is None:
+            entries = [
+                (str(post_id), timeline_state.to_score(created_at))
+                for post_id, created_at in self._get_home_timeline_from_db(user_uuid, limit + 1, cursor_created_at, cursor_post_id)
+            ]
+        
+        has_next = len(entries) > limit
+        entries = entries[:limit]
+        
+        posts_by_id = {
+            str(post.post_id): post
+            for post in self._get_feed_queryset().filter(post_id__in=[post_id for post_id, _ in entries])
+        }
+        posts = [posts_by_id[post_id] for post_id, _ in entries if post_id in posts_by_id]
+        
+        next_cursor = None
+        if has_next and posts:
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].post_id)
+        
+        return {
+            'posts': self._format_feed_posts(posts, current_user_id=current_user_id),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'has_next': has_next
+        }
+    
+    def _get_materialized_home_entries(self, user_uuid, limit: int, cursor_created_at=None, cursor_post_id=None) -> list | None:
+        """
+        Read (post_id, score) entries from the Redis timeline merged with pull authors.
+        
+        Returns None when the page cannot be served from Redis alone (empty
+        after rebuild, or the trimmed end of the timeline was reached).
+        """
+        pull_author_ids = timeline_state.get_pull_authors()
+        cursor_score = timeline_state.to_score(cursor_created_at) if cursor_created_at is not None else None
+        
+        page = timeline_state.get_timeline_page(str(user_uuid), limit, cursor_score, cursor_post_id)
+        if page is None:
+            if not self._rebuild_home_timeline(user_uuid, pull_author_ids):
+                return None
+            page = timeline_state.get_timeline_page(str(user_uuid), limit, cursor_score, cursor_post_id)
+            if page is None:
+                return None
+        
+        entries, is_full = page
+        if len(entries) < limit and is_full:
+            return None
+        
+        if pull_author_ids:
+            pulled = self._get_home_timeline_from_db(
+                user_uuid, limit, cursor_created_at, cursor_post_id, author_ids=pull_author_ids
+            )
+            seen = {post_id for post_id, _ in entries}
+            entries.extend(
+                (str(post_id), timeline_state.to_score(created_at))
+                for post_id, created_at in pulled if str(post_id) not in seen
+            )
+            entries.sort(key=lambda entry: (entry[1], entry[0]), reverse=True)
+        
+        return entries[:limit]
+    
     def get_user_posts_with_counts(self, user_id: str, limit: int = 10, offset: int = 0, current_user_id: str = None) -> dict:
         user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
         total_count = Post.objects.filter(user__user_id=user_uuid).count()
         
-        posts = Post.objects.prefetch_related('media').filter(user__user_id=user_uuid).annotate(
-            likes_count=Count('reactions', filter=Q(reactions__post__isnull=False)),
-            comments_count=Count('comments')
-        ).order_by('-created_at')[offset:offset + limit]
+        posts = list(Post.objects.prefetch_related('media').filter(user__user_id=user_uuid).order_by('-created_at')[offset:offset + limit])
         
-        current_user_uuid = None
-        if current_user_id:
-            try:
-                current_user_uuid = uuid.UUID(current_user_id) if isinstance(current_user_id, str) else current_user_id
-            except (ValueError, TypeError):
-                current_user_uuid = None
+        viewer_state = self.get_viewer_state(
+            current_user_id=current_user_id,
+            target_type='post',
+            target_ids=[post.post_id for post in posts],
+            include_commented=True
+        )
         
         posts_data = []
         for post in posts:
@@ -615,20 +940,8 @@ class UserDB:
                     'url': media.url
                 })
             
-            is_liked = False
-            is_commented = False
-            
-            if current_user_uuid:
-                is_liked = Reaction.objects.filter(
-                    post=post,
-                    user__user_id=current_user_uuid,
-                    reaction_type=Reaction.LIKE
-                ).exists()
-                
-                is_commented = Comment.objects.filter(
-                    post=post,
-                    user__user_id=current_user_uuid
-                ).exists()
+            is_liked = post.post_id in viewer_state['liked_ids']
+            is_commented = post.post_id in viewer_state['commented_ids']
             
             posts_data.append({
                 'post_id': str(post.post_id),
@@ -658,9 +971,7 @@ class UserDB:
     def get_user_comments(self, user_id: str) -> list:
         user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
         
-        comments = Comment.objects.filter(user__user_id=user_uuid).annotate(
-            likes_count=Count('reactions')
-        ).order_by('-created_at')
+        comments = Comment.objects.filter(user__user_id=user_uuid).order_by('-created_at')
         
         comments_data = []
         for comment in comments:
@@ -762,13 +1073,16 @@ class UserDB:
         prayer_request.delete()
         return True
     
-    def get_all_prayer_requests(self, limit: int = 10, offset: int = 0) -> dict:
-        total_count = PrayerRequest.objects.count()
-        
-        prayer_requests = PrayerRequest.objects.select_related('user').annotate(
-            comments_count=Count('comments'),
-            reactions_count=Count('reactions')
-        ).order_by('-created_at')[offset:offset + limit]
+    def _get_prayer_requests_queryset(self):
+        return PrayerRequest.objects.select_related('user')
+    
+    def _format_prayer_requests(self, prayer_requests: list, current_user_id: str = None) -> list:
+        viewer_state = self.get_viewer_state(
+            current_user_id=current_user_id,
+            target_type='prayer_request',
+            target_ids=[prayer_request.prayer_request_id for prayer_request in prayer_requests],
+            include_commented=True
+        )
         
         prayer_requests_data = []
         for prayer_request in prayer_requests:
@@ -785,10 +1099,20 @@ class UserDB:
                 'description': prayer_request.description,
                 'comments_count': prayer_request.comments_count,
                 'reactions_count': prayer_request.reactions_count,
+                'is_liked': prayer_request.prayer_request_id in viewer_state['liked_ids'],
+                'is_commented': prayer_request.prayer_request_id in viewer_state['commented_ids'],
                 'created_at': prayer_request.created_at.isoformat(),
                 'updated_at': prayer_request.updated_at.isoformat()
             })
         
+        return prayer_requests_data
+    
+    def get_all_prayer_requests(self, limit: int = 10, offset: int = 0, current_user_id: str = None) -> dict:
+        total_count = PrayerRequest.objects.count()
+        
+        prayer_requests = list(self._get_prayer_requests_queryset().order_by('-created_at')[offset:offset + limit])
+        prayer_requests_data = self._format_prayer_requests(prayer_requests, current_user_id=current_user_id)
+        
         has_next = (offset + limit) < total_count
         has_previous = offset > 0
         
@@ -801,34 +1125,46 @@ class UserDB:
             'has_previous': has_previous
         }
     
-    def get_user_prayer_requests(self, user_id: str, limit: int = 10, offset: int = 0) -> dict:
+    def get_all_prayer_requests_by_cursor(self, limit: int = 10, cursor: str = None, current_user_id: str = None) -> dict:
+        """
+        Keyset-paginated prayer requests ordered by (created_at, prayer_request_id) descending.
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        queryset = self._get_prayer_requests_queryset()
+        
+        if cursor:
+            cursor_created_at, cursor_prayer_request_id = decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=cursor_created_at) |
+                Q(created_at=cursor_created_at, prayer_request_id__lt=cursor_prayer_request_id)
+            )
+        
+        prayer_requests = list(queryset.order_by('-created_at', '-prayer_request_id')[:limit + 1])
+        has_next = len(prayer_requests) > limit
+        prayer_requests = prayer_requests[:limit]
+        
+        next_cursor = None
+        if has_next and prayer_requests:
+            next_cursor = encode_cursor(prayer_requests[-1].created_at, prayer_requests[-1].prayer_request_id)
+        
+        return {
+            'prayer_requests': self._format_prayer_requests(prayer_requests, current_user_id=current_user_id),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'has_next': has_next
+        }
+    
+    def get_user_prayer_requests(self, user_id: str, limit: int = 10, offset: int = 0, current_user_id: str = None) -> dict:
         user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
         
         total_count = PrayerRequest.objects.filter(user__user_id=user_uuid).count()
         
-        prayer_requests = PrayerRequest.objects.filter(user__user_id=user_uuid).select_related('user').annotate(
-            comments_count=Count('comments'),
-            reactions_count=Count('reactions')
-        ).order_by('-created_at')[offset:offset + limit]
-        
-        prayer_requests_data = []
-        for prayer_request in prayer_requests:
-            prayer_requests_data.append({
-                'prayer_request_id': str(prayer_request.prayer_request_id),
-                'user': {
-                    'user_id': str(prayer_request.user.user_id),
-                    'user_name': prayer_request.user.user_name,
-                    'profile_picture_url': prayer_request.user.profile_picture_url or ''
-                },
-                'name': prayer_request.name,
-                'email': prayer_request.email,
-                'phone_number': prayer_request.phone_number,
-                'description': prayer_request.description,
-                'comments_count': prayer_request.comments_count,
-                'reactions_count': prayer_request.reactions_count,
-                'created_at': prayer_request.created_at.isoformat(),
-                'updated_at': prayer_request.updated_at.isoformat()
-            })
+        prayer_requests = list(self._get_prayer_requests_queryset().filter(
+            user__user_id=user_uuid
+        ).order_by('-created_at')[offset:offset + limit])
+        prayer_requests_data = self._format_prayer_requests(prayer_requests, current_user_id=current_user_id)
         
         has_next = (offset + limit) < total_count
         has_previous = offset > 0
@@ -853,14 +1189,16 @@ class UserDB:
         
         user = User.objects.get(user_id=user_uuid)
         
-        comment = Comment.objects.create(
-            prayer_request=prayer_request,
-            user=user,
-            description=description.strip()
-        )
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                prayer_request=prayer_request,
+                user=user,
+                description=description.strip()
+            )
+            self._adjust_counter(PrayerRequest, {'prayer_request_id': prayer_request.prayer_request_id}, 'comments_count', 1)
         return comment
     
-    def get_prayer_request_comments(self, prayer_request_id: str) -> list:
+    def get_prayer_request_comments(self, prayer_request_id: str, current_user_id: str = None) -> list:
         prayer_request_uuid = uuid.UUID(prayer_request_id) if isinstance(prayer_request_id, str) else prayer_request_id
         
         try:
@@ -868,9 +1206,13 @@ class UserDB:
         except PrayerRequest.DoesNotExist:
             raise Exception("Prayer request not found")
         
-        comments = Comment.objects.select_related('user').filter(prayer_request_id=prayer_request_uuid).annotate(
-            likes_count=Count('reactions')
-        ).order_by('-created_at')
+        comments = list(Comment.objects.select_related('user').filter(prayer_request_id=prayer_request_uuid).order_by('-created_at'))
+        
+        viewer_state = self.get_viewer_state(
+            current_user_id=current_user_id,
+            target_type='comment',
+            target_ids=[comment.comment_id for comment in comments]
+        )
         
         comments_data = []
         for comment in comments:
@@ -883,6 +1225,7 @@ class UserDB:
                 },
                 'description': comment.description,
                 'likes_count': comment.likes_count,
+                'is_liked': comment.comment_id in viewer_state['liked_ids'],
                 'created_at': comment.created_at.isoformat(),
                 'updated_at': comment.updated_at.isoformat()
             })
@@ -914,11 +1257,13 @@ class UserDB:
             raise Exception("You have already liked this prayer request")
         
         user = User.objects.get(user_id=user_uuid)
-        reaction = Reaction.objects.create(
-            user=user,
-            prayer_request=prayer_request,
-            reaction_type=Reaction.LIKE
-        )
+        with transaction.atomic():
+            reaction = Reaction.objects.create(
+                user=user,
+                prayer_request=prayer_request,
+                reaction_type=Reaction.LIKE
+            )
+            self._adjust_counter(PrayerRequest, {'prayer_request_id': prayer_request.prayer_request_id}, 'reactions_count', 1)
         return reaction
     
     def unlike_prayer_request(self, prayer_request_id: str, user_id: str) -> bool:
@@ -935,7 +1280,9 @@ class UserDB:
         except Reaction.DoesNotExist:
             raise Exception("You have not liked this prayer request")
         
-        reaction.delete()
+        with transaction.atomic():
+            reaction.delete()
+            self._adjust_counter(PrayerRequest, {'prayer_request_id': prayer_request.prayer_request_id}, 'reactions_count', -1)
         return True
     
     def get_verse(self):
@@ -987,16 +1334,25 @@ class UserDB:
         return promotion
     
     def create_promotion_images(self, promotion: Promotion, image_urls: list) -> list:
-        promotion_images = []
-        for index, image_url in enumerate(image_urls):
-            promotion_image = PromotionImage.objects.create(
+        return PromotionImage.objects.bulk_create([
+            PromotionImage(
                 promotion=promotion,
                 image_url=image_url,
                 image_type='image',
                 order=index
             )
-            promotion_images.append(promotion_image)
-        return promotion_images
+            for index, image_url in enumerate(image_urls)
+        ])
+    
+    def delete_promotion(self, promotion_id: str) -> bool:
+        promotion_uuid = uuid.UUID(promotion_id) if isinstance(promotion_id, str) else promotion_id
+        deleted, _ = Promotion.objects.filter(promotion_id=promotion_uuid).delete()
+        return deleted > 0
+    
+    def delete_media(self, media_id: str) -> bool:
+        media_uuid = uuid.UUID(media_id) if isinstance(media_id, str) else media_id
+        deleted, _ = Media.objects.filter(media_id=media_uuid).delete()
+        return deleted > 0
     
     def create_category(self, category_name: str, cover_image_url: str = None, description: str = None, display_order: int = 0) -> Category:
         category = Category.objects.create(
@@ -1037,6 +1393,14 @@ class UserDB:
     def get_book_by_id(self, book_id: str):
         return Book.objects.select_related('category', 'age_group', 'language').get(book_id=book_id)
     
+    def get_book_by_id_for_update(self, book_id: str):
+        """Get a book and row-lock it until the current transaction ends (serializes re-ingests)."""
+        return (
+            Book.objects.select_related('category', 'age_group', 'language')
+            .select_for_update(of=('self',))
+            .get(book_id=book_id)
+        )
+    
     def get_book_chapters(self, book_id: str):
         return BookContent.objects.filter(book__book_id=book_id).order_by('content_order', 'chapter_number')
     
@@ -1065,7 +1429,7 @@ class UserDB:
     
     def create_book_content(self, book: Book, chapter_number: int, chapter_title: str,
                            content: str, content_order: int, metadata: dict = None) -> BookContent:
-        book_content = BookContent.objects.create(
+        book_content = BookContent(
             book=book,
             chapter_number=chapter_number,
             chapter_title=chapter_title,
@@ -1073,6 +1437,8 @@ class UserDB:
             content_order=content_order,
             metadata=metadata or {}
         )
+        self._apply_compressed_payload(book_content)
+        book_content.save()
         return book_content
     
     def bulk_create_book_contents(self, book: Book, chapters_data: list) -> list:
@@ -1086,11 +1452,232 @@ class UserDB:
                 content_order=chapter_data.get('content_order', chapter_data['chapter_number']),
                 metadata=chapter_data.get('metadata', {})
             )
+            self._apply_compressed_payload(book_content)
             book_contents.append(book_content)
         
         BookContent.objects.bulk_create(book_contents)
+        self._bulk_create_verses(book, zip(book_contents, chapters_data))
         return book_contents
     
+    def _bulk_create_verses(self, book: Book, contents_with_data) -> None:
+        """Store parsed verses (chapter_data['verses']); FTS triggers index them on insert."""
+        verses = []
+        for book_content, chapter_data in contents_with_data:
+            for verse in chapter_data.get('verses') or []:
+                verses.append(BookVerse(
+                    book=book,
+                    book_content=book_content,
+                    chapter_number=book_content.chapter_number,
+                    verse_number=verse['verse_number'],
+                    text=verse['text']
+                ))
+        if verses:
+            BookVerse.objects.bulk_create(verses, batch_size=500)
+    
+    def _compressed_payload_fields(self, book_content: BookContent) -> dict:
+        fields = chapter_payload.compress_chapter(book_content)
+        fields['content_hash'] = chapter_payload.chapter_hash(book_content)
+        return fields
+    
+    def _apply_compressed_payload(self, book_content: BookContent) -> None:
+        """Render, compress and hash the chapter once so reads never re-encode content."""
+        for field, value in self._compressed_payload_fields(book_content).items():
+            setattr(book_content, field, value)
+    
+    def sync_book_contents(self, book: Book, chapters_data: list) -> dict:
+        """
+        Bring a book's chapters in line with a fresh parse, touching only what changed.
+        
+        Chapters are matched on chapter_number and compared by content_hash.
+        Numbers are taken from the headings, so they can repeat (e.g. a "Chapter
+        1" in each part of a book); chapters sharing a number are paired in
+        reading order, and existing duplicates are matched or removed the same way.
+        Changed chapters are updated in place with one bulk UPDATE, so they keep
+        their book_content_id and every ReadingProgress, ReadingNote and
+        Highlight pointing at them. Unchanged rows are not written at all, and
+        their content is never loaded. Chapters missing from the new parse are
+        deleted. Call inside a transaction.
+        
+        Args:
+            book: Book being re-ingested
+            chapters_data: Parsed chapters, as for bulk_create_book_contents
+        
+        Returns:
+            Dict of chapters_created, chapters_updated, chapters_unchanged, chapters_removed
+        """
+        from django.utils import timezone
+        existing = defaultdict(list)
+        for chapter in (
+            BookContent.objects.filter(book=book)
+            .only('book_content_id', 'chapter_number', 'content_order', 'content_hash')
+            .order_by('content_order', 'chapter_number')
+        ):
+            existing[chapter.chapter_number].append(chapter)
+        
+        to_create = []
+        to_update = []
+        verses_to_create = []
+        unchanged = 0
+        now = timezone.now()
+        for chapter_data in chapters_data:
+            same_number = existing.get(chapter_data['chapter_number'])
+            current = same_number.pop(0) if same_number else None
+            book_content = BookContent(
+                book=book,
+                chapter_number=chapter_data['chapter_number'],
+                chapter_title=chapter_data['chapter_title'],
+                content=chapter_data['content'],
+                content_order=chapter_data.get('content_order', chapter_data['chapter_number']),
+                metadata=chapter_data.get('metadata', {})
+            )
+            if current is None:
+                self._apply_compressed_payload(book_content)
+                to_create.append(book_content)
+                verses_to_create.append((book_content, chapter_data))
+                continue
+            
+            # Rows stored before hashing existed have no hash and are rewritten once
+            if current.content_hash and current.content_hash == chapter_payload.chapter_hash(book_content):
+                unchanged += 1
+                continue
+            
+            # Keep the existing primary key so references to the chapter survive
+            book_content.book_content_id = current.book_content_id
+            book_content.updated_at = now
+            self._apply_compressed_payload(book_content)
+            to_update.append(book_content)
+            verses_to_create.append((book_content, chapter_data))
+        
+        if to_create:
+            BookContent.objects.bulk_create(to_create)
+        if to_update:
+            BookContent.objects.bulk_update(
+                to_update,
+                [
+                    'chapter_title', 'content', 'content_order', 'metadata',
+                    'content_deflate', 'content_crc32', 'content_size', 'content_brotli',
+                    'content_hash', 'updated_at'
+                ],
+                batch_size=100
+            )
+            # Re-index only the verses of edited chapters
+            BookVerse.objects.filter(
+                book_content_id__in=[book_content.book_content_id for book_content in to_update]
+            ).delete()
+        self._bulk_create_verses(book, verses_to_create)
+        removed = [chapter.book_content_id for chapters in existing.values() for chapter in chapters]
+        if removed:
+            BookContent.objects.filter(book_content_id__in=removed).delete()
+        
+        return {
+            'chapters_created': len(to_create),
+            'chapters_updated': len(to_update),
+            'chapters_unchanged': unchanged,
+            'chapters_removed': len(removed)
+        }
+    
+    def get_book_chapters_for_reading(self, book_id: str, start_chapter: int, end_chapter: int, encoding: str) -> list:
+        """
+        Chapters start_chapter..end_chapter (inclusive) of an active book, in reading order.
+        
+        Only the columns needed for the negotiated encoding are loaded, so the
+        large content TextField is not read when a pre-compressed payload is
+        served. Chapters stored before pre-compression existed are compressed
+        and hashed on first read and saved back.
+        
+        Args:
+            book_id: Book UUID
+            start_chapter: First chapter_number
+            end_chapter: Last chapter_number
+            encoding: 'br', 'gzip' or 'identity' (see chapter_payload.choose_encoding)
+        
+        Returns:
+            List of BookContent instances
+        """
+        chapters = BookContent.objects.filter(
+            book__book_id=book_id,
+            book__is_active=True,
+            chapter_number__gte=start_chapter,
+            chapter_number__lte=end_chapter
+        ).order_by('content_order', 'chapter_number')
+        
+        if encoding == chapter_payload.BROTLI:
+            chapters = chapters.defer('content', 'content_deflate')
+        elif encoding == chapter_payload.GZIP:
+            chapters = chapters.defer('content', 'content_brotli')
+        else:
+            chapters = chapters.defer('content_deflate', 'content_brotli')
+        
+        chapters = list(chapters)
+        for chapter in chapters:
+            missing_payload = (
+                not chapter.content_hash or
+                (encoding == chapter_payload.GZIP and chapter.content_deflate is None) or
+                (encoding == chapter_payload.BROTLI and chapter.content_brotli is None)
+            )
+            if missing_payload:
+                fields = self._compressed_payload_fields(chapter)
+                BookContent.objects.filter(book_content_id=chapter.book_content_id).update(**fields)
+                for field, value in fields.items():
+                    setattr(chapter, field, value)
+        
+        return chapters
+    
+    def search_book_verses(self, query: str, book_id: str = None, language_id: str = None,
+                           age_group_id: str = None, limit: int = 20, offset: int = 0) -> dict:
+        """
+        Full-text verse search over active books, best match first.
+        
+        Args:
+            query: Free text; every word must match, the last one as a prefix
+            book_id, language_id, age_group_id: Optional filters
+            limit, offset: Page of results
+        
+        Returns:
+            Dict with:
+            - results: List of verse dicts with a highlighted snippet and score (higher is better)
+            - limit, offset, has_next, has_previous
+        """
+        # One extra row tells whether another page exists without a COUNT over the index
+        matches = verse_search.search(
+            query,
+            book_id=book_id,
+            language_id=language_id,
+            age_group_id=age_group_id,
+            limit=limit + 1,
+            offset=offset
+        )
+        has_next = len(matches) > limit
+        
+        results = []
+        for match in matches[:limit]:
+            verse = match['verse']
+            book = verse.book
+            results.append({
+                'book_id': str(book.book_id),
+                'book_title': book.title,
+                'language_id': str(book.language.language_id),
+                'language_name': book.language.get_language_name_display(),
+                'age_group_id': str(book.age_group.age_group_id),
+                'age_group_name': book.age_group.get_age_group_name_display(),
+                'book_content_id': str(verse.book_content_id),
+                'chapter_number': verse.chapter_number,
+                'chapter_title': verse.book_content.chapter_title,
+                'verse_number': verse.verse_number,
+                'reference': f"{verse.chapter_number}:{verse.verse_number}",
+                'text': verse.text,
+                'snippet': match['snippet'],
+                'score': round(-match['rank'], 6)
+            })
+        
+        return {
+            'results': results,
+            'limit': limit,
+            'offset': offset,
+            'has_next': has_next,
+            'has_previous': offset > 0
+        }
+    
     def update_book_parsed_status(self, book_id: str, total_chapters: int, parsed_at=None) -> Book:
         from django.utils import timezone
         book = Book.objects.get(book_id=book_id)
@@ -1101,4 +1688,207 @@ class UserDB:
         else:
             book.parsed_at = timezone.now()
         book.save()
-        return book
\ No newline at end of file
+        return book
+    
+    def update_book_source_file(self, book_id: str, source_file_name: str, source_file_url: str, title: str = None) -> None:
+        fields = {
+            'source_file_name': source_file_name,
+            'source_file_url': source_file_url
+        }
+        if title:
+            fields['title'] = title
+        book = Book.objects.get(book_id=book_id)
+        for field, value in fields.items():
+            setattr(book, field, value)
+        book.save(update_fields=[*fields, 'updated_at'])
+    
+    def stage_ingestion_file(self, file_obj, job_key: str, filename: str) -> str:
+        """
+        Copy an upload to local staging storage for the ingestion worker.
+        
+        Args:
+            file_obj: Django UploadedFile
+            job_key: Unique directory name for this job
+            filename: Original file name
+        
+        Returns:
+            Absolute path of the staged file
+        """
+        from django.conf import settings
+        staging_dir = os.path.join(str(settings.BOOK_INGESTION_STAGING_DIR), job_key)
+        os.makedirs(staging_dir, exist_ok=True)
+        staged_path = os.path.join(staging_dir, os.path.basename(filename))
+        
+        with open(staged_path, 'wb') as staged_file:
+            for chunk in file_obj.chunks():
+                staged_file.write(chunk)
+        return staged_path
+    
+    def remove_staged_ingestion_files(self, job: BookIngestionJob) -> None:
+        for path in (job.staged_markdown_path, job.staged_cover_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+        staging_dir = os.path.dirname(job.staged_markdown_path) if job.staged_markdown_path else None
+        if staging_dir and os.path.isdir(staging_dir) and not os.listdir(staging_dir):
+            os.rmdir(staging_dir)
+    
+    def create_ingestion_job(self, job_id, created_by_id: str, params: dict,
+                             staged_markdown_path: str, markdown_file_name: str, markdown_content_type: str = None,
+                             staged_cover_path: str = '', cover_file_name: str = '', cover_content_type: str = None,
+                             book: Book = None) -> BookIngestionJob:
+        created_by_uuid = uuid.UUID(created_by_id) if isinstance(created_by_id, str) else created_by_id
+        created_by = User.objects.filter(user_id=created_by_uuid).first() if created_by_uuid else None
+        
+        return BookIngestionJob.objects.create(
+            job_id=job_id,
+            created_by=created_by,
+            book=book,
+            params=params,
+            staged_markdown_path=staged_markdown_path,
+            markdown_file_name=markdown_file_name,
+            markdown_content_type=markdown_content_type or 'text/markdown',
+            staged_cover_path=staged_cover_path or '',
+            cover_file_name=cover_file_name or '',
+            cover_content_type=cover_content_type or ''
+        )
+    
+    def get_ingestion_job(self, job_id: str) -> BookIngestionJob | None:
+        try:
+            job_uuid = uuid.UUID(job_id) if isinstance(job_id, str) else job_id
+            return BookIngestionJob.objects.select_related('book').get(job_id=job_uuid)
+        except BookIngestionJob.DoesNotExist:
+            return None
+        except (ValueError, TypeError):
+            return None
+    
+    def format_ingestion_job(self, job: BookIngestionJob) -> dict:
+        return {
+            'job_id': str(job.job_id),
+            'mode': (job.params or {}).get('mode', 'create'),
+            'status': job.status,
+            'stage': job.stage,
+            'progress': job.progress,
+            'chapters_found': job.chapters_found,
+            'error_message': job.error_message or None,
+            'book_id': str(job.book_id) if job.book_id else None,
+            'result': job.result or None,
+            'markdown_file_name': job.markdown_file_name,
+            'attempts': job.attempts,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None
+        }
+    
+    def claim_next_ingestion_job(self, worker_id: str) -> BookIngestionJob | None:
+        """
+        Claim the oldest PENDING job for worker_id.
+        
+        The claim is a conditional UPDATE on status, so concurrent workers can
+        never both take the same job, on any database backend.
+        
+        Returns:
+            The claimed job (status RUNNING), or None if the queue is empty
+        """
+        from django.utils import timezone
+        candidate_ids = list(
+            BookIngestionJob.objects.filter(status=BookIngestionJobStatusChoices.PENDING)
+            .order_by('created_at')
+            .values_list('job_id', flat=True)[:10]
+        )
+        for job_id in candidate_ids:
+            now = timezone.now()
+            claimed = BookIngestionJob.objects.filter(
+                job_id=job_id,
+                status=BookIngestionJobStatusChoices.PENDING
+            ).update(
+                status=BookIngestionJobStatusChoices.RUNNING,
+                locked_by=worker_id,
+                locked_at=now,
+                started_at=now,
+                attempts=F('attempts') + 1,
+                updated_at=now
+            )
+            if claimed:
+                return BookIngestionJob.objects.get(job_id=job_id)
+        return None
+    
+    def update_ingestion_job(self, job_id, worker_id: str, **fields) -> bool:
+        """
+        Update job progress fields without loading the row (also refreshes locked_at as a heartbeat).
+        
+        Only matches while worker_id still holds the job, so a worker whose job
+        was requeued and claimed elsewhere cannot overwrite the new owner's state.
+        
+        Returns:
+            False if worker_id no longer holds the job
+        """
+        from django.utils import timezone
+        now = timezone.now()
+        fields.setdefault('updated_at', now)
+        if fields.get('status', BookIngestionJobStatusChoices.RUNNING) == BookIngestionJobStatusChoices.RUNNING:
+            fields.setdefault('locked_at', now)
+        return bool(self._held_ingestion_job(job_id, worker_id).update(**fields))
+    
+    def touch_ingestion_job(self, job_id, worker_id: str) -> bool:
+        """Refresh the heartbeat of a job held by worker_id; False if the lock was lost."""
+        from django.utils import timezone
+        return bool(self._held_ingestion_job(job_id, worker_id).update(locked_at=timezone.now()))
+    
+    def lock_held_ingestion_job(self, job_id, worker_id: str) -> bool:
+        """
+        Row-lock a job held by worker_id until the current transaction ends.
+        
+        Called before saving the book so a job requeued meanwhile cannot be
+        requeued again mid-save or saved twice.
+        """
+        return self._held_ingestion_job(job_id, worker_id).select_for_update().exists()
+    
+    def _held_ingestion_job(self, job_id, worker_id: str):
+        return BookIngestionJob.objects.filter(
+            job_id=job_id,
+            status=BookIngestionJobStatusChoices.RUNNING,
+            locked_by=worker_id
+        )
+    
+    def requeue_stale_ingestion_jobs(self, stale_after_seconds: int, max_attempts: int) -> int:
+        """
+        Recover RUNNING jobs whose worker stopped sending heartbeats.
+        
+        Jobs with attempts left go back to PENDING; the rest are marked FAILED
+        and their staged files removed.
+        
+        Returns:
+            Number of jobs recovered
+        """
+        from datetime import timedelta
+        from django.utils import timezone
+        now = timezone.now()
+        stale = BookIngestionJob.objects.filter(
+            status=BookIngestionJobStatusChoices.RUNNING,
+            locked_at__lt=now - timedelta(seconds=stale_after_seconds)
+        )
+        
+        failed = 0
+        for job in stale.filter(attempts__gte=max_attempts):
+            # Conditional per job: a heartbeat may have arrived since the SELECT
+            if not stale.filter(job_id=job.job_id).update(
+                status=BookIngestionJobStatusChoices.FAILED,
+                error_message="Worker stopped responding",
+                finished_at=now,
+                updated_at=now
+            ):
+                continue
+            failed += 1
+            try:
+                self.remove_staged_ingestion_files(job)
+            except OSError:
+                logger.warning("Could not remove staged files of ingestion job %s", job.job_id)
+        
+        requeued = stale.filter(attempts__lt=max_attempts).update(
+            status=BookIngestionJobStatusChoices.PENDING,
+            stage='queued',
+            locked_by='',
+            locked_at=None,
+            updated_at=now
+        )
+        return failed + requeued
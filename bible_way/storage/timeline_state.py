@@ -0,0 +1,195 @@
+"""
+Redis-backed home timelines.
+
+Each user's home timeline is a sorted set `timeline:home:<user_id>` of
+post_id -> created_at timestamp, materialized on write by fanning a new post
+out to every follower's set. Authors with more than
+HOME_TIMELINE_FANOUT_MAX_FOLLOWERS followers are not fanned out; they are
+recorded in `timeline:pull_authors` and their posts are merged in on read.
+
+Timelines only exist for users who read them recently (keys carry a TTL that
+is refreshed on read). Fan-out skips missing keys so inactive users cost
+nothing on write; a missing key is rebuilt from the database on next read.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from project_chat.storage.redis_state import get_redis_client
+
+
+TIMELINE_KEY = "timeline:home:{user_id}"
+PULL_AUTHORS_KEY = "timeline:pull_authors"
+
+# Followers per Redis round trip when fanning out a single post
+FANOUT_BATCH_SIZE = 500
+
+# KEYS = timeline keys, ARGV = [max_length, ttl, score1, member1, score2, member2, ...]
+# Adds every (score, member) pair to each timeline that already exists, then trims it.
+_ADD_TO_EXISTING_SCRIPT = """
+local max_length = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        for i = 3, #ARGV, 2 do
+            redis.call('ZADD', key, ARGV[i], ARGV[i + 1])
+        end
+        redis.call('ZREMRANGEBYRANK', key, 0, -(max_length + 1))
+        redis.call('EXPIRE', key, ttl)
+    end
+end
+return 1
+"""
+
+_add_to_existing = None
+
+
+def is_timeline_enabled() -> bool:
+    """Home timelines are only materialized when Redis is enabled."""
+    return getattr(settings, "USE_REDIS", False)
+
+
+def get_max_length() -> int:
+    return getattr(settings, "HOME_TIMELINE_MAX_LENGTH", 800)
+
+
+def get_fanout_max_followers() -> int:
+    return getattr(settings, "HOME_TIMELINE_FANOUT_MAX_FOLLOWERS", 5000)
+
+
+def get_ttl_seconds() -> int:
+    return getattr(settings, "HOME_TIMELINE_TTL_SECONDS", 7 * 24 * 60 * 60)
+
+
+def to_score(created_at: datetime) -> float:
+    return created_at.timestamp()
+
+
+def _timeline_key(user_id: str) -> str:
+    return TIMELINE_KEY.format(user_id=user_id)
+
+
+def _get_add_script():
+    global _add_to_existing
+    if _add_to_existing is None:
+        _add_to_existing = get_redis_client().register_script(_ADD_TO_EXISTING_SCRIPT)
+    return _add_to_existing
+
+
+def _entries_to_args(entries: Iterable[Tuple[str, datetime]]) -> list:
+    args = []
+    for post_id, created_at in entries:
+        args.extend([to_score(created_at), str(post_id)])
+    return args
+
+
+# ---------------------------------------------------------------------------
+# Write path
+# ---------------------------------------------------------------------------
+
+
+def add_posts_to_timelines(user_ids: Iterable[str], entries: List[Tuple[str, datetime]]) -> None:
+    """
+    Add (post_id, created_at) entries to the timelines of user_ids.
+
+    Only timelines that already exist are touched, in batches of
+    FANOUT_BATCH_SIZE keys per script call.
+    """
+    if not entries:
+        return
+    script = _get_add_script()
+    args = [get_max_length(), get_ttl_seconds()] + _entries_to_args(entries)
+    keys = [_timeline_key(user_id) for user_id in user_ids]
+    for start in range(0, len(keys), FANOUT_BATCH_SIZE):
+        script(keys=keys[start:start + FANOUT_BATCH_SIZE], args=args)
+
+
+def remove_posts_from_timelines(user_ids: Iterable[str], post_ids: List[str]) -> None:
+    """Remove post_ids from the timelines of user_ids (missing keys are ignored)."""
+    if not post_ids:
+        return
+    client = get_redis_client()
+    members = [str(post_id) for post_id in post_ids]
+    keys = [_timeline_key(user_id) for user_id in user_ids]
+    for start in range(0, len(keys), FANOUT_BATCH_SIZE):
+        pipe = client.pipeline(transaction=False)
+        for key in keys[start:start + FANOUT_BATCH_SIZE]:
+            pipe.zrem(key, *members)
+        pipe.execute()
+
+
+def replace_timeline(user_id: str, entries: List[Tuple[str, datetime]]) -> None:
+    """Overwrite a user's timeline with entries (used to rebuild a cold timeline)."""
+    client = get_redis_client()
+    key = _timeline_key(user_id)
+    pipe = client.pipeline()
+    pipe.delete(key)
+    if entries:
+        pipe.zadd(key, {str(post_id): to_score(created_at) for post_id, created_at in entries})
+        pipe.zremrangebyrank(key, 0, -(get_max_length() + 1))
+        pipe.expire(key, get_ttl_seconds())
+    pipe.execute()
+
+
+def mark_pull_author(user_id: str) -> None:
+    """Record that user_id's posts are merged on read instead of fanned out."""
+    get_redis_client().sadd(PULL_AUTHORS_KEY, str(user_id))
+
+
+def is_pull_author(user_id: str) -> bool:
+    return bool(get_redis_client().sismember(PULL_AUTHORS_KEY, str(user_id)))
+
+
+def get_pull_authors() -> List[str]:
+    return [member.decode() for member in get_redis_client().smembers(PULL_AUTHORS_KEY)]
+
+
+# ---------------------------------------------------------------------------
+# Read path
+# ---------------------------------------------------------------------------
+
+
+def get_timeline_page(
+    user_id: str,
+    limit: int,
+    cursor_score: Optional[float] = None,
+    cursor_post_id: Optional[str] = None,
+) -> Optional[Tuple[List[Tuple[str, float]], bool]]:
+    """
+    Read up to `limit` entries strictly older than the cursor, newest first.
+
+    Entries are ordered by (score, post_id) descending, matching the keyset
+    order of the global feed. Returns None if the timeline does not exist,
+    otherwise (entries, is_full) where entries are (post_id, score) pairs and
+    is_full means the set has been trimmed, so older posts may exist only in
+    the database.
+    """
+    client = get_redis_client()
+    key = _timeline_key(user_id)
+    max_bound = "+inf" if cursor_score is None else f"({cursor_score!r}"
+
+    pipe = client.pipeline()
+    pipe.exists(key)
+    pipe.zcard(key)
+    pipe.zrevrangebyscore(key, max_bound, "-inf", start=0, num=limit, withscores=True)
+    if cursor_score is not None:
+        # Entries sharing the cursor's exact score need a post_id tie-break
+        pipe.zrangebyscore(key, cursor_score, cursor_score, withscores=True)
+    pipe.expire(key, get_ttl_seconds())
+    results = pipe.execute()
+
+    if not results[0]:
+        return None
+
+    entries = [(member.decode(), score) for member, score in results[2]]
+    if cursor_score is not None:
+        ties = [
+            (member.decode(), score) for member, score in results[3]
+            if member.decode() < str(cursor_post_id)
+        ]
+        ties.sort(key=lambda entry: entry[0], reverse=True)
+        entries = (ties + entries)[:limit]
+
+    return entries, results[1] >= get_max_length()
@@ -0,0 +1,196 @@
+"""
+Full-text verse search backed by SQLite FTS5.
+
+BookVerse rows (one per {chapter:verse} marker, written when a book is
+parsed) are indexed by an external-content FTS5 table, so verse text is
+stored once and the index only holds tokens. Triggers on the verse table
+keep the index in sync with inserts, updates and (cascading) deletes, which
+means bulk_create and re-ingestion need no extra calls.
+
+The index is created by ensure_index(), run from a post_migrate handler.
+Existing books parsed before verses were extracted are backfilled with
+`python manage.py rebuild_verse_index`.
+
+Matches are ranked with bm25 and returned with a highlighted snippet.
+
+Other database backends have no FTS5; there search() falls back to a plain
+case-insensitive substring scan (every word must appear), ordered by
+position in the book and with rank 0, so the endpoint keeps working.
+"""
+
+import re
+from typing import List, Optional
+
+from django.db import connection
+
+from bible_way.models import Book, BookVerse
+
+
+FTS_TABLE = "bible_way_verse_fts"
+VERSE_TABLE = BookVerse._meta.db_table
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 16
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text,
+        content='{VERSE_TABLE}',
+        content_rowid='verse_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {VERSE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.verse_id, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {VERSE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.verse_id, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {VERSE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.verse_id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.verse_id, new.text);
+    END
+    """,
+]
+
+
+def is_supported() -> bool:
+    return connection.vendor == "sqlite"
+
+
+def ensure_index() -> None:
+    """Create the FTS5 table and its sync triggers if they do not exist yet."""
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        for statement in _CREATE_STATEMENTS:
+            cursor.execute(statement)
+
+
+def rebuild_index() -> None:
+    """Re-tokenize every verse (after a bulk load that bypassed the triggers)."""
+    ensure_index()
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _search_terms(query: str) -> List[str]:
+    return _TERM_PATTERN.findall(query or "")
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted, so user input can never inject FTS5 operators.
+    Returns None if the text has no searchable words.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search(query: str, book_id: str = None, language_id: str = None, age_group_id: str = None,
+           limit: int = 20, offset: int = 0) -> List[dict]:
+    """
+    Ranked verse matches in active books.
+
+    Returns up to `limit` dicts of {verse, snippet, rank}, best match first,
+    where verse is a BookVerse with book, language and age group loaded.
+    """
+    match_query = build_match_query(query)
+    if match_query is None:
+        return []
+
+    books = Book.objects.filter(is_active=True)
+    if book_id:
+        books = books.filter(book_id=book_id)
+    if language_id:
+        books = books.filter(language__language_id=language_id)
+    if age_group_id:
+        books = books.filter(age_group__age_group_id=age_group_id)
+
+    if not is_supported():
+        return _search_without_index(_search_terms(query), books, limit, offset)
+
+    books_sql, books_params = books.values("book_id").query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT {FTS_TABLE}.rowid,
+                   snippet({FTS_TABLE}, 0, %s, %s, %s, %s),
+                   bm25({FTS_TABLE}) AS rank
+            FROM {FTS_TABLE}
+            JOIN {VERSE_TABLE} ON {VERSE_TABLE}.verse_id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s
+              AND {VERSE_TABLE}.book_id IN ({books_sql})
+            ORDER BY rank
+            LIMIT %s OFFSET %s
+            """,
+            [SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS, match_query,
+             *books_params, limit, offset]
+        )
+        rows = cursor.fetchall()
+
+    verses = BookVerse.objects.select_related(
+        "book", "book__language", "book__age_group", "book_content"
+    ).in_bulk([row[0] for row in rows])
+
+    return [
+        {"verse": verses[verse_id], "snippet": snippet, "rank": rank}
+        for verse_id, snippet, rank in rows
+        if verse_id in verses
+    ]
+
+
+def _search_without_index(terms: List[str], books, limit: int, offset: int) -> List[dict]:
+    """Unranked substring search for backends without FTS5; scans verse text."""
+    verses = BookVerse.objects.filter(book__in=books)
+    for term in terms:
+        verses = verses.filter(text__icontains=term)
+    verses = verses.select_related(
+        "book", "book__language", "book__age_group", "book_content"
+    ).order_by("book__book_order", "book_id", "chapter_number", "verse_number", "verse_id")
+
+    return [
+        {"verse": verse, "snippet": _build_snippet(verse.text, terms), "rank": 0.0}
+        for verse in verses[offset:offset + limit]
+    ]
+
+
+def _build_snippet(text: str, terms: List[str]) -> str:
+    """Mimic FTS5 snippet(): up to SNIPPET_TOKENS words around the first match, matches marked."""
+    words = text.split()
+    lowered_terms = [term.lower() for term in terms]
+
+    def matches(word: str) -> bool:
+        word = word.lower()
+        return any(term in word for term in lowered_terms)
+
+    first = next((index for index, word in enumerate(words) if matches(word)), 0)
+    start = max(0, min(first - SNIPPET_TOKENS // 4, len(words) - SNIPPET_TOKENS))
+    window = words[start:start + SNIPPET_TOKENS]
+
+    snippet = " ".join(
+        f"{SNIPPET_START}{word}{SNIPPET_END}" if matches(word) else word
+        for word in window
+    )
+    if start > 0:
+        snippet = SNIPPET_ELLIPSIS + snippet
+    if start + SNIPPET_TOKENS < len(words):
+        snippet += SNIPPET_ELLIPSIS
+    return snippet
@@ -0,0 +1,223 @@
+"""
+Pre-rendered, pre-compressed chapter payloads.
+
+At parse time each chapter is rendered once to its JSON object and stored as
+a raw deflate fragment (sync-flushed, so fragments can be concatenated) along
+with its CRC-32 and byte length. When the optional `brotli` package is
+installed, the complete single-chapter response body is also stored
+brotli-compressed.
+
+On read, stored fragments are stitched into a single gzip member: the gzip
+header, the response envelope and chapter fragments, a final empty block and
+a trailer whose CRC is combined from the per-fragment CRCs. Chapter text is
+never decoded or re-encoded per request.
+"""
+import hashlib
+import json
+import struct
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+# (raw deflate bytes, crc32 of the uncompressed bytes, uncompressed length)
+Fragment = Tuple[bytes, int, int]
+
+GZIP = 'gzip'
+BROTLI = 'br'
+IDENTITY = 'identity'
+
+SINGLE_CHAPTER_PREFIX = b'{"success":true,"message":"Chapter retrieved successfully","data":'
+SINGLE_CHAPTER_SUFFIX = b'}'
+CHAPTER_RANGE_PREFIX = b'{"success":true,"message":"Chapters retrieved successfully","data":['
+CHAPTER_RANGE_SEPARATOR = b','
+CHAPTER_RANGE_SUFFIX = b']}'
+
+# Header with no file name and mtime 0 so stitched bodies are byte-stable (ETag friendly)
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+# A final fixed-Huffman block holding only end-of-block
+_DEFLATE_FINAL_BLOCK = b'\x03\x00'
+
+
+def render_chapter(book_content) -> bytes:
+    """Render the JSON object served for one chapter."""
+    return json.dumps({
+        'book_content_id': str(book_content.book_content_id),
+        'chapter_number': book_content.chapter_number,
+        'chapter_title': book_content.chapter_title,
+        'content_order': book_content.content_order,
+        'content': book_content.content,
+        'metadata': book_content.metadata or {}
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def chapter_hash(book_content) -> str:
+    """
+    SHA-256 of everything a chapter serves except its id.
+
+    Re-ingestion compares it against the stored hash to find chapters whose
+    text actually changed; it is also the basis of the chapter ETag.
+    """
+    return hashlib.sha256(json.dumps([
+        book_content.chapter_title,
+        book_content.content_order,
+        book_content.content,
+        book_content.metadata or {}
+    ], ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def chapter_etag(chapter_keys: List[str], encoding: str) -> str:
+    """
+    Strong ETag for a chapter (or range) in one content encoding.
+
+    chapter_keys identify each chapter's served JSON, e.g. "<book_content_id>:<content_hash>".
+    """
+    digest = hashlib.sha256(','.join(chapter_keys).encode('utf-8')).hexdigest()
+    return f'"{digest[:40]}-{encoding}"'
+
+
+def deflate_fragment(data: bytes, level: int = 9) -> Fragment:
+    """Compress data into a raw deflate fragment that can be concatenated with others."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return deflated, zlib.crc32(data), len(data)
+
+
+def compress_chapter(book_content) -> dict:
+    """
+    Build the pre-compressed BookContent fields for a chapter.
+
+    Returns a dict of content_deflate, content_crc32, content_size and
+    content_brotli (None when brotli is not installed).
+    """
+    rendered = render_chapter(book_content)
+    deflated, crc, size = deflate_fragment(rendered)
+    content_brotli = None
+    if brotli is not None:
+        content_brotli = brotli.compress(
+            SINGLE_CHAPTER_PREFIX + rendered + SINGLE_CHAPTER_SUFFIX,
+            mode=brotli.MODE_TEXT
+        )
+    return {
+        'content_deflate': deflated,
+        'content_crc32': crc,
+        'content_size': size,
+        'content_brotli': content_brotli
+    }
+
+
+def _gf2_matrix_times(matrix: List[int], vector: int) -> int:
+    total = 0
+    index = 0
+    while vector:
+        if vector & 1:
+            total ^= matrix[index]
+        vector >>= 1
+        index += 1
+    return total
+
+
+def _gf2_matrix_square(matrix: List[int]) -> List[int]:
+    return [_gf2_matrix_times(matrix, matrix[n]) for n in range(32)]
+
+
+def crc32_combine(crc1: int, crc2: int, len2: int) -> int:
+    """
+    CRC-32 of A + B given crc32(A), crc32(B) and len(B) (port of zlib's crc32_combine).
+    """
+    if len2 <= 0:
+        return crc1
+
+    odd = [0xedb88320] + [1 << n for n in range(31)]
+    even = _gf2_matrix_square(odd)
+    odd = _gf2_matrix_square(even)
+
+    while True:
+        even = _gf2_matrix_square(odd)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = _gf2_matrix_square(even)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+
+    return crc1 ^ crc2
+
+
+def gzip_from_fragments(fragments: Iterable[Fragment]) -> bytes:
+    """Stitch deflate fragments into one gzip member without recompressing them."""
+    parts = [_GZIP_HEADER]
+    crc = 0
+    size = 0
+    for deflated, fragment_crc, fragment_size in fragments:
+        parts.append(bytes(deflated))
+        crc = crc32_combine(crc, fragment_crc, fragment_size)
+        size += fragment_size
+    parts.append(_DEFLATE_FINAL_BLOCK)
+    parts.append(struct.pack('<II', crc & 0xffffffff, size & 0xffffffff))
+    return b''.join(parts)
+
+
+_SINGLE_PREFIX_FRAGMENT = deflate_fragment(SINGLE_CHAPTER_PREFIX)
+_SINGLE_SUFFIX_FRAGMENT = deflate_fragment(SINGLE_CHAPTER_SUFFIX)
+_RANGE_PREFIX_FRAGMENT = deflate_fragment(CHAPTER_RANGE_PREFIX)
+_RANGE_SEPARATOR_FRAGMENT = deflate_fragment(CHAPTER_RANGE_SEPARATOR)
+_RANGE_SUFFIX_FRAGMENT = deflate_fragment(CHAPTER_RANGE_SUFFIX)
+
+
+def single_chapter_gzip(chapter_fragment: Fragment) -> bytes:
+    return gzip_from_fragments([_SINGLE_PREFIX_FRAGMENT, chapter_fragment, _SINGLE_SUFFIX_FRAGMENT])
+
+
+def chapter_range_gzip(chapter_fragments: List[Fragment]) -> bytes:
+    fragments = [_RANGE_PREFIX_FRAGMENT]
+    for index, chapter_fragment in enumerate(chapter_fragments):
+        if index:
+            fragments.append(_RANGE_SEPARATOR_FRAGMENT)
+        fragments.append(chapter_fragment)
+    fragments.append(_RANGE_SUFFIX_FRAGMENT)
+    return gzip_from_fragments(fragments)
+
+
+def single_chapter_body(rendered_chapter: bytes) -> bytes:
+    return SINGLE_CHAPTER_PREFIX + rendered_chapter + SINGLE_CHAPTER_SUFFIX
+
+
+def chapter_range_body(rendered_chapters: List[bytes]) -> bytes:
+    return CHAPTER_RANGE_PREFIX + CHAPTER_RANGE_SEPARATOR.join(rendered_chapters) + CHAPTER_RANGE_SUFFIX
+
+
+def choose_encoding(accept_encoding: Optional[str], allow_brotli: bool = True) -> str:
+    """
+    Pick br, gzip or identity from an Accept-Encoding header (codings with q=0 are refused).
+    """
+    accepted = set()
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+
+    if allow_brotli and brotli is not None and (BROTLI in accepted or '*' in accepted):
+        return BROTLI
+    if GZIP in accepted or '*' in accepted:
+        return GZIP
+    return IDENTITY
@@ -1,14 +1,198 @@
+import io
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Chapter marker patterns, in detection priority order
+BIBLE_FORMAT_PATTERN = re.compile(r'__\[([^\]]+?)\s+(\d+)\]__')
+H1_CHAPTER_PATTERN = re.compile(r'^#\s+Chapter\s+(\d+)(?:\s*:\s*(.+))?', re.IGNORECASE)
+H2_CHAPTER_PATTERN = re.compile(r'^##\s+(?:Chapter\s+)?(\d+)(?:\s*:\s*(.+))?')
+NUMBERED_HEADING_PATTERN = re.compile(r'^#{1,2}\s+(\d+)(?:\s+(.+))?')
+BRACKETED_PATTERN = re.compile(r'\[(?:Chapter\s+)?(\d+)\]')
+NUMBERED_LIST_PATTERN = re.compile(r'^(\d+)\.\s+(.+)')
+CHAPTER_WORD_PATTERN = re.compile(r'chapter|ch\.', re.IGNORECASE)
+
+# Book title patterns
+BIBLE_TITLE_PATTERN = re.compile(r'#\s*\*\*\s*The\s+Book\s+of\s+([^*]+?)\s*\*\*', re.IGNORECASE)
+BOOK_TITLE_PATTERN = re.compile(r'#\s+(?:The\s+)?Book(?:\s+of)?\s*:?\s*(.+)', re.IGNORECASE)
+CHAPTER_LIKE_TITLE_PATTERN = re.compile(r'^(Chapter\s+)?\d+', re.IGNORECASE)
+MARKDOWN_EMPHASIS_PATTERN = re.compile(r'\*\*|\*|__|_')
+
+# Verse markers inside Bible-format chapters, e.g. "{3:16}"
+VERSE_MARKER_PATTERN = re.compile(r'\{(\d+):(\d+)\}')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Number of leading lines searched for a plain "# Title" heading
+TITLE_SCAN_LINES = 50
 
 
 class MarkdownBookParser:
-    """Auto-detecting markdown parser for books with chapters"""
+    """Auto-detecting markdown parser for books with chapters
+    
+    Accepts either the decoded markdown string or a seekable binary file-like
+    object (e.g. an uploaded file). The source is scanned once, line by line,
+    evaluating every title and chapter pattern in the same pass and recording
+    the offset of each marker line; chapter content is then sliced (or read)
+    from those offsets, so the file is never held as a list of lines.
+    """
     
-    def __init__(self, markdown_content: str):
-        self.content = markdown_content
-        self.lines = markdown_content.split('\n')
+    def __init__(self, markdown_content, encoding: str = 'utf-8'):
+        if isinstance(markdown_content, (bytes, bytearray)):
+            markdown_content = io.BytesIO(markdown_content)
+        
+        if isinstance(markdown_content, str):
+            self.content = markdown_content
+            self._file = None
+        else:
+            self.content = None
+            self._file = markdown_content
+        
+        self.encoding = encoding
         self.detected_pattern = None
+        self._scan = None
+        self._end_offset = 0
+    
+    def _iter_lines(self) -> Iterator[Tuple[str, int]]:
+        """
+        Yield (line, offset) for every line, split on '\\n' like str.split('\\n').
+        
+        Offsets are character offsets into self.content, or byte offsets into
+        the file when parsing a file-like object.
+        """
+        if self._file is None:
+            content = self.content
+            self._end_offset = len(content)
+            start = 0
+            while True:
+                end = content.find('\n', start)
+                if end == -1:
+                    yield content[start:], start
+                    return
+                yield content[start:end], start
+                start = end + 1
+        
+        self._file.seek(0)
+        offset = 0
+        last_line_ended = True
+        for raw_line in iter(self._file.readline, b''):
+            last_line_ended = raw_line.endswith(b'\n')
+            line = raw_line[:-1] if last_line_ended else raw_line
+            yield line.decode(self.encoding), offset
+            offset += len(raw_line)
+        self._end_offset = offset
+        if last_line_ended:
+            # Content ending in '\n' (or empty) has a trailing empty line, as with split('\n')
+            yield '', offset
+    
+    def _scan_source(self) -> Dict:
+        """
+        Single pass over the source collecting every candidate title and chapter marker.
+        """
+        if self._scan is not None:
+            return self._scan
+        
+        candidates = {
+            'bible_format': [],
+            'h1_chapter': [],
+            'h2_chapter': [],
+            'numbered_heading': [],
+            'bracketed': [],
+            'numbered_list': []
+        }
+        bible_title = None
+        book_title = None
+        heading_title = None
+        book_title_found = False
+        total_lines = 0
+        content_length = 0
+        
+        for i, (line, offset) in enumerate(self._iter_lines()):
+            total_lines += 1
+            content_length += len(line) + (1 if i else 0)
+            
+            stripped = line.strip()
+            line_number = i + 1
+            
+            if '__[' in line:
+                for match in BIBLE_FORMAT_PATTERN.finditer(line):
+                    candidates['bible_format'].append({
+                        'line_number': line_number,
+                        'line_offset': offset,
+                        'match_text': match.group(0),
+                        'book_name': match.group(1).strip(),
+                        'chapter_number': int(match.group(2)),
+                        'chapter_title': f"{match.group(1).strip()} {match.group(2)}"
+                    })
+            
+            if stripped.startswith('#'):
+                for pattern_type, pattern in (('h1_chapter', H1_CHAPTER_PATTERN), ('h2_chapter', H2_CHAPTER_PATTERN)):
+                    match = pattern.match(stripped)
+                    if match:
+                        candidates[pattern_type].append({
+                            'line_number': line_number,
+                            'line_offset': offset,
+                            'match_text': stripped,
+                            'chapter_number': int(match.group(1)),
+                            'chapter_title': match.group(2).strip() if match.group(2) else f"Chapter {match.group(1)}"
+                        })
+                
+                match = NUMBERED_HEADING_PATTERN.match(stripped)
+                # Skip if it's the book title (usually first H1)
+                if match and not (i == 0 or (i < 5 and not CHAPTER_WORD_PATTERN.search(line))):
+                    candidates['numbered_heading'].append({
+                        'line_number': line_number,
+                        'line_offset': offset,
+                        'match_text': stripped,
+                        'chapter_number': int(match.group(1)),
+                        'chapter_title': match.group(2).strip() if match.group(2) else f"Chapter {match.group(1)}"
+                    })
+            elif stripped[:1].isdigit():
+                match = NUMBERED_LIST_PATTERN.match(stripped)
+                if match:
+                    candidates['numbered_list'].append({
+                        'line_number': line_number,
+                        'line_offset': offset,
+                        'match_text': stripped,
+                        'chapter_number': int(match.group(1)),
+                        'chapter_title': match.group(2).strip()
+                    })
+            
+            if '[' in line:
+                match = BRACKETED_PATTERN.search(line)
+                if match:
+                    candidates['bracketed'].append({
+                        'line_number': line_number,
+                        'line_offset': offset,
+                        'match_text': stripped,
+                        'chapter_number': int(match.group(1)),
+                        'chapter_title': f"Chapter {match.group(1)}"
+                    })
+            
+            if '#' in line:
+                if bible_title is None:
+                    match = BIBLE_TITLE_PATTERN.search(line)
+                    if match:
+                        bible_title = match.group(1).strip()
+                if not book_title_found:
+                    match = BOOK_TITLE_PATTERN.search(line)
+                    if match:
+                        # Only the first match counts, even if it is empty once formatting is removed
+                        book_title_found = True
+                        book_title = MARKDOWN_EMPHASIS_PATTERN.sub('', match.group(1).strip()).strip()
+                if heading_title is None and i < TITLE_SCAN_LINES and stripped.startswith('# '):
+                    title = MARKDOWN_EMPHASIS_PATTERN.sub('', stripped[2:].strip()).strip()
+                    # Skip if it looks like a chapter marker
+                    if not CHAPTER_LIKE_TITLE_PATTERN.match(title) and title and len(title) < 100:
+                        heading_title = title
+        
+        self._scan = {
+            'candidates': candidates,
+            'titles': [bible_title, book_title, heading_title],
+            'total_lines': total_lines,
+            'content_length': content_length,
+            'end_offset': self._end_offset
+        }
+        return self._scan
     
     def detect_book_title(self, provided_title: str = None, filename: str = None) -> str:
         """
@@ -18,34 +202,12 @@ class MarkdownBookParser:
         if provided_title:
             return provided_title.strip()
         
-        # Pattern 1: Bible format - # ** The Book of {Name} **
-        pattern1 = r'#\s*\*\*\s*The\s+Book\s+of\s+([^*]+?)\s*\*\*'
-        match = re.search(pattern1, self.content, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        
-        # Pattern 2: Standard H1 with "Book" - # The Book of {Name} or # Book: {Name}
-        pattern2 = r'#\s+(?:The\s+)?Book(?:\s+of)?\s*:?\s*(.+)'
-        match = re.search(pattern2, self.content, re.IGNORECASE)
-        if match:
-            title = match.group(1).strip()
-            # Remove markdown formatting
-            title = re.sub(r'\*\*|\*|__|_', '', title).strip()
+        # In priority order: "# ** The Book of {Name} **", "# The Book of {Name}" / "# Book: {Name}",
+        # then the first plain "# {Book Name}" H1 in the leading lines
+        for title in self._scan_source()['titles']:
             if title:
                 return title
         
-        # Pattern 3: Simple H1 - # {Book Name}
-        # Get first H1 that looks like a title (not a chapter)
-        for line in self.lines[:50]:  # Check first 50 lines
-            if line.strip().startswith('# '):
-                title = line.strip()[2:].strip()
-                # Remove markdown formatting
-                title = re.sub(r'\*\*|\*|__|_', '', title).strip()
-                # Skip if it looks like a chapter marker
-                if not re.match(r'^(Chapter\s+)?\d+', title, re.IGNORECASE):
-                    if title and len(title) < 100:  # Reasonable title length
-                        return title
-        
         # Fallback: Use filename
         if filename:
             # Remove extension and clean up
@@ -60,118 +222,24 @@ class MarkdownBookParser:
         Auto-detect which chapter pattern is used.
         Returns: (pattern_type, list of chapter matches)
         """
-        chapter_matches = []
-        
-        # Pattern 1: Bible format - __[{BookName} {Number}]__
-        pattern1 = r'__\[([^\]]+?)\s+(\d+)\]__'
-        matches1 = list(re.finditer(pattern1, self.content))
-        if matches1:
-            # Validate: check if numbers are sequential
-            numbers = [int(m.group(2)) for m in matches1]
-            if self._is_sequential(numbers):
-                self.detected_pattern = 'bible_format'
-                for match in matches1:
-                    chapter_matches.append({
-                        'line_number': self.content[:match.start()].count('\n') + 1,
-                        'match_text': match.group(0),
-                        'book_name': match.group(1).strip(),
-                        'chapter_number': int(match.group(2)),
-                        'chapter_title': f"{match.group(1).strip()} {match.group(2)}"
-                    })
-                return 'bible_format', chapter_matches
-        
-        # Pattern 2: Standard H1 - # Chapter {Number} or # Chapter {Number}: {Title}
-        pattern2 = r'^#\s+Chapter\s+(\d+)(?:\s*:\s*(.+))?'
-        matches2 = []
-        for i, line in enumerate(self.lines):
-            match = re.match(pattern2, line.strip(), re.IGNORECASE)
-            if match:
-                matches2.append({
-                    'line_number': i + 1,
-                    'match_text': line.strip(),
-                    'chapter_number': int(match.group(1)),
-                    'chapter_title': match.group(2).strip() if match.group(2) else f"Chapter {match.group(1)}"
-                })
-        if matches2:
-            numbers = [m['chapter_number'] for m in matches2]
-            if self._is_sequential(numbers):
-                self.detected_pattern = 'h1_chapter'
-                return 'h1_chapter', matches2
-        
-        # Pattern 3: Standard H2 - ## Chapter {Number} or ## {Number}
-        pattern3 = r'^##\s+(?:Chapter\s+)?(\d+)(?:\s*:\s*(.+))?'
-        matches3 = []
-        for i, line in enumerate(self.lines):
-            match = re.match(pattern3, line.strip())
-            if match:
-                matches3.append({
-                    'line_number': i + 1,
-                    'match_text': line.strip(),
-                    'chapter_number': int(match.group(1)),
-                    'chapter_title': match.group(2).strip() if match.group(2) else f"Chapter {match.group(1)}"
-                })
-        if matches3:
-            numbers = [m['chapter_number'] for m in matches3]
+        candidates = self._scan_source()['candidates']
+        
+        # Patterns in priority order, with the minimum number of markers each needs
+        for pattern_type, min_matches in (
+            ('bible_format', 1),
+            ('h1_chapter', 1),
+            ('h2_chapter', 1),
+            ('numbered_heading', 2),
+            ('bracketed', 2),
+            ('numbered_list', 2),
+        ):
+            matches = candidates[pattern_type]
+            if len(matches) < min_matches:
+                continue
+            numbers = [m['chapter_number'] for m in matches]
             if self._is_sequential(numbers):
-                self.detected_pattern = 'h2_chapter'
-                return 'h2_chapter', matches3
-        
-        # Pattern 4: Numbered H1/H2 - # 1, # 2 or ## 1, ## 2
-        pattern4 = r'^#{1,2}\s+(\d+)(?:\s+(.+))?'
-        matches4 = []
-        for i, line in enumerate(self.lines):
-            match = re.match(pattern4, line.strip())
-            if match:
-                # Skip if it's the book title (usually first H1)
-                if i == 0 or (i < 5 and not re.search(r'chapter|ch\.', line, re.IGNORECASE)):
-                    continue
-                matches4.append({
-                    'line_number': i + 1,
-                    'match_text': line.strip(),
-                    'chapter_number': int(match.group(1)),
-                    'chapter_title': match.group(2).strip() if match.group(2) else f"Chapter {match.group(1)}"
-                })
-        if matches4:
-            numbers = [m['chapter_number'] for m in matches4]
-            if self._is_sequential(numbers) and len(matches4) >= 2:
-                self.detected_pattern = 'numbered_heading'
-                return 'numbered_heading', matches4
-        
-        # Pattern 5: Bracketed format - [Chapter {Number}] or [{Number}]
-        pattern5 = r'\[(?:Chapter\s+)?(\d+)\]'
-        matches5 = []
-        for i, line in enumerate(self.lines):
-            match = re.search(pattern5, line)
-            if match:
-                matches5.append({
-                    'line_number': i + 1,
-                    'match_text': line.strip(),
-                    'chapter_number': int(match.group(1)),
-                    'chapter_title': f"Chapter {match.group(1)}"
-                })
-        if matches5:
-            numbers = [m['chapter_number'] for m in matches5]
-            if self._is_sequential(numbers) and len(matches5) >= 2:
-                self.detected_pattern = 'bracketed'
-                return 'bracketed', matches5
-        
-        # Pattern 6: Generic numbered list - 1. Chapter Title
-        pattern6 = r'^(\d+)\.\s+(.+)'
-        matches6 = []
-        for i, line in enumerate(self.lines):
-            match = re.match(pattern6, line.strip())
-            if match:
-                matches6.append({
-                    'line_number': i + 1,
-                    'match_text': line.strip(),
-                    'chapter_number': int(match.group(1)),
-                    'chapter_title': match.group(2).strip()
-                })
-        if matches6:
-            numbers = [m['chapter_number'] for m in matches6]
-            if self._is_sequential(numbers) and len(matches6) >= 2:
-                self.detected_pattern = 'numbered_list'
-                return 'numbered_list', matches6
+                self.detected_pattern = pattern_type
+                return pattern_type, matches
         
         # No pattern detected
         return None, []
@@ -186,6 +254,14 @@ class MarkdownBookParser:
         # Allow gaps of 1 (sequential) or small gaps (tolerance)
         return all(gap <= tolerance for gap in gaps) and sorted_nums[0] == 1
     
+    def _read_span(self, start: int, end: int) -> str:
+        if end <= start:
+            return ''
+        if self._file is None:
+            return self.content[start:end]
+        self._file.seek(start)
+        return self._file.read(end - start).decode(self.encoding)
+    
     def parse_chapters(self, book_title: str = None) -> List[Dict]:
         """
         Parse all chapters from markdown.
@@ -197,34 +273,34 @@ class MarkdownBookParser:
             return []
         
         chapters = []
-        lines = self.lines
+        end_offset = self._scan_source()['end_offset']
         
         for idx, match_info in enumerate(chapter_matches):
             chapter_number = match_info['chapter_number']
             chapter_title = match_info['chapter_title']
-            start_line = match_info['line_number'] - 1  # Convert to 0-based index
+            start = match_info['line_offset']
             
-            # Find end line (next chapter marker or end of file)
+            # Content runs up to the newline before the next chapter marker line, or to end of file
             if idx + 1 < len(chapter_matches):
-                end_line = chapter_matches[idx + 1]['line_number'] - 1
+                end = chapter_matches[idx + 1]['line_offset'] - 1
             else:
-                end_line = len(lines)
+                end = end_offset
             
             # Extract content (include the chapter marker line)
-            chapter_lines = lines[start_line:end_line]
-            content = '\n'.join(chapter_lines)
+            content = self._read_span(start, end)
             
-            # Count verses if Bible format (optional)
-            verse_count = None
+            # Split into verses if Bible format (feeds the search index)
+            verses = []
             if pattern_type == 'bible_format':
-                verse_count = self.count_verses_in_chapter(content, chapter_number)
+                verses = self.extract_verses(content, chapter_number)
             
             chapters.append({
                 'chapter_number': chapter_number,
                 'chapter_title': chapter_title,
                 'content': content,
                 'content_order': chapter_number,
-                'verse_count': verse_count,
+                'verse_count': len(verses) or None,
+                'verses': verses,
                 'metadata': {
                     'pattern_type': pattern_type,
                     'raw_marker': match_info['match_text']
@@ -239,11 +315,33 @@ class MarkdownBookParser:
         matches = re.findall(pattern, content)
         return len(matches) if matches else None
     
+    def extract_verses(self, content: str, chapter_number: int) -> List[Dict]:
+        """
+        Split chapter content at its {chapter:verse} markers.
+        Returns: List of {verse_number, text}, with markdown emphasis removed and whitespace collapsed
+        """
+        markers = [
+            match for match in VERSE_MARKER_PATTERN.finditer(content)
+            if int(match.group(1)) == chapter_number
+        ]
+        
+        verses = []
+        for idx, match in enumerate(markers):
+            end = markers[idx + 1].start() if idx + 1 < len(markers) else len(content)
+            text = MARKDOWN_EMPHASIS_PATTERN.sub('', content[match.end():end])
+            text = WHITESPACE_PATTERN.sub(' ', text).strip()
+            if text:
+                verses.append({
+                    'verse_number': int(match.group(2)),
+                    'text': text
+                })
+        return verses
+    
     def get_parsing_info(self) -> Dict:
         """Get information about the parsing process"""
+        scan = self._scan_source()
         return {
             'pattern_detected': self.detected_pattern,
-            'total_lines': len(self.lines),
-            'content_length': len(self.content)
+            'total_lines': scan['total_lines'],
+            'content_length': scan['content_length']
         }
-
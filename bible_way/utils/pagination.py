@@ -0,0 +1,34 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, object_id) -> str:
+    """
+    Build an opaque keyset cursor from the last row of a page.
+
+    The cursor is URL-safe base64 of {"created_at": <iso>, "id": <id>} so
+    clients treat it as a token and never build it themselves.
+    """
+    payload = json.dumps({
+        'created_at': created_at.isoformat(),
+        'id': str(object_id)
+    }, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns: (created_at, object_id)
+    Raises: ValueError if the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        return datetime.fromisoformat(payload['created_at']), uuid.UUID(payload['id'])
+    except (ValueError, TypeError, KeyError, AttributeError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -26,6 +26,7 @@ from bible_way.interactors.unlike_post_interactor import UnlikePostInteractor
 from bible_way.interactors.like_comment_interactor import LikeCommentInteractor
 from bible_way.interactors.unlike_comment_interactor import UnlikeCommentInteractor
 from bible_way.interactors.get_all_posts_interactor import GetAllPostsInteractor
+from bible_way.interactors.get_home_timeline_interactor import GetHomeTimelineInteractor
 from bible_way.interactors.get_user_posts_interactor import GetUserPostsInteractor
 from bible_way.interactors.get_user_comments_interactor import GetUserCommentsInteractor
 from bible_way.interactors.get_promotions_interactor import GetPromotionsInteractor
@@ -46,8 +47,12 @@ from bible_way.interactors.get_categories_interactor import GetCategoriesInterac
 from bible_way.interactors.admin.create_age_group_interactor import CreateAgeGroupInteractor
 from bible_way.interactors.get_age_groups_interactor import GetAgeGroupsInteractor
 from bible_way.interactors.admin.create_book_interactor import CreateBookInteractor
+from bible_way.interactors.admin.get_book_ingestion_job_interactor import GetBookIngestionJobInteractor
+from bible_way.interactors.admin.reingest_book_interactor import ReingestBookInteractor
 from bible_way.interactors.get_books_by_category_interactor import GetBooksByCategoryInteractor
 from bible_way.interactors.get_book_details_interactor import GetBookDetailsInteractor
+from bible_way.interactors.get_chapter_content_interactor import GetChapterContentInteractor
+from bible_way.interactors.search_book_verses_interactor import SearchBookVersesInteractor
 from bible_way.presenters.user_profile_response import UserProfileResponse
 from bible_way.presenters.search_users_response import SearchUsersResponse
 from bible_way.presenters.follow_user_response import FollowUserResponse
@@ -64,6 +69,7 @@ from bible_way.presenters.unlike_post_response import UnlikePostResponse
 from bible_way.presenters.like_comment_response import LikeCommentResponse
 from bible_way.presenters.unlike_comment_response import UnlikeCommentResponse
 from bible_way.presenters.get_all_posts_response import GetAllPostsResponse
+from bible_way.presenters.get_home_timeline_response import GetHomeTimelineResponse
 from bible_way.presenters.get_user_posts_response import GetUserPostsResponse
 from bible_way.presenters.get_user_comments_response import GetUserCommentsResponse
 from bible_way.presenters.get_promotions_response import GetPromotionsResponse
@@ -84,8 +90,12 @@ from bible_way.presenters.get_categories_response import GetCategoriesResponse
 from bible_way.presenters.admin.create_age_group_response import CreateAgeGroupResponse
 from bible_way.presenters.get_age_groups_response import GetAgeGroupsResponse
 from bible_way.presenters.admin.create_book_response import CreateBookResponse
+from bible_way.presenters.admin.get_book_ingestion_job_response import GetBookIngestionJobResponse
+from bible_way.presenters.admin.reingest_book_response import ReingestBookResponse
 from bible_way.presenters.get_books_by_category_response import GetBooksByCategoryResponse
 from bible_way.presenters.get_book_details_response import GetBookDetailsResponse
+from bible_way.presenters.get_chapter_content_response import GetChapterContentResponse
+from bible_way.presenters.search_book_verses_response import SearchBookVersesResponse
 from bible_way.jwt_authentication.jwt_tokens import UserAuthentication
 from bible_way.storage import UserDB
 
@@ -255,6 +265,8 @@ def get_all_posts_view(request):
     current_user_id = str(request.user.user_id)
     limit = request.query_params.get('limit', '10')
     offset = request.query_params.get('offset', '0')
+    # Presence of `cursor` (empty for the first page) switches to keyset pagination
+    cursor = request.query_params.get('cursor')
     
     try:
         limit = int(limit)
@@ -267,7 +279,24 @@ def get_all_posts_view(request):
         offset = 0
     
     response = GetAllPostsInteractor(storage=UserDB(), response=GetAllPostsResponse()).\
-        get_all_posts_interactor(limit=limit, offset=offset, current_user_id=current_user_id)
+        get_all_posts_interactor(limit=limit, offset=offset, current_user_id=current_user_id, cursor=cursor)
+    return response
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def get_home_timeline_view(request):
+    current_user_id = str(request.user.user_id)
+    limit = request.query_params.get('limit', '10')
+    cursor = request.query_params.get('cursor')
+    
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        limit = 10
+    
+    response = GetHomeTimelineInteractor(storage=UserDB(), response=GetHomeTimelineResponse()).\
+        get_home_timeline_interactor(current_user_id=current_user_id, limit=limit, cursor=cursor)
     return response
 
 @api_view(['GET'])
@@ -362,8 +391,11 @@ def delete_prayer_request_view(request):
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def get_all_prayer_requests_view(request):
+    current_user_id = str(request.user.user_id)
     limit = request.query_params.get('limit', 10)
     offset = request.query_params.get('offset', 0)
+    # Presence of `cursor` (empty for the first page) switches to keyset pagination
+    cursor = request.query_params.get('cursor')
     
     try:
         limit = int(limit)
@@ -376,7 +408,7 @@ def get_all_prayer_requests_view(request):
         offset = 0
     
     response = GetAllPrayerRequestsInteractor(storage=UserDB(), response=GetAllPrayerRequestsResponse()).\
-        get_all_prayer_requests_interactor(limit=limit, offset=offset)
+        get_all_prayer_requests_interactor(limit=limit, offset=offset, current_user_id=current_user_id, cursor=cursor)
     return response
 
 @api_view(['GET'])
@@ -396,7 +428,7 @@ def get_user_prayer_requests_view(request):
         offset = 0
     
     response = GetUserPrayerRequestsInteractor(storage=UserDB(), response=GetUserPrayerRequestsResponse()).\
-        get_user_prayer_requests_interactor(user_id=user_id, limit=limit, offset=offset)
+        get_user_prayer_requests_interactor(user_id=user_id, limit=limit, offset=offset, current_user_id=user_id)
     return response
 
 @api_view(['POST'])
@@ -419,8 +451,9 @@ def create_prayer_request_comment_view(request):
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def get_prayer_request_comments_view(request, prayer_request_id):
+    current_user_id = str(request.user.user_id)
     response = GetPrayerRequestCommentsInteractor(storage=UserDB(), response=GetPrayerRequestCommentsResponse()).\
-        get_prayer_request_comments_interactor(prayer_request_id=prayer_request_id)
+        get_prayer_request_comments_interactor(prayer_request_id=prayer_request_id, current_user_id=current_user_id)
     return response
 
 @api_view(['POST'])
@@ -511,7 +544,7 @@ def admin_create_category_view(request):
 @permission_classes([IsAuthenticated])
 def get_categories_view(request):
     response = GetCategoriesInteractor(storage=UserDB(), response=GetCategoriesResponse()).\
-        get_categories_interactor()
+        get_categories_interactor(if_none_match=request.headers.get('If-None-Match'))
     return response
 
 @api_view(['POST'])
@@ -537,7 +570,7 @@ def admin_create_age_group_view(request):
 @permission_classes([IsAuthenticated])
 def get_age_groups_view(request):
     response = GetAgeGroupsInteractor(storage=UserDB(), response=GetAgeGroupsResponse()).\
-        get_age_groups_interactor()
+        get_age_groups_interactor(if_none_match=request.headers.get('If-None-Match'))
     return response
 
 @api_view(['GET'])
@@ -550,7 +583,8 @@ def get_books_by_category_view(request, category_id: str, age_group_id: str):
         get_books_by_category_interactor(
             category_id=category_id,
             age_group_id=age_group_id,
-            language_id=language_id
+            language_id=language_id,
+            if_none_match=request.headers.get('If-None-Match')
         )
     return response
 
@@ -559,7 +593,75 @@ def get_books_by_category_view(request, category_id: str, age_group_id: str):
 @permission_classes([IsAuthenticated])
 def get_book_details_view(request, book_id: str):
     response = GetBookDetailsInteractor(storage=UserDB(), response=GetBookDetailsResponse()).\
-        get_book_details_interactor(book_id=book_id)
+        get_book_details_interactor(book_id=book_id, if_none_match=request.headers.get('If-None-Match'))
+    return response
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def get_chapter_view(request, book_id: str, chapter_number: int):
+    response = GetChapterContentInteractor(storage=UserDB(), response=GetChapterContentResponse()).\
+        get_chapter_interactor(
+            book_id=book_id,
+            chapter_number=chapter_number,
+            accept_encoding=request.headers.get('Accept-Encoding'),
+            if_none_match=request.headers.get('If-None-Match')
+        )
+    return response
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def get_chapter_range_view(request, book_id: str):
+    start_chapter = request.query_params.get('start')
+    end_chapter = request.query_params.get('end')
+    
+    try:
+        start_chapter = int(start_chapter) if start_chapter is not None else None
+        end_chapter = int(end_chapter) if end_chapter is not None else None
+    except (ValueError, TypeError):
+        start_chapter, end_chapter = None, None
+    
+    response = GetChapterContentInteractor(storage=UserDB(), response=GetChapterContentResponse()).\
+        get_chapter_range_interactor(
+            book_id=book_id,
+            start_chapter=start_chapter,
+            end_chapter=end_chapter,
+            accept_encoding=request.headers.get('Accept-Encoding'),
+            if_none_match=request.headers.get('If-None-Match')
+        )
+    return response
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def search_book_verses_view(request):
+    query = request.query_params.get('q')
+    book_id = request.query_params.get('book_id')
+    language_id = request.query_params.get('language_id')
+    age_group_id = request.query_params.get('age_group_id')
+    limit = request.query_params.get('limit', '20')
+    offset = request.query_params.get('offset', '0')
+    
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        limit = 20
+    
+    try:
+        offset = int(offset)
+    except (ValueError, TypeError):
+        offset = 0
+    
+    response = SearchBookVersesInteractor(storage=UserDB(), response=SearchBookVersesResponse()).\
+        search_book_verses_interactor(
+            query=query,
+            book_id=book_id,
+            language_id=language_id,
+            age_group_id=age_group_id,
+            limit=limit,
+            offset=offset
+        )
     return response
 
 @api_view(['POST'])
@@ -588,10 +690,32 @@ def admin_create_book_view(request):
             description=description,
             author=author,
             book_order=book_order,
-            metadata_str=metadata_str
+            metadata_str=metadata_str,
+            created_by_id=str(request.user.user_id)
         )
     return response
 
+@api_view(['POST'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_reingest_book_view(request, book_id: str):
+    response = ReingestBookInteractor(storage=UserDB(), response=ReingestBookResponse()).\
+        reingest_book_interactor(
+            book_id=book_id,
+            markdown_file=request.FILES.get('markdown_file'),
+            title=request.data.get('title'),
+            created_by_id=str(request.user.user_id)
+        )
+    return response
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_get_book_ingestion_job_view(request, job_id: str):
+    response = GetBookIngestionJobInteractor(storage=UserDB(), response=GetBookIngestionJobResponse()).\
+        get_book_ingestion_job_interactor(job_id=job_id)
+    return response
+
 @api_view(['POST'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
@@ -186,6 +186,9 @@ AWS_STORAGE_BUCKET_NAME = os.getenv('AWS_STORAGE_BUCKET_NAME', '')
 AWS_S3_REGION_NAME = os.getenv('AWS_S3_REGION_NAME', 'us-east-1')
 AWS_DEFAULT_ACL = 'public-read'
 
+# Concurrent S3 uploads per request for multi-file posts and promotions
+S3_UPLOAD_MAX_WORKERS = int(os.getenv('S3_UPLOAD_MAX_WORKERS', '6'))
+
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 STATICFILES_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 
@@ -212,6 +215,34 @@ if not firebase_admin._apps:
 USE_REDIS = os.getenv('USE_REDIS', 'false').lower() == 'true'
 REDIS_URL = os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0')
 
+# Home timeline (fan-out-on-write into Redis, only used when USE_REDIS is enabled)
+HOME_TIMELINE_MAX_LENGTH = int(os.getenv('HOME_TIMELINE_MAX_LENGTH', '800'))
+HOME_TIMELINE_FANOUT_MAX_FOLLOWERS = int(os.getenv('HOME_TIMELINE_FANOUT_MAX_FOLLOWERS', '5000'))
+HOME_TIMELINE_TTL_SECONDS = int(os.getenv('HOME_TIMELINE_TTL_SECONDS', str(7 * 24 * 60 * 60)))
+
+# Chat unread counters (Redis hash per user, only used when USE_REDIS is enabled)
+CHAT_UNREAD_TTL_SECONDS = int(os.getenv('CHAT_UNREAD_TTL_SECONDS', str(7 * 24 * 60 * 60)))
+
+# Chat read receipts: 'per_message' stores a MessageReadReceipt per message read;
+# 'watermark' only stores ConversationMember.last_read_at and derives read state from it
+CHAT_READ_RECEIPT_MODE = os.getenv('CHAT_READ_RECEIPT_MODE', 'per_message')
+
+# Chat presence broadcasts are collected for this long, coalesced and sent in one batch
+CHAT_PRESENCE_DEBOUNCE_SECONDS = float(os.getenv('CHAT_PRESENCE_DEBOUNCE_SECONDS', '3'))
+
+# Rate limit policy overrides per action (token bucket, Redis-backed when USE_REDIS is enabled),
+# e.g. {'send_message': {'max_requests': 60, 'window_seconds': 30, 'burst': 20}}.
+# Defaults are in project_chat.websocket.utils.DEFAULT_RATE_LIMIT_POLICIES
+RATE_LIMIT_POLICIES = {}
+
+# WebSocket authentication caches active users (by user_id) for this long in the default cache
+CHAT_USER_CACHE_TIMEOUT = int(os.getenv('CHAT_USER_CACHE_TIMEOUT', str(5 * 60)))
+
+# Notification retention (prune_notifications command): rows older than the retention
+# period are deleted; older per-message notifications are collapsed to one per conversation
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '90'))
+NOTIFICATION_MESSAGE_COMPACTION_DAYS = int(os.getenv('NOTIFICATION_MESSAGE_COMPACTION_DAYS', '7'))
+
 if USE_REDIS:
     # Production: Redis channel layer
     CHANNEL_LAYERS = {
@@ -232,3 +263,29 @@ else:
             "BACKEND": "channels.layers.InMemoryChannelLayer",
         },
     }
+
+# Cache (book catalog responses, WebSocket auth users); Redis in production, local files otherwise.
+# It must be shared between processes: the ingestion worker invalidates the catalog that
+# web processes serve, so a per-process (locmem) cache would keep serving stale listings
+if USE_REDIS:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv('CACHE_DIR', str(BASE_DIR / 'cache')),
+        },
+    }
+
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', '3600'))
+
+# Maximum number of chapters returned by books/<book_id>/chapters/?start=&end=
+BOOK_CHAPTER_RANGE_MAX = int(os.getenv('BOOK_CHAPTER_RANGE_MAX', '20'))
+
+# Book ingestion: uploads are staged on local disk and processed by `manage.py run_book_ingestion_worker`
+BOOK_INGESTION_STAGING_DIR = os.getenv('BOOK_INGESTION_STAGING_DIR', str(BASE_DIR / 'ingestion_staging'))
@@ -14,6 +14,7 @@ urlpatterns = [
     path("user/unfollow", unfollow_user_view),
     path("post/create", create_post_view),
     path("post/all", get_all_posts_view),
+    path("post/home", get_home_timeline_view),
     path("post/user/me", get_user_posts_view),
     path("post/update", update_post_view),
     path("post/delete", delete_post_view),
@@ -44,12 +45,17 @@ urlpatterns = [
     path("admin/category/create", admin_create_category_view),
     path("admin/age-group/create", admin_create_age_group_view),
     path("admin/book/create", admin_create_book_view),
+    path("admin/book/<str:book_id>/reingest", admin_reingest_book_view),
+    path("admin/book/ingestion/<str:job_id>", admin_get_book_ingestion_job_view),
     
     ################# books api's ################
     path("books/categories/", get_categories_view),
     path("books/age-groups/", get_age_groups_view),
     path("books/category/<str:category_id>/age-group/<str:age_group_id>/books/", get_books_by_category_view),
+    path("books/search/", search_book_verses_view),
     path("books/<str:book_id>/", get_book_details_view),
+    path("books/<str:book_id>/chapters/", get_chapter_range_view),
+    path("books/<str:book_id>/chapters/<int:chapter_number>/", get_chapter_view),
 
     ####project chat api's ###############
     path('', include('project_chat.urls')),
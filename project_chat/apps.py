@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
 
 
 class ProjectChatConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'project_chat'
+
+    def ready(self):
+        # Keep the WebSocket auth user cache in sync (e.g. deactivated users)
+        from project_chat.storage import user_cache
+        User = get_user_model()
+        post_save.connect(user_cache.invalidate_user, sender=User, dispatch_uid='chat_user_cache_save')
+        post_delete.connect(user_cache.invalidate_user, sender=User, dispatch_uid='chat_user_cache_delete')
@@ -2,12 +2,16 @@
 Interactor for getting conversation details by ID.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from project_chat.storage import ChatDB
 from project_chat.presenters.conversation_response import ConversationResponse
 from project_chat.presenters.chat_error_response import ChatErrorResponse
 
 
+DEFAULT_MESSAGES_PAGE_SIZE = 50
+MAX_MESSAGES_PAGE_SIZE = 100
+
+
 class GetConversationInteractor:
     """Interactor for getting conversation details."""
     
@@ -16,17 +20,34 @@ class GetConversationInteractor:
         self.response = response
         self.error_response = error_response
     
-    def get_conversation_interactor(self, conversation_id: str, user_id: str) -> Dict[str, Any]:
+    def get_conversation_interactor(
+        self,
+        conversation_id: str,
+        user_id: str,
+        limit: int = DEFAULT_MESSAGES_PAGE_SIZE,
+        before: Optional[int] = None,
+        after: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        Get conversation details by ID.
+        Get conversation details by ID with one page of messages.
         
         Args:
             conversation_id: ID of the conversation
             user_id: ID of the user requesting (must be a member)
+            limit: Messages per page (capped at MAX_MESSAGES_PAGE_SIZE)
+            before: Return messages older than this message ID
+            after: Return messages newer than this message ID
             
         Returns:
             Dictionary response
         """
+        if before is not None and after is not None:
+            return self.error_response.validation_error("Use either before or after, not both")
+        
+        if limit < 1:
+            return self.error_response.validation_error("Limit must be greater than 0")
+        limit = min(limit, MAX_MESSAGES_PAGE_SIZE)
+        
         try:
             # Validate conversation exists
             conversation = self.storage.get_conversation_by_id(conversation_id)
@@ -40,17 +61,26 @@ class GetConversationInteractor:
             # Get conversation members
             members = self.storage.get_conversation_members(conversation_id)
             
-            # Get all messages
-            messages = self.storage.get_conversation_messages(
+            # Get one page of messages
+            page = self.storage.get_conversation_messages(
                 conversation_id=conversation_id,
-                user_id=user_id
+                user_id=user_id,
+                limit=limit,
+                before=before,
+                after=after
             )
             
             # Format response
             return self.response.conversation_details_response(
                 conversation=conversation,
                 members=members,
-                messages=messages
+                messages=page['messages'],
+                messages_pagination={
+                    'limit': limit,
+                    'before': str(before) if before is not None else None,
+                    'after': str(after) if after is not None else None,
+                    'has_more': page['has_more']
+                }
             )
         except Exception as e:
             import traceback
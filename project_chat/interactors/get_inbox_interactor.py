@@ -25,7 +25,7 @@ class GetInboxInteractor:
             Dictionary response with list of conversations
         """
         try:
-            conversations = self.storage.get_user_conversations(user_id)
+            conversations = self.storage.build_inbox(user_id)
             return self.response.inbox_success_response(conversations)
         except Exception as e:
             import traceback
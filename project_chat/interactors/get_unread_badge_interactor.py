@@ -0,0 +1,34 @@
+"""
+Interactor for getting the user's unread message counts (app badge).
+"""
+
+from typing import Dict, Any
+from project_chat.storage import ChatDB
+from project_chat.presenters.inbox_response import InboxResponse
+
+
+class GetUnreadBadgeInteractor:
+    """Interactor for getting unread message counts."""
+    
+    def __init__(self, storage: ChatDB, response: InboxResponse):
+        self.storage = storage
+        self.response = response
+    
+    def get_unread_badge_interactor(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get total and per-conversation unread message counts for a user.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Dictionary response with unread counts
+        """
+        try:
+            unread_counts = self.storage.get_unread_counts(user_id)
+            return self.response.unread_badge_response(unread_counts)
+        except Exception as e:
+            import traceback
+            print(f"Error in get_unread_badge_interactor: {e}")
+            print(traceback.format_exc())
+            return self.response.error_response(f"Failed to retrieve unread counts: {str(e)}")
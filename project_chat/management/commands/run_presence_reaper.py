@@ -0,0 +1,66 @@
+"""
+Mark users offline whose WebSocket connections stopped heartbeating.
+
+A consumer refreshes its connection every PRESENCE_HEARTBEAT_SECONDS and
+removes it on disconnect. If a Daphne node crashes, its connections are never
+removed: the user's connection set expires by itself (so is_user_online is
+already correct), and this reaper removes them from the online index and
+broadcasts their offline presence to their conversations.
+
+Usage:
+    python manage.py run_presence_reaper
+    python manage.py run_presence_reaper --once
+"""
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from project_chat.storage.redis_state import PRESENCE_HEARTBEAT_SECONDS, get_last_seen, reap_expired_presence
+from project_chat.websocket.presence import presence_broadcaster
+
+
+class Command(BaseCommand):
+    help = "Reap presence of WebSocket connections whose heartbeats stopped"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Reap once and exit instead of running forever"
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=PRESENCE_HEARTBEAT_SECONDS,
+            help=f"Seconds between reaps (default: {PRESENCE_HEARTBEAT_SECONDS})"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Maximum users reaped per Redis call (default: 1000)"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+
+            reaped = reap_expired_presence(limit=options['batch_size'])
+            if reaped:
+                changes = {}
+                for user_id in reaped:
+                    last_seen = get_last_seen(user_id)
+                    changes[user_id] = {
+                        'initial': True,
+                        'is_online': False,
+                        'last_seen': last_seen.isoformat() if last_seen else None
+                    }
+                async_to_sync(presence_broadcaster.flush)(changes)
+                self.stdout.write(f"Marked {len(reaped)} user(s) offline")
+
+            if options['once']:
+                break
+            # A full batch means more may be waiting; reap again right away
+            if len(reaped) < options['batch_size']:
+                time.sleep(options['interval'])
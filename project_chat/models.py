@@ -109,6 +109,12 @@ class Message(models.Model):
 
     is_deleted_for_everyone = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Keyset paging of a conversation's history by message id
+            models.Index(fields=['conversation', 'id']),
+        ]
+
     def __str__(self):
         return f"Message #{self.id} in {self.conversation_id}"
 
@@ -15,7 +15,8 @@ class ConversationResponse:
     def conversation_details_response(
         conversation: Conversation, 
         members: List[ConversationMember],
-        messages: List[dict] = None
+        messages: List[dict] = None,
+        messages_pagination: Dict[str, Any] = None
     ) -> Dict[str, Any]:
         """Format conversation details response."""
         # Format members
@@ -48,7 +49,13 @@ class ConversationResponse:
             'members': members_data,
             'members_count': len(members_data),
             'messages': messages or [],
-            'messages_count': len(messages) if messages else 0
+            'messages_count': len(messages) if messages else 0,
+            'messages_pagination': {
+                **(messages_pagination or {}),
+                # Messages are newest first; pass these as before/after to page further
+                'oldest_message_id': messages[-1]['message_id'] if messages else None,
+                'newest_message_id': messages[0]['message_id'] if messages else None
+            }
         }
         
         return {
@@ -18,6 +18,21 @@ class InboxResponse:
             'data': conversations
         }
     
+    @staticmethod
+    def unread_badge_response(unread_counts: Dict[int, int]) -> Dict[str, Any]:
+        """Format unread badge response."""
+        return {
+            'success': True,
+            'data': {
+                'total_unread': sum(unread_counts.values()),
+                'conversations_with_unread': len(unread_counts),
+                'unread_counts': {
+                    str(conversation_id): count
+                    for conversation_id, count in unread_counts.items()
+                }
+            }
+        }
+    
     @staticmethod
     def error_response(error_message: str) -> Dict[str, Any]:
         """Format error response."""
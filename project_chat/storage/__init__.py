@@ -4,12 +4,22 @@ Storage layer for chat-related database operations.
 Follows the existing storage pattern for database interactions.
 """
 
+import logging
 import uuid
 from datetime import datetime
-from typing import List, Optional
-from django.db.models import Q, Max
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.db.models import Q, Max, Count, OuterRef, Subquery, Case, When, IntegerField
+from django.db.models.functions import Coalesce
 from project_chat.models import Conversation, ConversationMember, Message, MessageReadReceipt, ConversationTypeChoices
 from bible_way.models import User
+from project_chat.storage import unread_state
+
+logger = logging.getLogger(__name__)
+
+READ_RECEIPT_MODE_PER_MESSAGE = 'per_message'
+READ_RECEIPT_MODE_WATERMARK = 'watermark'
+READ_RECEIPT_BATCH_SIZE = 500
 
 
 class ChatDB:
@@ -151,6 +161,7 @@ class ChatDB:
                     pass  # Invalid reply_to, ignore
             
             message.save()
+            self._adjust_unread_counters(message, delta=1)
             return message
         except (Conversation.DoesNotExist, User.DoesNotExist) as e:
             import traceback
@@ -185,9 +196,13 @@ class ChatDB:
         try:
             msg_id = int(message_id) if isinstance(message_id, str) else message_id
             message = Message.objects.get(id=msg_id)
+            was_deleted = message.is_deleted_for_everyone
             message.is_deleted_for_everyone = True
             message.text = ""  # Clear text
             message.save()
+            if not was_deleted:
+                # Deleted messages no longer count as unread
+                self._adjust_unread_counters(message, delta=-1, unread_only=True)
             return message
         except (Message.DoesNotExist, ValueError, TypeError):
             return None
@@ -221,6 +236,7 @@ class ChatDB:
             if member:
                 member.last_read_at = datetime.now()
                 member.save()
+                self._reset_unread_counter(user_uuid, conv_id)
             
             return True
         except (Message.DoesNotExist, User.DoesNotExist, ValueError, TypeError, OverflowError):
@@ -241,15 +257,19 @@ class ChatDB:
             
             user = User.objects.get(user_id=user_uuid)
             
-            # Create or get read receipt
-            receipt, created = MessageReadReceipt.objects.get_or_create(
-                message=message,
-                user=user,
-                defaults={'read_at': datetime.now()}
-            )
-            if not created:
-                receipt.read_at = datetime.now()
-                receipt.save()
+            if self._uses_read_watermark():
+                # Not stored: read state is derived from last_read_at below
+                receipt = MessageReadReceipt(message=message, user=user, read_at=datetime.now())
+            else:
+                # Create or get read receipt
+                receipt, created = MessageReadReceipt.objects.get_or_create(
+                    message=message,
+                    user=user,
+                    defaults={'read_at': datetime.now()}
+                )
+                if not created:
+                    receipt.read_at = datetime.now()
+                    receipt.save()
             
             # Update conversation member's last_read_at if conversation_id provided
             if conversation_id:
@@ -262,11 +282,19 @@ class ChatDB:
                 if member:
                     member.last_read_at = datetime.now()
                     member.save()
+                    self._reset_unread_counter(user_uuid, conv_id)
             
             return receipt
         except (Message.DoesNotExist, User.DoesNotExist, ValueError, TypeError, OverflowError):
             return None
     
+    def _uses_read_watermark(self) -> bool:
+        """
+        In watermark mode no MessageReadReceipt rows are written; a message is
+        read by a member if it was created at or before their last_read_at.
+        """
+        return getattr(settings, 'CHAT_READ_RECEIPT_MODE', READ_RECEIPT_MODE_PER_MESSAGE) == READ_RECEIPT_MODE_WATERMARK
+    
     def update_read_receipt(self, user_id: str, conversation_id: str) -> bool:
         """Update last_read_at for all messages in a conversation."""
         try:
@@ -286,23 +314,29 @@ class ChatDB:
             # Update last_read_at to now
             member.last_read_at = datetime.now()
             member.save()
+            self._reset_unread_counter(user_uuid, conv_id)
+            
+            if self._uses_read_watermark():
+                return True
             
-            # Optionally create read receipts for all unread messages
-            unread_messages = Message.objects.filter(
+            # Create read receipts for all unread messages in one bulk insert
+            unread_message_ids = Message.objects.filter(
                 conversation_id=conv_id,
                 is_deleted_for_everyone=False
-            ).exclude(sender__user_id=user_uuid).exclude(
-                read_receipts__user__user_id=user_uuid
+            ).exclude(sender_id=member.user_id).exclude(
+                read_receipts__user_id=member.user_id
+            ).values_list('id', flat=True)
+            
+            read_at = datetime.now()
+            MessageReadReceipt.objects.bulk_create(
+                [
+                    MessageReadReceipt(message_id=message_id, user_id=member.user_id, read_at=read_at)
+                    for message_id in unread_message_ids
+                ],
+                batch_size=READ_RECEIPT_BATCH_SIZE,
+                ignore_conflicts=True  # A concurrent mark_read may have inserted some of them
             )
             
-            user = User.objects.get(user_id=user_uuid)
-            for message in unread_messages:
-                MessageReadReceipt.objects.get_or_create(
-                    message=message,
-                    user=user,
-                    defaults={'read_at': datetime.now()}
-                )
-            
             return True
         except (User.DoesNotExist, ValueError, TypeError, OverflowError):
             return False
@@ -388,6 +422,11 @@ class ChatDB:
             conversation = Conversation.objects.get(id=conversation_id)
             conversation.is_active = False
             conversation.save()
+            # Inactive conversations are not in the inbox, so their unread messages no longer count
+            for member_user_id in ConversationMember.objects.filter(
+                conversation_id=conversation.id
+            ).values_list('user__user_id', flat=True):
+                self._reset_unread_counter(member_user_id, conversation.id)
             return True
         except Conversation.DoesNotExist:
             return False
@@ -418,6 +457,8 @@ class ChatDB:
                 conversation=conversation,
                 user=user
             )
+            # The conversation's history is unread for the new member; rebuild their counters
+            self._invalidate_unread_counters(user.user_id)
             return True
         except (Conversation.DoesNotExist, User.DoesNotExist) as e:
             print(f"Error in ensure_user_membership (object not found): {type(e).__name__}: {e}, conversation_id={conversation_id}, user_id={user_id}")
@@ -432,19 +473,47 @@ class ChatDB:
             traceback.print_exc()
             return False
     
-    def get_conversation_messages(self, conversation_id: str, user_id: str = None) -> list:
-        """Get all messages for a conversation (no pagination), including deleted messages."""
+    def get_conversation_messages(self, conversation_id: str, user_id: str = None, limit: int = 50,
+                                  before: int = None, after: int = None) -> dict:
+        """
+        Get one page of a conversation's messages (newest first), including deleted messages.
+        
+        Paging is keyed on the message id, which increases with created_at:
+        - no cursor: the newest `limit` messages
+        - before: the `limit` messages just older than message `before`
+        - after: the `limit` messages just newer than message `after`
+        
+        Shared-post media for the whole page is prefetched in one query.
+        
+        Returns:
+            Dict with:
+            - messages: Formatted messages, newest first
+            - has_more: Whether more messages exist in the paging direction
+              (older, or newer when paging with `after`)
+        """
         try:
             conv_id = self._safe_convert_conversation_id(conversation_id)
             user_uuid = uuid.UUID(user_id) if user_id and isinstance(user_id, str) else user_id
             
-            # Get all messages (newest first), including deleted ones
             messages = Message.objects.filter(
                 conversation_id=conv_id
-            ).select_related('sender', 'reply_to', 'shared_post').order_by('-created_at')
+            ).select_related('sender', 'shared_post').prefetch_related('shared_post__media')
+            
+            # Fetch one extra row to know whether another page exists
+            if after is not None:
+                page = list(messages.filter(id__gt=after).order_by('id')[:limit + 1])
+                has_more = len(page) > limit
+                page = page[:limit]
+                page.reverse()
+            else:
+                if before is not None:
+                    messages = messages.filter(id__lt=before)
+                page = list(messages.order_by('-id')[:limit + 1])
+                has_more = len(page) > limit
+                page = page[:limit]
             
             messages_data = []
-            for message in messages:
+            for message in page:
                 # Determine if sent by current user
                 is_sent_by_me = False
                 if user_uuid:
@@ -464,7 +533,7 @@ class ChatDB:
                                 'media_type': media.media_type,
                                 'url': media.url
                             }
-                            for media in message.shared_post.media.all()[:3]  # Limit to 3 for preview
+                            for media in message.shared_post.media.all()[:3]  # Limit to 3 for preview (served from the prefetch)
                         ]
                     }
                 
@@ -482,7 +551,7 @@ class ChatDB:
                         'size': message.file_size,
                         'name': message.file_name
                     } if message.file else None,
-                    'reply_to_id': str(message.reply_to.id) if message.reply_to else None,
+                    'reply_to_id': str(message.reply_to_id) if message.reply_to_id else None,
                     'shared_post': shared_post_data,
                     'created_at': message.created_at.isoformat() if message.created_at else None,
                     'edited_at': message.edited_at.isoformat() if message.edited_at else None,
@@ -491,33 +560,214 @@ class ChatDB:
                 }
                 messages_data.append(message_data)
             
-            return messages_data
+            return {'messages': messages_data, 'has_more': has_more}
         except (ValueError, TypeError, OverflowError):
-            return []
+            return {'messages': [], 'has_more': False}
     
-    def get_user_conversations(self, user_id: str) -> list:
-        """Get all conversations for a user with last message preview."""
+    def _active_memberships(self, user_uuid):
+        return ConversationMember.objects.filter(
+            user__user_id=user_uuid,  # Use user__user_id to access UUIDField through ForeignKey
+            left_at__isnull=True,
+            conversation__is_active=True
+        )
+    
+    def _unread_count_annotation(self):
+        """
+        Unread count of a ConversationMember row: visible messages from others
+        after last_read_at (all of them if the member never read the conversation).
+        """
+        others_messages = Message.objects.filter(
+            conversation_id=OuterRef('conversation_id'),
+            is_deleted_for_everyone=False
+        ).exclude(sender_id=OuterRef('user_id'))
+        
+        def count_of(queryset):
+            return Coalesce(
+                Subquery(
+                    queryset.order_by().values('conversation_id').annotate(total=Count('id')).values('total')[:1],
+                    output_field=IntegerField()
+                ),
+                0
+            )
+        
+        return Case(
+            When(last_read_at__isnull=True, then=count_of(others_messages)),
+            default=count_of(others_messages.filter(created_at__gt=OuterRef('last_read_at'))),
+            output_field=IntegerField()
+        )
+    
+    def _get_cached_unread_counts(self, user_uuid) -> Optional[Dict[int, int]]:
+        """Unread counters from Redis, or None if Redis is disabled, unavailable or not built yet."""
+        if not unread_state.is_enabled():
+            return None
+        try:
+            return unread_state.get_counts(user_uuid)
+        except Exception:
+            logger.exception("Failed to read unread counters for user %s", user_uuid)
+            return None
+    
+    def _begin_unread_rebuild(self, user_uuid) -> Optional[str]:
+        """Claim the user's Redis counters for a rebuild; call before counting from the database."""
+        if not unread_state.is_enabled():
+            return None
+        try:
+            return unread_state.begin_rebuild(user_uuid)
+        except Exception:
+            logger.exception("Failed to start rebuilding unread counters for user %s", user_uuid)
+            return None
+    
+    def _store_unread_counts(self, user_uuid, counts: Dict[int, int], rebuild_token: Optional[str]) -> None:
+        """Store rebuilt counters, unless a message or read changed them since the rebuild began."""
+        if rebuild_token is None:
+            return
+        try:
+            unread_state.store_counts(user_uuid, counts, rebuild_token)
+        except Exception:
+            logger.exception("Failed to store unread counters for user %s", user_uuid)
+    
+    def _reset_unread_counter(self, user_uuid, conversation_id) -> None:
+        if not unread_state.is_enabled():
+            return
+        try:
+            unread_state.reset(user_uuid, conversation_id)
+        except Exception:
+            logger.exception("Failed to reset unread counter for user %s", user_uuid)
+    
+    def _invalidate_unread_counters(self, user_uuid) -> None:
+        if not unread_state.is_enabled():
+            return
+        try:
+            unread_state.invalidate(user_uuid)
+        except Exception:
+            logger.exception("Failed to invalidate unread counters for user %s", user_uuid)
+    
+    def _adjust_unread_counters(self, message: Message, delta: int, unread_only: bool = False) -> None:
+        """
+        Apply delta to the unread counters of the message's other members.
+        
+        With unread_only, only members who had not read up to the message are
+        adjusted (used when a message is deleted).
+        """
+        if not unread_state.is_enabled():
+            return
+        try:
+            members = ConversationMember.objects.filter(
+                conversation_id=message.conversation_id,
+                left_at__isnull=True
+            ).exclude(user_id=message.sender_id)
+            if unread_only:
+                members = members.filter(Q(last_read_at__isnull=True) | Q(last_read_at__lt=message.created_at))
+            unread_state.adjust_for_users(
+                message.conversation_id,
+                members.values_list('user__user_id', flat=True),
+                delta
+            )
+        except Exception:
+            logger.exception("Failed to update unread counters for message %s", message.id)
+    
+    def get_unread_counts(self, user_id: str) -> Dict[int, int]:
+        """
+        Unread message count per active conversation (conversations with no unread messages omitted).
+        
+        Served from Redis; when the counters are missing they are rebuilt with
+        one aggregate query and stored.
+        """
+        try:
+            user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+        except (ValueError, TypeError):
+            return {}
+        
+        counts = self._get_cached_unread_counts(user_uuid)
+        if counts is None:
+            rebuild_token = self._begin_unread_rebuild(user_uuid)
+            counts = dict(
+                self._active_memberships(user_uuid)
+                .annotate(unread_count=self._unread_count_annotation())
+                .filter(unread_count__gt=0)
+                .values_list('conversation_id', 'unread_count')
+            )
+            self._store_unread_counts(user_uuid, counts, rebuild_token)
+        return counts
+    
+    def get_conversation_ids_for_users(self, user_ids: List[str]) -> Dict[str, List[int]]:
+        """
+        IDs of the active conversations of several users (single query).
+        
+        Returns {user_id: [conversation_id, ...]} keyed by the lowercase UUID string.
+        """
+        user_uuids = []
+        for user_id in user_ids:
+            try:
+                user_uuids.append(uuid.UUID(user_id) if isinstance(user_id, str) else user_id)
+            except (ValueError, TypeError):
+                continue
+        if not user_uuids:
+            return {}
+        
+        conversation_ids_by_user = {}
+        for member_user_id, conversation_id in ConversationMember.objects.filter(
+            user__user_id__in=user_uuids,
+            left_at__isnull=True,
+            conversation__is_active=True
+        ).values_list('user__user_id', 'conversation_id'):
+            conversation_ids_by_user.setdefault(str(member_user_id), []).append(conversation_id)
+        return conversation_ids_by_user
+    
+    def build_inbox(self, user_id: str) -> list:
+        """
+        Get all conversations for a user with last message preview, participants and unread count.
+        
+        Runs a fixed number of queries regardless of how many conversations
+        the user is in:
+        1. Memberships, annotated with each conversation's last message id and,
+           unless Redis already holds the user's unread counters, the unread
+           count (correlated subqueries, one round trip)
+        2. The last messages, with their senders
+        3. The active members of every conversation, with their users
+        """
         try:
             user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
             
-            # Get all active conversations where user is a member
-            memberships = ConversationMember.objects.filter(
-                user__user_id=user_uuid,  # Use user__user_id to access UUIDField through ForeignKey
-                left_at__isnull=True
-            ).select_related('conversation').filter(
-                conversation__is_active=True
+            memberships = self._active_memberships(user_uuid).select_related('conversation').annotate(
+                last_message_id=Subquery(
+                    Message.objects.filter(
+                        conversation_id=OuterRef('conversation_id'),
+                        is_deleted_for_everyone=False
+                    ).order_by('-created_at', '-id').values('id')[:1]
+                )
+            )
+            
+            # Unread counts come from Redis when available; otherwise they are
+            # computed in the same query (and used to rebuild the Redis counters)
+            unread_counts = self._get_cached_unread_counts(user_uuid)
+            rebuild_token = None
+            if unread_counts is None:
+                rebuild_token = self._begin_unread_rebuild(user_uuid)
+                memberships = memberships.annotate(unread_count=self._unread_count_annotation())
+            memberships = list(memberships)
+            if unread_counts is None:
+                unread_counts = {membership.conversation_id: membership.unread_count for membership in memberships}
+                self._store_unread_counts(user_uuid, unread_counts, rebuild_token)
+            
+            if not memberships:
+                return []
+            
+            last_messages = Message.objects.select_related('sender').in_bulk(
+                [membership.last_message_id for membership in memberships if membership.last_message_id]
             )
             
+            members_by_conversation = {}
+            for member in ConversationMember.objects.filter(
+                conversation_id__in=[membership.conversation_id for membership in memberships],
+                left_at__isnull=True
+            ).select_related('user').order_by('id'):
+                members_by_conversation.setdefault(member.conversation_id, []).append(member)
+            
             conversations_data = []
             
             for membership in memberships:
                 conversation = membership.conversation
-                
-                # Get last message
-                last_message = Message.objects.filter(
-                    conversation_id=conversation.id,
-                    is_deleted_for_everyone=False
-                ).select_related('sender').order_by('-created_at').first()
+                last_message = last_messages.get(membership.last_message_id)
                 
                 # Format last message if exists
                 last_message_data = None
@@ -529,15 +779,9 @@ class ChatDB:
                     if is_sent_by_me:
                         # User sent the message, so they've seen it
                         is_seen = True
-                    else:
-                        # Check if user has read this message
-                        if membership.last_read_at and last_message.created_at:
-                            # User has read messages up to last_read_at
-                            # If last_read_at is after or equal to message created_at, they've seen it
-                            is_seen = (membership.last_read_at >= last_message.created_at)
-                        else:
-                            # User has never read any messages in this conversation
-                            is_seen = False
+                    elif membership.last_read_at and last_message.created_at:
+                        # User has read messages up to last_read_at
+                        is_seen = (membership.last_read_at >= last_message.created_at)
                     
                     last_message_data = {
                         'message_id': str(last_message.id),
@@ -557,17 +801,16 @@ class ChatDB:
                         'is_seen': is_seen
                     }
                 
-                # Get other member(s) based on conversation type
+                # Other member (DIRECT) or all members (GROUP)
                 other_member = None
                 members_data = []
+                conversation_members = members_by_conversation.get(conversation.id, [])
                 
                 if conversation.type == ConversationTypeChoices.DIRECT:
-                    # Get the other member (not current user)
-                    other_membership = ConversationMember.objects.filter(
-                        conversation_id=conversation.id,
-                        left_at__isnull=True
-                    ).exclude(user__user_id=user_uuid).select_related('user').first()  # Use user__user_id
-                    
+                    other_membership = next(
+                        (mem for mem in conversation_members if mem.user_id != membership.user_id),
+                        None
+                    )
                     if other_membership:
                         other_member = {
                             'user_id': str(other_membership.user.user_id),
@@ -575,34 +818,13 @@ class ChatDB:
                             'profile_picture_url': other_membership.user.profile_picture_url or ''
                         }
                 else:
-                    # GROUP conversation - get all members
-                    all_members = ConversationMember.objects.filter(
-                        conversation_id=conversation.id,
-                        left_at__isnull=True
-                    ).select_related('user')
-                    
-                    for mem in all_members:
+                    for mem in conversation_members:
                         members_data.append({
                             'user_id': str(mem.user.user_id),
                             'user_name': mem.user.user_name,
                             'profile_picture_url': mem.user.profile_picture_url or ''
                         })
                 
-                # Calculate unread count (messages after last_read_at)
-                unread_count = 0
-                if membership.last_read_at:
-                    unread_count = Message.objects.filter(
-                        conversation_id=conversation.id,
-                        is_deleted_for_everyone=False,
-                        created_at__gt=membership.last_read_at
-                    ).exclude(sender__user_id=user_uuid).count()  # Use sender__user_id
-                else:
-                    # If never read, count all messages not sent by user
-                    unread_count = Message.objects.filter(
-                        conversation_id=conversation.id,
-                        is_deleted_for_everyone=False
-                    ).exclude(sender__user_id=user_uuid).count()  # Use sender__user_id
-                
                 # Determine last activity timestamp
                 if last_message:
                     last_activity_at = last_message.created_at
@@ -620,7 +842,7 @@ class ChatDB:
                     'other_member': other_member,  # For DIRECT
                     'members': members_data,  # For GROUP
                     'members_count': len(members_data) if members_data else 0,  # For GROUP
-                    'unread_count': unread_count,
+                    'unread_count': unread_counts.get(conversation.id, 0),
                     'last_activity_at': last_activity_at.isoformat() if last_activity_at else None
                 }
                 
@@ -635,6 +857,6 @@ class ChatDB:
             return conversations_data
         except (ValueError, TypeError) as e:
             import traceback
-            print(f"Error in get_user_conversations: {e}")
+            print(f"Error in build_inbox: {e}")
             print(traceback.format_exc())
             return []
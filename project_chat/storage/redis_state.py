@@ -8,7 +8,7 @@ consumers and utilities do not rely on in-memory module-level globals.
 import os
 import time
 from datetime import datetime, timezone
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 
 import redis
 
@@ -33,45 +33,195 @@ def get_redis_client() -> redis.Redis:
 # Presence helpers
 # ---------------------------------------------------------------------------
 
-ONLINE_USERS_KEY = "ws:online_users"
+# Presence is connection-counted so it is correct across many Daphne nodes:
+#
+# - ws:presence:conn:<user_id>  sorted set of the user's open connections
+#   (channel names) scored by heartbeat deadline. The key itself expires
+#   unless a connection refreshes it, so a crashed node cannot leave its
+#   users online forever.
+# - ws:presence:online          sorted set of online user_ids scored by their
+#   latest connection deadline; used to count online users and by the reaper
+#   to find users whose connections all died without disconnecting.
+# - ws:presence:last_seen:<user_id>  ISO timestamp of the last connect,
+#   heartbeat or disconnect.
+#
+# A user is online while their connection set exists (EXISTS, O(1)).
+
+PRESENCE_CONNECTIONS_KEY = "ws:presence:conn:{user_id}"
+PRESENCE_ONLINE_INDEX_KEY = "ws:presence:online"
+PRESENCE_LAST_SEEN_KEY = "ws:presence:last_seen:{user_id}"
+
+PRESENCE_TTL_SECONDS = int(os.getenv("CHAT_PRESENCE_TTL_SECONDS", "60"))
+# Consumers refresh their connection several times per TTL
+PRESENCE_HEARTBEAT_SECONDS = max(PRESENCE_TTL_SECONDS // 3, 1)
+LAST_SEEN_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# KEYS = [connections, online index, last_seen]
+# ARGV = [user_id, connection_id, now, ttl, last_seen_iso, last_seen_ttl]
+# Adds or refreshes a connection; returns the number of open connections.
+_TOUCH_CONNECTION_SCRIPT = """
+local now = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+redis.call('ZADD', KEYS[1], now + ttl, ARGV[2])
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('ZADD', KEYS[2], now + ttl, ARGV[1])
+redis.call('SET', KEYS[3], ARGV[5], 'EX', tonumber(ARGV[6]))
+return redis.call('ZCARD', KEYS[1])
+"""
+
+# KEYS = [connections, online index, last_seen]
+# ARGV = [user_id, connection_id, now, last_seen_iso, last_seen_ttl]
+# Removes a connection plus any whose heartbeat lapsed; returns the number of
+# connections left (0 means the user is now offline).
+_DROP_CONNECTION_SCRIPT = """
+local now = tonumber(ARGV[3])
+redis.call('ZREM', KEYS[1], ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+redis.call('SET', KEYS[3], ARGV[4], 'EX', tonumber(ARGV[5]))
+local remaining = redis.call('ZCARD', KEYS[1])
+if remaining == 0 then
+    redis.call('DEL', KEYS[1])
+    redis.call('ZREM', KEYS[2], ARGV[1])
+else
+    local latest = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+    redis.call('ZADD', KEYS[2], latest[2], ARGV[1])
+end
+return remaining
+"""
+
+# KEYS = [online index], ARGV = [now, limit, connections key prefix]
+# Finds users whose latest heartbeat deadline passed and removes the ones with
+# no live connection left; returns their user_ids.
+_REAP_SCRIPT = """
+local now = tonumber(ARGV[1])
+local candidates = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, tonumber(ARGV[2]))
+local reaped = {}
+for _, user_id in ipairs(candidates) do
+    local key = ARGV[3] .. user_id
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now)
+    if redis.call('ZCARD', key) == 0 then
+        redis.call('DEL', key)
+        redis.call('ZREM', KEYS[1], user_id)
+        table.insert(reaped, user_id)
+    else
+        local latest = redis.call('ZRANGE', key, -1, -1, 'WITHSCORES')
+        redis.call('ZADD', KEYS[1], latest[2], user_id)
+    end
+end
+return reaped
+"""
+
+_presence_scripts: Dict[str, object] = {}
+
+
+def _get_script(name: str, source: str):
+    if name not in _presence_scripts:
+        _presence_scripts[name] = get_redis_client().register_script(source)
+    return _presence_scripts[name]
 
 
-def mark_user_online(user_id: str) -> datetime:
+def _connections_key(user_id: str) -> str:
+    return PRESENCE_CONNECTIONS_KEY.format(user_id=user_id)
+
+
+def _last_seen_key(user_id: str) -> str:
+    return PRESENCE_LAST_SEEN_KEY.format(user_id=user_id)
+
+
+def _parse_last_seen(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.decode())
+    except Exception:
+        return None
+
+
+def mark_user_online(user_id: str, connection_id: str) -> int:
     """
-    Mark a user as online and record the last_seen timestamp.
+    Register (or refresh) one of the user's connections and record last_seen.
 
-    Returns the datetime used for last_seen (UTC).
+    Call on connect and then every PRESENCE_HEARTBEAT_SECONDS; a connection
+    that stops refreshing is dropped after PRESENCE_TTL_SECONDS.
+    Returns the number of open connections (1 means the user just came online).
     """
-    client = get_redis_client()
     now = datetime.now(timezone.utc)
-    client.hset(ONLINE_USERS_KEY, user_id, now.isoformat())
-    return now
+    return _get_script("touch", _TOUCH_CONNECTION_SCRIPT)(
+        keys=[_connections_key(user_id), PRESENCE_ONLINE_INDEX_KEY, _last_seen_key(user_id)],
+        args=[user_id, connection_id, now.timestamp(), PRESENCE_TTL_SECONDS, now.isoformat(), LAST_SEEN_TTL_SECONDS],
+    )
 
 
-def mark_user_offline(user_id: str) -> None:
-    """Mark a user as offline by removing them from the online_users hash."""
-    client = get_redis_client()
-    client.hdel(ONLINE_USERS_KEY, user_id)
+def mark_user_offline(user_id: str, connection_id: str) -> int:
+    """
+    Remove one of the user's connections and record last_seen.
+
+    Returns the number of connections left; 0 means the user is now offline.
+    """
+    now = datetime.now(timezone.utc)
+    return _get_script("drop", _DROP_CONNECTION_SCRIPT)(
+        keys=[_connections_key(user_id), PRESENCE_ONLINE_INDEX_KEY, _last_seen_key(user_id)],
+        args=[user_id, connection_id, now.timestamp(), now.isoformat(), LAST_SEEN_TTL_SECONDS],
+    )
+
+
+def reap_expired_presence(limit: int = 1000) -> List[str]:
+    """
+    Remove users whose connections all stopped heartbeating (e.g. their node
+    crashed) and return their user_ids so offline presence can be broadcast.
+    """
+    reaped = _get_script("reap", _REAP_SCRIPT)(
+        keys=[PRESENCE_ONLINE_INDEX_KEY],
+        args=[time.time(), limit, PRESENCE_CONNECTIONS_KEY.format(user_id="")],
+    )
+    return [user_id.decode() for user_id in reaped]
 
 
 def get_last_seen(user_id: str) -> Optional[datetime]:
     """
-    Get the last_seen datetime for a user if present.
+    Get the last_seen datetime for a user if present (kept after they go offline).
     """
     client = get_redis_client()
-    value = client.hget(ONLINE_USERS_KEY, user_id)
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(value.decode())
-    except Exception:
-        return None
+    return _parse_last_seen(client.get(_last_seen_key(user_id)))
 
 
 def is_user_online(user_id: str) -> bool:
-    """Return True if the user is currently marked as online."""
+    """Return True if the user has at least one live connection."""
     client = get_redis_client()
-    return bool(client.hexists(ONLINE_USERS_KEY, user_id))
+    return bool(client.exists(_connections_key(user_id)))
+
+
+def get_presence_for_users(user_ids: Iterable[str]) -> Dict[str, Optional[datetime]]:
+    """
+    Return a mapping of user_id -> last_seen for the given users in one round trip.
+
+    last_seen is None for users who are offline, so `value is not None` means
+    online. Pipelines an EXISTS and a GET per user instead of scanning all
+    online users.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+    pipe = get_redis_client().pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.exists(_connections_key(user_id))
+        pipe.get(_last_seen_key(user_id))
+    values = pipe.execute()
+
+    result: Dict[str, Optional[datetime]] = {}
+    for index, user_id in enumerate(user_ids):
+        online, last_seen = values[2 * index], values[2 * index + 1]
+        if online:
+            result[user_id] = _parse_last_seen(last_seen) or datetime.now(timezone.utc)
+        else:
+            result[user_id] = None
+    return result
+
+
+def count_online_users() -> int:
+    """Return the number of online users (ZCARD of the online index)."""
+    client = get_redis_client()
+    return client.zcard(PRESENCE_ONLINE_INDEX_KEY)
 
 
 def get_all_online_users() -> Dict[str, datetime]:
@@ -79,15 +229,15 @@ def get_all_online_users() -> Dict[str, datetime]:
     Return a mapping of user_id -> last_seen (as datetime) for all online users.
     """
     client = get_redis_client()
-    raw = client.hgetall(ONLINE_USERS_KEY)
+    user_ids = [user_id.decode() for user_id in client.zrange(PRESENCE_ONLINE_INDEX_KEY, 0, -1)]
+    if not user_ids:
+        return {}
+    values = client.mget([_last_seen_key(user_id) for user_id in user_ids])
     result: Dict[str, datetime] = {}
-    for key, value in raw.items():
-        user_id = key.decode()
-        try:
-            result[user_id] = datetime.fromisoformat(value.decode())
-        except Exception:
-            # If parsing fails, skip that entry instead of breaking everything.
-            continue
+    for user_id, value in zip(user_ids, values):
+        last_seen = _parse_last_seen(value)
+        if last_seen is not None:
+            result[user_id] = last_seen
     return result
 
 
@@ -96,38 +246,80 @@ def get_all_online_users() -> Dict[str, datetime]:
 # ---------------------------------------------------------------------------
 
 
+# Token bucket: the bucket holds up to `burst` tokens and refills at
+# max_requests / window_seconds tokens per second; each request takes one.
+# State is a hash {tokens, ts} updated in one script call, using the Redis
+# server clock with microsecond precision (consistent across app nodes).
+RATE_LIMIT_KEY = "ws:rate:{user_id}:{action}"
+
+# KEYS = [bucket], ARGV = [burst, refill_per_second, cost]
+# Returns {allowed (0/1), remaining tokens, seconds until allowed (string)}
+_TOKEN_BUCKET_SCRIPT = """
+redis.replicate_commands()
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+-- Drop the bucket once it would be full again anyway
+redis.call('PEXPIRE', KEYS[1], math.max(1000, math.ceil(burst / rate * 1000)))
+return {allowed, math.floor(tokens), tostring(retry_after)}
+"""
+
+
+def take_rate_limit_token(
+    user_id: str,
+    action: str,
+    max_requests: int,
+    window_seconds: float,
+    burst: Optional[int] = None,
+) -> Tuple[bool, int, float]:
+    """
+    Take one token from the (user_id, action) bucket in a single round trip.
+
+    Sustained throughput is max_requests per window_seconds; up to `burst`
+    requests (default max_requests) may arrive back to back.
+    Returns (is_allowed, remaining_tokens, retry_after_seconds).
+    """
+    burst = burst or max_requests
+    allowed, remaining, retry_after = _get_script("token_bucket", _TOKEN_BUCKET_SCRIPT)(
+        keys=[RATE_LIMIT_KEY.format(user_id=user_id, action=action)],
+        args=[burst, max_requests / window_seconds, 1],
+    )
+    return bool(allowed), int(remaining), float(retry_after)
+
+
 def check_rate_limit_redis(
     user_id: str,
     action: str,
     max_requests: int = 30,
     window_seconds: int = 30,
+    burst: Optional[int] = None,
 ) -> Tuple[bool, int]:
     """
-    Redis-backed sliding-window rate limiter.
+    Redis-backed token-bucket rate limiter.
 
-    Stores timestamps in a sorted set `ws:rate:<user_id>:<action>` and ensures
-    only at most max_requests entries exist within the last window_seconds.
+    Returns (is_allowed, remaining_requests); see take_rate_limit_token.
     """
-    client = get_redis_client()
-    key = f"ws:rate:{user_id}:{action}"
-    now = int(time.time())
-    window_start = now - window_seconds
-
-    pipe = client.pipeline()
-    # Drop old entries
-    pipe.zremrangebyscore(key, 0, window_start)
-    # Add current request with score = timestamp
-    pipe.zadd(key, {str(now): now})
-    # Count remaining entries
-    pipe.zcard(key)
-    # Ensure key expires after the window
-    pipe.expire(key, window_seconds)
-    _, _, count, _ = pipe.execute()
-
-    if count > max_requests:
-        return False, 0
-
-    remaining = max_requests - count
-    return True, remaining
-
-
+    is_allowed, remaining, _ = take_rate_limit_token(user_id, action, max_requests, window_seconds, burst)
+    return is_allowed, remaining
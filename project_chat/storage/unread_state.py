@@ -0,0 +1,172 @@
+"""
+Redis-maintained unread counters per (user, conversation).
+
+Each user has a hash `chat:unread:<user_id>` of conversation_id -> unread
+count, plus a READY_FIELD marker written when the hash is built from the
+database. A missing field means zero unread.
+
+- A new message increments the counter of every other member.
+- Reading a conversation deletes its field.
+- A message deleted for everyone is decremented for members who had not
+  read it yet (never below zero).
+
+Writes only touch hashes that already exist, so users who have not opened
+the app recently cost nothing. A missing hash is rebuilt from the database
+on the next read (see ChatDB.get_unread_counts). Hashes expire after
+CHAT_UNREAD_TTL_SECONDS without a read, and adding a member to a conversation
+drops that member's hash so it is rebuilt with the conversation's history.
+
+A rebuild first replaces the hash with a BUILDING_FIELD token and only then
+counts from the database. Any counter write or reset in between removes the
+token, since the count may or may not include that change. The result is
+then not stored, and the next read rebuilds again, so no update is lost.
+"""
+
+import uuid
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+
+from project_chat.storage.redis_state import get_redis_client
+
+
+UNREAD_KEY = "chat:unread:{user_id}"
+READY_FIELD = "_ready"
+BUILDING_FIELD = "_building"
+
+# Seconds a rebuild may take before its token expires
+BUILDING_TTL_SECONDS = 60
+
+# KEYS = unread hashes, ARGV = [conversation_id, delta, READY_FIELD, BUILDING_FIELD]
+# Applies delta to the conversation's counter in every ready hash; counters
+# never go below zero and zero counters are removed. A hash still being
+# rebuilt loses its token instead, so the rebuild is not stored.
+_INCREMENT_EXISTING_SCRIPT = """
+local field = ARGV[1]
+local delta = tonumber(ARGV[2])
+for _, key in ipairs(KEYS) do
+    if redis.call('HEXISTS', key, ARGV[3]) == 1 then
+        local value = redis.call('HINCRBY', key, field, delta)
+        if value <= 0 then
+            redis.call('HDEL', key, field)
+        end
+    else
+        redis.call('HDEL', key, ARGV[4])
+    end
+end
+return 1
+"""
+
+# KEYS = [unread hash], ARGV = [token, ttl, BUILDING_FIELD, field, count, field, count, ...]
+# Replaces the hash with the rebuilt counters only if the rebuild's token
+# is still there, i.e. nothing changed the counters since it started.
+_STORE_IF_UNCHANGED_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[3]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return 1
+"""
+
+_increment_existing = None
+_store_if_unchanged = None
+
+
+def is_enabled() -> bool:
+    """Counters are only kept when Redis is enabled; otherwise unread counts come from the database."""
+    return getattr(settings, "USE_REDIS", False)
+
+
+def get_ttl_seconds() -> int:
+    return getattr(settings, "CHAT_UNREAD_TTL_SECONDS", 7 * 24 * 60 * 60)
+
+
+def _unread_key(user_id) -> str:
+    return UNREAD_KEY.format(user_id=user_id)
+
+
+def _get_increment_script():
+    global _increment_existing
+    if _increment_existing is None:
+        _increment_existing = get_redis_client().register_script(_INCREMENT_EXISTING_SCRIPT)
+    return _increment_existing
+
+
+def adjust_for_users(conversation_id, user_ids: Iterable, delta: int = 1) -> None:
+    """Add delta to conversation_id's counter for each user whose hash exists."""
+    keys = [_unread_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    _get_increment_script()(keys=keys, args=[str(conversation_id), delta, READY_FIELD, BUILDING_FIELD])
+
+
+def reset(user_id, conversation_id) -> None:
+    """Mark a conversation as fully read for user_id (and void a rebuild in progress)."""
+    get_redis_client().hdel(_unread_key(user_id), str(conversation_id), BUILDING_FIELD)
+
+
+def invalidate(user_id) -> None:
+    """Drop user_id's counters so they are rebuilt from the database on next read."""
+    get_redis_client().delete(_unread_key(user_id))
+
+
+def get_counts(user_id) -> Optional[Dict[int, int]]:
+    """
+    Return {conversation_id: unread_count} for conversations with unread
+    messages, or None if the hash has not been built yet.
+    """
+    client = get_redis_client()
+    key = _unread_key(user_id)
+    pipe = client.pipeline()
+    pipe.hgetall(key)
+    pipe.expire(key, get_ttl_seconds())
+    raw, _ = pipe.execute()
+
+    if READY_FIELD.encode() not in raw:
+        return None
+
+    counts = {}
+    for field, value in raw.items():
+        field = field.decode()
+        if field == READY_FIELD:
+            continue
+        count = int(value)
+        if count > 0:
+            counts[int(field)] = count
+    return counts
+
+
+def begin_rebuild(user_id) -> str:
+    """
+    Start rebuilding user_id's counters; call before counting from the database.
+
+    Returns the token to pass to store_counts.
+    """
+    token = uuid.uuid4().hex
+    key = _unread_key(user_id)
+    pipe = get_redis_client().pipeline()
+    pipe.delete(key)
+    pipe.hset(key, BUILDING_FIELD, token)
+    pipe.expire(key, BUILDING_TTL_SECONDS)
+    pipe.execute()
+    return token
+
+
+def store_counts(user_id, counts: Dict[int, int], token: str) -> bool:
+    """
+    Replace user_id's counters with counts computed from the database since
+    begin_rebuild returned token.
+
+    Returns False (and stores nothing) if the counters changed meanwhile.
+    """
+    global _store_if_unchanged
+    if _store_if_unchanged is None:
+        _store_if_unchanged = get_redis_client().register_script(_STORE_IF_UNCHANGED_SCRIPT)
+
+    args = [token, get_ttl_seconds(), BUILDING_FIELD, READY_FIELD, 1]
+    for conversation_id, count in counts.items():
+        if count > 0:
+            args.extend([str(conversation_id), count])
+    return bool(_store_if_unchanged(keys=[_unread_key(user_id)], args=args))
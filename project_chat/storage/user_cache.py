@@ -0,0 +1,91 @@
+"""
+Short-lived cache of active users for WebSocket authentication.
+
+Every WebSocket connection resolves its JWT to a User. Without a cache, a
+mass reconnect (e.g. after a Daphne restart) turns into one identical
+`User.objects.get` per connection. Users are cached by user_id for
+CHAT_USER_CACHE_TIMEOUT seconds in the shared Django cache (Redis in
+production), so reconnecting users are served from the cache across all
+nodes.
+
+Only CACHED_FIELDS are stored, never the password hash or other account
+data. A cached user comes back as a User with its other fields deferred;
+they are loaded from the database if accessed.
+
+Saving or deleting a user drops their entry (see ProjectChatConfig.ready),
+so deactivation takes effect on the next connection. Changes made with
+queryset.update() bypass signals and are picked up when the entry expires.
+
+Cache errors never fail authentication: lookups fall back to the database.
+"""
+
+import logging
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+USER_KEY = "chat:auth_user:{user_id}"
+
+# What the WebSocket consumers read from scope['user']
+CACHED_FIELDS = ('id', 'user_id', 'user_name', 'is_active')
+
+
+def get_timeout() -> int:
+    return getattr(settings, "CHAT_USER_CACHE_TIMEOUT", 5 * 60)
+
+
+def _user_key(user_id) -> Optional[str]:
+    try:
+        return USER_KEY.format(user_id=uuid.UUID(str(user_id)))
+    except (ValueError, TypeError):
+        return None
+
+
+def get_active_user(user_id):
+    """Return the active user with this user_id (cached), or None."""
+    key = _user_key(user_id)
+    if key is None:
+        return None
+
+    User = get_user_model()
+    try:
+        cached = cache.get(key)
+    except Exception:
+        logger.warning("User cache read failed for %s", user_id, exc_info=True)
+        cached = None
+    if cached is not None:
+        field_names = [field.attname for field in User._meta.concrete_fields if field.attname in cached]
+        return User.from_db(None, field_names, [cached[name] for name in field_names])
+
+    try:
+        user = User.objects.only(*CACHED_FIELDS).get(user_id=user_id, is_active=True)
+    except User.DoesNotExist:
+        return None
+
+    try:
+        cache.set(key, {name: getattr(user, name) for name in CACHED_FIELDS}, get_timeout())
+    except Exception:
+        logger.warning("User cache write failed for %s", user_id, exc_info=True)
+    return user
+
+
+def invalidate(user_id) -> None:
+    """Drop a user's cached entry."""
+    key = _user_key(user_id)
+    if key is None:
+        return
+    try:
+        cache.delete(key)
+    except Exception:
+        logger.exception("User cache invalidation failed for %s", user_id)
+
+
+def invalidate_user(sender, instance, **kwargs):
+    """post_save / post_delete receiver for the user model."""
+    invalidate(instance.user_id)
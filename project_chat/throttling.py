@@ -0,0 +1,45 @@
+"""
+DRF throttles backed by the chat rate limiter.
+
+REST views share the per-action policies and Redis token buckets used by the
+WebSocket consumer (see project_chat.websocket.utils.consume_rate_limit), so
+a limit holds across every worker and can be tuned with the
+RATE_LIMIT_POLICIES setting.
+"""
+
+from rest_framework.throttling import BaseThrottle
+
+from project_chat.websocket.utils import consume_rate_limit
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle requests with the token-bucket policy named by `scope`.
+    
+    Authenticated users are limited per user, anonymous requests per client IP.
+    """
+    
+    scope = 'rest'
+    
+    def __init__(self):
+        self.retry_after = None
+    
+    def get_cache_key(self, request, view) -> str:
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return str(user.user_id)
+        return f"ip:{self.get_ident(request)}"
+    
+    def allow_request(self, request, view) -> bool:
+        is_allowed, _, retry_after = consume_rate_limit(self.get_cache_key(request, view), self.scope)
+        self.retry_after = None if is_allowed else retry_after
+        return is_allowed
+    
+    def wait(self):
+        return self.retry_after
+
+
+class ChatUploadThrottle(TokenBucketThrottle):
+    """Throttle for chat file uploads."""
+    
+    scope = 'chat_upload'
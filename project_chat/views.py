@@ -5,7 +5,7 @@ Handles file uploads and conversation retrieval via REST API endpoints.
 """
 
 from rest_framework.views import APIView
-from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -13,11 +13,13 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from project_chat.storage.s3_utils import upload_chat_file_to_s3
 from project_chat.websocket.utils import validate_uploaded_file, determine_file_type_from_filename, ErrorCodes
 from project_chat.storage import ChatDB
-from project_chat.interactors.get_conversation_interactor import GetConversationInteractor
+from project_chat.interactors.get_conversation_interactor import GetConversationInteractor, DEFAULT_MESSAGES_PAGE_SIZE
 from project_chat.interactors.get_inbox_interactor import GetInboxInteractor
+from project_chat.interactors.get_unread_badge_interactor import GetUnreadBadgeInteractor
 from project_chat.presenters.conversation_response import ConversationResponse
 from project_chat.presenters.inbox_response import InboxResponse
 from project_chat.presenters.chat_error_response import ChatErrorResponse
+from project_chat.throttling import TokenBucketThrottle, ChatUploadThrottle
 import uuid
 from datetime import datetime
 
@@ -27,6 +29,7 @@ class ChatFileUploadView(APIView):
     
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ChatUploadThrottle]
     
     def post(self, request):
         """
@@ -115,13 +118,32 @@ class ChatFileUploadView(APIView):
 @api_view(['GET'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
 def get_conversation_view(request, conversation_id):
     """
-    Get conversation details by ID.
+    Get conversation details by ID with one page of messages.
     
-    GET /api/chat/conversation/<conversation_id>/
+    GET /api/chat/conversation/<conversation_id>/?limit=50&before=<message_id>&after=<message_id>
     """
     user_id = str(request.user.user_id)
+    limit = request.query_params.get('limit', str(DEFAULT_MESSAGES_PAGE_SIZE))
+    before = request.query_params.get('before')
+    after = request.query_params.get('after')
+    
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        limit = DEFAULT_MESSAGES_PAGE_SIZE
+    
+    try:
+        before = int(before) if before else None
+        after = int(after) if after else None
+    except (ValueError, TypeError):
+        return Response({
+            "success": False,
+            "error": "before and after must be message IDs",
+            "error_code": "VALIDATION_ERROR"
+        }, status=status.HTTP_400_BAD_REQUEST)
     
     interactor = GetConversationInteractor(
         storage=ChatDB(),
@@ -131,7 +153,10 @@ def get_conversation_view(request, conversation_id):
     
     result = interactor.get_conversation_interactor(
         conversation_id=conversation_id,
-        user_id=user_id
+        user_id=user_id,
+        limit=limit,
+        before=before,
+        after=after
     )
     
     # Convert dict response to Response object
@@ -153,6 +178,8 @@ def get_conversation_view(request, conversation_id):
             return Response(error_response, status=status.HTTP_404_NOT_FOUND)
         elif error_code == 'NOT_MEMBER':
             return Response(error_response, status=status.HTTP_403_FORBIDDEN)
+        elif error_code == 'VALIDATION_ERROR':
+            return Response(error_response, status=status.HTTP_400_BAD_REQUEST)
         else:
             return Response(error_response, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -160,6 +187,7 @@ def get_conversation_view(request, conversation_id):
 @api_view(['GET'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
 def get_inbox_view(request):
     """
     Get inbox (all conversations) for current user.
@@ -179,3 +207,28 @@ def get_inbox_view(request):
         return Response(result, status=status.HTTP_200_OK)
     else:
         return Response(result, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def get_unread_badge_view(request):
+    """
+    Get unread message counts for current user (app badge).
+    
+    GET /api/chat/unread/
+    """
+    user_id = str(request.user.user_id)
+    
+    interactor = GetUnreadBadgeInteractor(
+        storage=ChatDB(),
+        response=InboxResponse()
+    )
+    
+    result = interactor.get_unread_badge_interactor(user_id=user_id)
+    
+    if result.get('success'):
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
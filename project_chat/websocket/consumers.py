@@ -4,6 +4,7 @@ WebSocket consumers for real-time chat functionality.
 Handles WebSocket connections, message sending, editing, deletion, and presence.
 """
 
+import asyncio
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
@@ -15,9 +16,10 @@ from project_chat.storage import ChatDB
 from project_chat.storage.redis_state import (
     mark_user_online,
     mark_user_offline,
+    PRESENCE_HEARTBEAT_SECONDS,
     get_last_seen,
-    get_all_online_users,
-    is_user_online,
+    get_presence_for_users,
+    count_online_users,
 )
 from project_chat.presenters.message_response import MessageResponse
 from project_chat.presenters.chat_error_response import ChatErrorResponse
@@ -27,6 +29,7 @@ from project_chat.interactors.delete_message_interactor import DeleteMessageInte
 from project_chat.interactors.mark_read_interactor import MarkReadInteractor
 from project_chat.websocket.utils import check_rate_limit, ErrorCodes
 from project_chat.websocket.middleware import JWTAuthMiddleware
+from project_chat.websocket.presence import presence_broadcaster
 
 User = get_user_model()
 
@@ -57,6 +60,7 @@ class UserChatConsumer(AsyncWebsocketConsumer):
         self.user = None
         self.user_id = None
         self.user_groups: Set[str] = set()  # Track joined groups
+        self.presence_heartbeat_task = None
         self.storage = ChatDB()
         self.message_response = MessageResponse()
         self.error_response = ChatErrorResponse()
@@ -101,21 +105,23 @@ class UserChatConsumer(AsyncWebsocketConsumer):
         # Accept connection
         await self.accept()
         
-        # Update presence status (user is now online, persisted in Redis)
-        mark_user_online(self.user_id)
+        # Update presence status (this connection is registered in Redis and
+        # kept alive by heartbeats until disconnect)
+        connections = mark_user_online(self.user_id, self.channel_name)
+        self.presence_heartbeat_task = asyncio.ensure_future(self._presence_heartbeat())
         
         # Debug: Log when user comes online
         import logging
         logger = logging.getLogger(__name__)
-        online_users = get_all_online_users()
         logger.info(
-            f"User {self.user_id} connected and marked as online. "
-            f"Total online users: {len(online_users)}"
+            f"User {self.user_id} connected and marked as online "
+            f"({connections} connection(s)). Total online users: {count_online_users()}"
         )
-        logger.debug(f"All online users: {list(online_users.keys())}")
         
         # Broadcast online status to all conversations where user is a member
-        await self._broadcast_presence_to_conversations(is_online=True)
+        # (only for the first connection; other devices were already online)
+        if connections == 1:
+            await self._broadcast_presence_to_conversations(is_online=True)
         
         # Send connection established message
         await self.send(text_data=json.dumps(
@@ -124,19 +130,24 @@ class UserChatConsumer(AsyncWebsocketConsumer):
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
-        # Broadcast offline status to all conversations before removing from online users
+        if self.presence_heartbeat_task:
+            self.presence_heartbeat_task.cancel()
+            self.presence_heartbeat_task = None
+        
         if self.user_id:
-            await self._broadcast_presence_to_conversations(is_online=False)
+            # Update presence status (the user is offline once their last connection closes)
+            remaining_connections = mark_user_offline(self.user_id, self.channel_name)
+            
+            # Broadcast offline status to all conversations
+            if remaining_connections == 0:
+                await self._broadcast_presence_to_conversations(is_online=False)
             
-            # Update presence status (user is now offline)
-            mark_user_offline(self.user_id)
             # Debug: Log when user goes offline
             import logging
             logger = logging.getLogger(__name__)
-            online_users = get_all_online_users()
             logger.info(
-                f"User {self.user_id} disconnected and marked as offline. "
-                f"Total online users: {len(online_users)}"
+                f"User {self.user_id} disconnected "
+                f"({remaining_connections} connection(s) left). Total online users: {count_online_users()}"
             )
         
         # Leave all groups
@@ -144,6 +155,17 @@ class UserChatConsumer(AsyncWebsocketConsumer):
             await self.channel_layer.group_discard(group, self.channel_name)
         self.user_groups.clear()
     
+    async def _presence_heartbeat(self):
+        """Refresh this connection's presence until cancelled on disconnect."""
+        while True:
+            await asyncio.sleep(PRESENCE_HEARTBEAT_SECONDS)
+            try:
+                mark_user_online(self.user_id, self.channel_name)
+            except Exception as e:
+                # Redis hiccup: try again on the next beat (the TTL covers a few missed beats)
+                import logging
+                logging.getLogger(__name__).warning(f"Presence heartbeat failed for user {self.user_id}: {e}")
+    
     async def receive(self, text_data):
         """Handle messages received from WebSocket."""
         try:
@@ -478,6 +500,11 @@ class UserChatConsumer(AsyncWebsocketConsumer):
         if not conversation_id:
             return
         
+        # Rate limiting (excess typing events are dropped silently)
+        is_allowed, _ = check_rate_limit(self.user_id, 'typing')
+        if not is_allowed:
+            return
+        
         # Check if user is a member
         is_member = await database_sync_to_async(
             self.storage.check_user_membership
@@ -538,10 +565,18 @@ class UserChatConsumer(AsyncWebsocketConsumer):
         """Handle presence_updated event from group."""
         await self.send(text_data=json.dumps(event['data']))
     
+    async def presence_updated_batch(self, event):
+        """Handle presence_updated_batch event from group (see PresenceBroadcaster)."""
+        for update in event['updates']:
+            await self.send(text_data=json.dumps(update))
+    
     async def _broadcast_presence_to_conversations(self, is_online: bool):
         """
         Broadcast presence status (online/offline) to all conversations where user is a member.
         
+        The update is queued on the process-wide presence broadcaster, which
+        coalesces and debounces changes and sends them in batches.
+        
         Args:
             is_online: True if user is coming online, False if going offline
         """
@@ -555,45 +590,7 @@ class UserChatConsumer(AsyncWebsocketConsumer):
                 last_seen_dt = get_last_seen(self.user_id)
                 last_seen = last_seen_dt.isoformat() if last_seen_dt else None
             
-            # Get all conversations where user is a member
-            conversations = await database_sync_to_async(
-                self.storage.get_user_conversations
-            )(self.user_id)
-            
-            if not conversations:
-                return
-            
-            # Broadcast presence update to each conversation group
-            for conversation_data in conversations:
-                conversation_id = str(conversation_data.get('conversation_id'))
-                if not conversation_id:
-                    continue
-                
-                # Format presence broadcast
-                presence_data = self.message_response.presence_status_broadcast(
-                    user_id=self.user_id,
-                    is_online=is_online,
-                    conversation_id=conversation_id,
-                    last_seen=last_seen
-                )
-                
-                # Broadcast to conversation group
-                conv_group = f"conversation_{conversation_id}"
-                await self.channel_layer.group_send(
-                    conv_group,
-                    {
-                        'type': 'presence_updated',
-                        'data': presence_data
-                    }
-                )
-                
-                # Debug logging
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.debug(
-                    f"Broadcasted presence update: user {self.user_id} is "
-                    f"{'online' if is_online else 'offline'} in conversation {conversation_id}"
-                )
+            presence_broadcaster.schedule(self.user_id, is_online, last_seen)
         except Exception as e:
             # Log error but don't break connection/disconnection
             import logging
@@ -631,47 +628,26 @@ class UserChatConsumer(AsyncWebsocketConsumer):
         # Normalize current user_id for comparison (self.user_id is already normalized from connect)
         current_user_id_normalized = _normalize_user_id(self.user_id) if self.user_id else None
         
-        # Debug: Log all online users for troubleshooting
-        import logging
-        logger = logging.getLogger(__name__)
-        online_users = get_all_online_users()
-        logger.info(f"Online users in Redis: {list(online_users.keys())}")
-        logger.info(f"Checking presence for conversation {conversation_id}")
-        logger.info(f"Current user_id (normalized): {current_user_id_normalized}")
+        # One HMGET for all members instead of an HEXISTS + HGET per member
+        last_seen_by_user = get_presence_for_users(
+            _normalize_user_id(member.user.user_id) for member in members
+        )
         
         presence_data = []
         for member in members:
             # Normalize user_id using the same function as everywhere else
             member_id = _normalize_user_id(member.user.user_id)
-            original_user_id = str(member.user.user_id)
-            
-            # Debug logging for each member
-            logger.info(f"Checking member: original={original_user_id}, normalized={member_id}")
             
-            # Check if user is online (always true for the requesting user since they're connected)
+            # The requesting user is always online since they're connected
             if current_user_id_normalized and member_id == current_user_id_normalized:
                 is_online_flag = True
                 last_seen_dt = datetime.now()
-                logger.info(f"User {original_user_id} is the requesting user - marking as online")
             else:
-                # Check if member is in Redis-backed online users
-                is_online_flag = is_user_online(member_id)
-                if is_online_flag:
-                    last_seen_dt = get_last_seen(member_id) or datetime.now()
-                    logger.info(
-                        f"User {original_user_id} (normalized: {member_id}) "
-                        f"found in Redis online users - ONLINE"
-                    )
-                else:
-                    last_seen_dt = None
-                    logger.warning(
-                        f"User {original_user_id} (normalized: '{member_id}') "
-                        f"NOT found in Redis online users - OFFLINE"
-                    )
-                    logger.warning(f"Available keys in Redis online users: {list(online_users.keys())}")
+                last_seen_dt = last_seen_by_user.get(member_id)
+                is_online_flag = last_seen_dt is not None
             
             presence_data.append({
-                "user_id": original_user_id,  # Return original format
+                "user_id": str(member.user.user_id),  # Return original format
                 "user_name": member.user.user_name,
                 "is_online": is_online_flag,
                 "last_seen": last_seen_dt.isoformat() if last_seen_dt else None
@@ -772,4 +748,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def message_deleted(self, event):
         """Handle message_deleted event from group."""
         await self.send(text_data=json.dumps(event['data']))
+    
+    async def presence_updated_batch(self, event):
+        """Handle presence_updated_batch event from group (see PresenceBroadcaster)."""
+        for update in event['updates']:
+            await self.send(text_data=json.dumps(update))
 
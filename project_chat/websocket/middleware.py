@@ -6,13 +6,11 @@ setting the user in the scope for authenticated connections.
 """
 
 from urllib.parse import parse_qs
-from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.tokens import AccessToken
 from channels.middleware import BaseMiddleware
 from channels.db import database_sync_to_async
-
-User = get_user_model()
+from project_chat.storage import user_cache
 
 
 @database_sync_to_async
@@ -20,6 +18,9 @@ def get_user_from_token(token_string):
     """
     Validate JWT token and return the associated user.
     
+    The token is validated once (signature, expiry and type) and the user is
+    read through a short-lived cache, so mass reconnects don't each hit the DB.
+    
     Args:
         token_string: The JWT token string
         
@@ -27,24 +28,15 @@ def get_user_from_token(token_string):
         User object if token is valid, None otherwise
     """
     try:
-        # Validate token
-        UntypedToken(token_string)
-        
-        # Get user_id from token
-        from rest_framework_simplejwt.tokens import AccessToken
+        # Validate token and get user_id from it
         access_token = AccessToken(token_string)
         user_id = access_token.get('user_id')
         
         if not user_id:
             return None
-            
-        # Get user from database
-        try:
-            user = User.objects.get(user_id=user_id, is_active=True)
-            return user
-        except User.DoesNotExist:
-            return None
-            
+        
+        # Get active user (cache, then database)
+        return user_cache.get_active_user(user_id)
     except (TokenError, InvalidToken, Exception):
         return None
 
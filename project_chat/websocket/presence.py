@@ -0,0 +1,127 @@
+"""
+Batched presence broadcasting for WebSocket consumers.
+
+Connect and disconnect only record a pending presence change. One flush per
+debounce window then:
+- coalesces the changes per user (only the latest state counts),
+- drops flaps, i.e. users whose state at the end of the window equals the
+  state before it (a mobile client reconnecting within a few seconds),
+- loads the conversations of all changed users in one query,
+- sends one group message per conversation carrying every update for it,
+  with all group sends issued concurrently.
+
+A reconnect storm after a deploy therefore costs one query and one
+channel-layer message per affected conversation per window, instead of one
+query and one message per (connection, conversation).
+
+Flaps are only dropped within one process: the buffer is per Daphne node.
+A client that disconnects from one node and reconnects to another (e.g.
+when a deploy moves it) still broadcasts an offline and an online update.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from project_chat.storage import ChatDB
+from project_chat.presenters.message_response import MessageResponse
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceBroadcaster:
+    """
+    Per-process presence change buffer, flushed once per debounce window.
+    
+    Consumers call schedule(); the group event type is
+    'presence_updated_batch' with the list of presence.updated payloads
+    under 'updates'.
+    """
+    
+    def __init__(self, storage: ChatDB = None, response: MessageResponse = None,
+                 debounce_seconds: Optional[float] = None):
+        self.storage = storage or ChatDB()
+        self.response = response or MessageResponse()
+        self._debounce_seconds = debounce_seconds
+        # user_id -> {'initial': state before the window, 'is_online': latest state, 'last_seen': ...}
+        self._pending: Dict[str, dict] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    @property
+    def debounce_seconds(self) -> float:
+        if self._debounce_seconds is not None:
+            return self._debounce_seconds
+        return getattr(settings, 'CHAT_PRESENCE_DEBOUNCE_SECONDS', 3.0)
+    
+    def schedule(self, user_id: str, is_online: bool, last_seen: Optional[str] = None) -> None:
+        """Record a presence change for user_id; it is broadcast at the end of the current window."""
+        pending = self._pending.get(user_id)
+        if pending is None:
+            # Connect implies the user was offline before, disconnect that they were online
+            pending = self._pending[user_id] = {'initial': not is_online}
+        pending['is_online'] = is_online
+        pending['last_seen'] = last_seen
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+    
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.debounce_seconds)
+        pending, self._pending = self._pending, {}
+        try:
+            await self.flush(pending)
+        except Exception:
+            # Presence is best effort; never let a failed flush kill future ones
+            logger.exception("Failed to broadcast %d presence update(s)", len(pending))
+    
+    async def flush(self, pending: Dict[str, dict]) -> int:
+        """Broadcast the given changes; returns the number of group messages sent."""
+        changes = {
+            user_id: change for user_id, change in pending.items()
+            if change['is_online'] != change['initial']
+        }
+        if not changes:
+            return 0
+        
+        conversation_ids_by_user = await database_sync_to_async(
+            self.storage.get_conversation_ids_for_users
+        )(list(changes))
+        
+        updates_by_group: Dict[str, list] = {}
+        for user_id, change in changes.items():
+            for conversation_id in conversation_ids_by_user.get(user_id, []):
+                updates_by_group.setdefault(f"conversation_{conversation_id}", []).append(
+                    self.response.presence_status_broadcast(
+                        user_id=user_id,
+                        is_online=change['is_online'],
+                        conversation_id=str(conversation_id),
+                        last_seen=change['last_seen']
+                    )
+                )
+        if not updates_by_group:
+            return 0
+        
+        channel_layer = get_channel_layer()
+        results = await asyncio.gather(
+            *(
+                channel_layer.group_send(group, {'type': 'presence_updated_batch', 'updates': updates})
+                for group, updates in updates_by_group.items()
+            ),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Presence group send failed: %s", result)
+        
+        logger.debug(
+            "Broadcast presence of %d user(s) to %d conversation(s)",
+            len(changes), len(updates_by_group)
+        )
+        return len(updates_by_group)
+
+
+presence_broadcaster = PresenceBroadcaster()
@@ -43,40 +43,70 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
 
 from django.conf import settings
-from project_chat.storage.redis_state import check_rate_limit_redis
+from project_chat.storage.redis_state import take_rate_limit_token
+
+# Rate limit policies per action: sustained `max_requests` per `window_seconds`,
+# with up to `burst` requests allowed back to back. WebSocket actions and DRF
+# throttles (project_chat.throttling) share these; override or add entries
+# with the RATE_LIMIT_POLICIES setting.
+DEFAULT_RATE_LIMIT_POLICIES = {
+    'send_message': {'max_requests': 30, 'window_seconds': 30, 'burst': 30},
+    'typing': {'max_requests': 10, 'window_seconds': 10, 'burst': 5},
+    'chat_upload': {'max_requests': 20, 'window_seconds': 60, 'burst': 5},
+    'rest': {'max_requests': 120, 'window_seconds': 60, 'burst': 60},
+}
+DEFAULT_RATE_LIMIT_POLICY = {'max_requests': 30, 'window_seconds': 30, 'burst': 30}
 
 # Rate limiting storage (in-memory, per user) – used as a fallback when Redis
 # is not enabled or not desired.
 _rate_limit_storage: Dict[str, Dict] = {}
 
 
-def check_rate_limit(user_id: str, action: str, max_requests: int = 30, window_seconds: int = 30) -> tuple[bool, Optional[int]]:
+def get_rate_limit_policy(action: str) -> Dict:
+    """Return the rate limit policy for an action (settings override the defaults)."""
+    policies = {**DEFAULT_RATE_LIMIT_POLICIES, **getattr(settings, "RATE_LIMIT_POLICIES", {})}
+    return {**DEFAULT_RATE_LIMIT_POLICY, **policies.get(action, {})}
+
+
+def consume_rate_limit(
+    user_id: str,
+    action: str,
+    max_requests: Optional[int] = None,
+    window_seconds: Optional[int] = None
+) -> Tuple[bool, int, float]:
     """
-    Check if user has exceeded rate limit for an action.
+    Count one request by user_id against the action's rate limit.
 
-    If Redis is enabled (`USE_REDIS=True`), this will use a Redis-backed sliding
-    window so rate limiting state is shared across workers and survives process
-    restarts. Otherwise, it falls back to the in-memory implementation.
+    If Redis is enabled (`USE_REDIS=True`), this uses a Redis token bucket
+    (one script call) so rate limiting state is shared across workers and
+    survives process restarts. Otherwise, it falls back to an in-memory
+    sliding window.
 
     Args:
         user_id: User ID
-        action: Action name (e.g., 'send_message')
-        max_requests: Maximum requests allowed
-        window_seconds: Time window in seconds
+        action: Action name (e.g., 'send_message'); selects the policy
+        max_requests: Override the policy's maximum requests
+        window_seconds: Override the policy's time window in seconds
 
     Returns:
-        Tuple of (is_allowed, remaining_requests)
+        Tuple of (is_allowed, remaining_requests, retry_after_seconds)
     """
+    policy = get_rate_limit_policy(action)
+    if max_requests is not None:
+        policy['max_requests'] = policy['burst'] = max_requests
+    if window_seconds is not None:
+        policy['window_seconds'] = window_seconds
+    
     # Prefer Redis-based rate limiting when enabled.
     if getattr(settings, "USE_REDIS", False):
-        is_allowed, remaining = check_rate_limit_redis(
+        return take_rate_limit_token(
             user_id=user_id,
             action=action,
-            max_requests=max_requests,
-            window_seconds=window_seconds,
+            max_requests=policy['max_requests'],
+            window_seconds=policy['window_seconds'],
+            burst=policy['burst'],
         )
-        return is_allowed, remaining
-
+    
     key = f"{user_id}:{action}"
     now = datetime.now()
     
@@ -89,22 +119,47 @@ def check_rate_limit(user_id: str, action: str, max_requests: int = 30, window_s
     storage = _rate_limit_storage[key]
     
     # Remove requests outside the time window
-    cutoff_time = now - timedelta(seconds=window_seconds)
+    cutoff_time = now - timedelta(seconds=policy['window_seconds'])
     storage['requests'] = [
         req_time for req_time in storage['requests']
         if req_time > cutoff_time
     ]
     
     # Check if limit exceeded
-    if len(storage['requests']) >= max_requests:
-        remaining = 0
-        return False, remaining
+    if len(storage['requests']) >= policy['max_requests']:
+        retry_after = (
+            (storage['requests'][0] - cutoff_time).total_seconds()
+            if storage['requests'] else policy['window_seconds']
+        )
+        return False, 0, retry_after
     
     # Add current request
     storage['requests'].append(now)
-    remaining = max_requests - len(storage['requests'])
+    remaining = policy['max_requests'] - len(storage['requests'])
     
-    return True, remaining
+    return True, remaining, 0.0
+
+
+def check_rate_limit(
+    user_id: str,
+    action: str,
+    max_requests: Optional[int] = None,
+    window_seconds: Optional[int] = None
+) -> tuple[bool, Optional[int]]:
+    """
+    Check if user has exceeded rate limit for an action.
+
+    Args:
+        user_id: User ID
+        action: Action name (e.g., 'send_message')
+        max_requests: Maximum requests allowed (defaults to the action's policy)
+        window_seconds: Time window in seconds (defaults to the action's policy)
+
+    Returns:
+        Tuple of (is_allowed, remaining_requests)
+    """
+    is_allowed, remaining, _ = consume_rate_limit(user_id, action, max_requests, window_seconds)
+    return is_allowed, remaining
 
 
 def validate_uuid(uuid_string: str) -> bool:
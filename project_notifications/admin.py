@@ -1,5 +1,5 @@
 from django.contrib import admin
-from project_notifications.models import Notification, NotificationFetchTracker
+from project_notifications.models import Notification, NotificationFetchTracker, NotificationOutbox
 
 
 @admin.register(Notification)
@@ -25,8 +25,16 @@ class NotificationAdmin(admin.ModelAdmin):
 
 @admin.register(NotificationFetchTracker)
 class NotificationFetchTrackerAdmin(admin.ModelAdmin):
-    list_display = ('tracker_id', 'user', 'last_fetch_at', 'updated_at')
+    list_display = ('tracker_id', 'user', 'last_fetch_at', 'last_read_at', 'unread_count', 'updated_at')
     list_filter = ('last_fetch_at', 'updated_at')
     search_fields = ('user__user_name', 'user__email')
     readonly_fields = ('tracker_id', 'created_at', 'updated_at')
     ordering = ('-updated_at',)
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('outbox_id', 'event_type', 'attempts', 'created_at')
+    list_filter = ('event_type', 'attempts')
+    readonly_fields = ('outbox_id', 'created_at')
+    ordering = ('outbox_id',)
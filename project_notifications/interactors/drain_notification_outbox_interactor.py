@@ -0,0 +1,183 @@
+"""
+Interactor for draining the notification outbox.
+"""
+import logging
+from functools import partial
+from typing import Dict, List, Tuple
+from django.db import transaction
+from bible_way.models import User, Post, Comment, PrayerRequest
+from project_chat.models import Message
+from project_notifications.models import NotificationOutbox, NotificationOutboxEventChoices, NotificationTypeChoices
+from project_notifications.storage import NotificationDB
+from project_notifications.utils.broadcast import broadcast_notifications
+
+logger = logging.getLogger(__name__)
+
+
+# (payload key, model, notification type, target type) for liked content
+LIKE_TARGETS = [
+    ('post_id', Post, NotificationTypeChoices.POST_LIKE, 'post'),
+    ('comment_id', Comment, NotificationTypeChoices.COMMENT_LIKE, 'comment'),
+    ('prayer_request_id', PrayerRequest, NotificationTypeChoices.PRAYER_REQUEST_LIKE, 'prayer_request'),
+]
+
+
+class DrainNotificationOutboxInteractor:
+    """
+    Turns outbox events into notifications, one batch at a time.
+    
+    A batch is processed in one transaction: follows and messages are
+    bulk-inserted, likes are aggregated per target (one write per liked
+    object, however many likes it got), processed events are deleted, and
+    the resulting notifications are broadcast together after commit.
+    Each unit of work runs in a savepoint, so one failing event is retried
+    later without holding back the rest of the batch.
+    """
+    
+    def __init__(self, storage: NotificationDB):
+        self.storage = storage
+    
+    def drain_notification_outbox_interactor(self, batch_size: int = 200, max_attempts: int = 5) -> int:
+        """
+        Process up to batch_size pending events.
+        
+        Returns the number of events claimed (0 when the outbox is empty).
+        """
+        notifications = []
+        with transaction.atomic():
+            events = self.storage.claim_outbox_events(batch_size, max_attempts)
+            if not events:
+                return 0
+            
+            by_type: Dict[str, List[NotificationOutbox]] = {}
+            for event in events:
+                by_type.setdefault(event.event_type, []).append(event)
+            
+            users = User.objects.in_bulk(self._user_pks(events))
+            
+            for unit_events, work in (
+                self._follow_work(by_type.get(NotificationOutboxEventChoices.FOLLOW, []), users)
+                + self._like_work(by_type.get(NotificationOutboxEventChoices.REACTION, []), users)
+                + self._message_work(by_type.get(NotificationOutboxEventChoices.MESSAGE, []))
+            ):
+                notifications.extend(self._run_unit(unit_events, work))
+            
+            # Unknown event types can never succeed; drop them
+            known = {choice.value for choice in NotificationOutboxEventChoices}
+            unknown = [event.outbox_id for event in events if event.event_type not in known]
+            if unknown:
+                self.storage.delete_outbox_events(unknown)
+        
+        broadcast_notifications(notifications)
+        return len(events)
+    
+    def _run_unit(self, events: List[NotificationOutbox], work) -> list:
+        outbox_ids = [event.outbox_id for event in events]
+        try:
+            with transaction.atomic():
+                created = work()
+                self.storage.delete_outbox_events(outbox_ids)
+            return created
+        except Exception as e:
+            logger.exception("Notification outbox events %s failed", outbox_ids)
+            self.storage.record_outbox_failure(outbox_ids, str(e))
+            return []
+    
+    def _user_pks(self, events: List[NotificationOutbox]) -> set:
+        pks = set()
+        for event in events:
+            for key in ('follower_pk', 'followed_pk', 'actor_pk'):
+                if event.payload.get(key) is not None:
+                    pks.add(event.payload[key])
+        return pks
+    
+    def _follow_work(self, events: List[NotificationOutbox], users: Dict[int, User]) -> List[Tuple]:
+        if not events:
+            return []
+        follows = []
+        for event in events:
+            follower = users.get(event.payload.get('follower_pk'))
+            followed = users.get(event.payload.get('followed_pk'))
+            # Users deleted since the follow: nothing to notify
+            if follower and followed:
+                follows.append((follower, followed))
+        return [(events, lambda: self.storage.bulk_create_follow_notifications(follows))]
+    
+    def _like_work(self, events: List[NotificationOutbox], users: Dict[int, User]) -> List[Tuple]:
+        if not events:
+            return []
+        
+        # Load every liked object of the batch with its owner, per content type;
+        # owners are usually not actors of the batch, so they are not in `users`
+        owners = {}
+        for key, model, notification_type, target_type in LIKE_TARGETS:
+            ids = {event.payload[key] for event in events if event.payload.get(key)}
+            if ids:
+                for pk, obj in model.objects.select_related('user').in_bulk(list(ids)).items():
+                    owners[(key, str(pk))] = obj.user
+        
+        # Group likes per (recipient, target), keeping like order
+        groups: Dict[tuple, dict] = {}
+        skipped = []
+        for event in events:
+            target = next(
+                (spec for spec in LIKE_TARGETS if event.payload.get(spec[0])),
+                None
+            )
+            actor = users.get(event.payload.get('actor_pk'))
+            recipient = owners.get((target[0], event.payload[target[0]])) if target else None
+            
+            # Skip deleted content/users and self-likes
+            if not actor or not recipient or actor.pk == recipient.pk:
+                skipped.append(event)
+                continue
+            
+            key, _, notification_type, target_type = target
+            group = groups.setdefault(
+                (recipient.pk, notification_type, event.payload[key], target_type),
+                {'recipient': recipient, 'events': [], 'actors': []}
+            )
+            group['events'].append(event)
+            if actor not in group['actors']:
+                group['actors'].append(actor)
+            else:
+                # Re-like: move to the end so they are the latest actor
+                group['actors'].remove(actor)
+                group['actors'].append(actor)
+        
+        work = []
+        if skipped:
+            work.append((skipped, lambda: []))
+        for (_, notification_type, target_id, target_type), group in groups.items():
+            work.append((
+                group['events'],
+                partial(self._aggregate_likes, group, notification_type, target_id, target_type)
+            ))
+        return work
+    
+    def _aggregate_likes(self, group: dict, notification_type: str, target_id: str, target_type: str) -> list:
+        return [
+            self.storage.aggregate_like_notification(
+                recipient=group['recipient'],
+                notification_type=notification_type,
+                target_id=target_id,
+                target_type=target_type,
+                actors=group['actors']
+            )
+        ]
+    
+    def _message_work(self, events: List[NotificationOutbox]) -> List[Tuple]:
+        if not events:
+            return []
+        messages = Message.objects.select_related('sender').in_bulk(
+            [event.payload['message_id'] for event in events if event.payload.get('message_id')]
+        )
+        work = []
+        for event in events:
+            message = messages.get(event.payload.get('message_id'))
+            if message is None or message.is_deleted_for_everyone:
+                # Deleted before the worker got to it
+                work.append(([event], lambda: []))
+            else:
+                work.append(([event], partial(self.storage.bulk_create_message_notifications, message)))
+        return work
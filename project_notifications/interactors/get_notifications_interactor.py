@@ -2,6 +2,7 @@
 Interactor for fetching user notifications.
 """
 from datetime import datetime
+from typing import Optional
 from django.utils import timezone
 from rest_framework.response import Response
 from project_notifications.storage import NotificationDB
@@ -9,6 +10,10 @@ from project_notifications.presenters.get_notifications_response import GetNotif
 from project_notifications.presenters.notification_error_response import NotificationErrorResponse
 
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
 class GetNotificationsInteractor:
     """Interactor for getting user notifications."""
     
@@ -24,15 +29,28 @@ class GetNotificationsInteractor:
     
     def get_notifications_interactor(
         self,
-        user_id: str
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
     ) -> Response:
         """
-        Get notifications for a user based on last fetch time.
+        Get notifications for a user.
+        
+        With a cursor (empty for the first page), returns one page of the
+        full history, newest first, without touching any tracker. Without
+        one, returns up to MAX_PAGE_SIZE notifications created since the
+        last fetch (the newest ones on the first call) and moves
+        last_fetch_at. Neither moves the read watermark.
         
         Args:
             user_id: ID of the user
+            limit: Page size (cursor mode only)
+            cursor: Opaque cursor from the previous page's next_cursor
         """
         try:
+            if cursor is not None:
+                return self._get_notifications_page(user_id, limit, cursor)
+            
             # Get or create fetch tracker for user
             tracker = self.storage.get_or_create_fetch_tracker(user_id)
             if not tracker:
@@ -44,44 +62,23 @@ class GetNotificationsInteractor:
             # Get notifications from storage
             notifications, total_count = self.storage.get_user_notifications(
                 user_id=user_id,
-                last_fetch_time=last_fetch_time
+                last_fetch_time=last_fetch_time,
+                limit=MAX_PAGE_SIZE
             )
             
-            # Update fetch tracker with current timestamp
-            current_time = timezone.now()
-            self.storage.update_fetch_tracker(user_id, current_time)
+            # A capped catch-up resumes after the newest notification returned;
+            # otherwise (and on the first call) the tracker moves to now
+            if last_fetch_time and total_count == MAX_PAGE_SIZE:
+                fetch_time = notifications[0].created_at
+            else:
+                fetch_time = timezone.now()
+            self.storage.update_fetch_tracker(user_id, fetch_time)
             
             # Format notifications
-            notifications_data = []
-            for notification in notifications:
-                metadata = notification.metadata or {}
-                actors_count = metadata.get('actors_count', 1)
-                actors = metadata.get('actors', [])
-                last_actor_id = metadata.get('last_actor_id', str(notification.actor.user_id) if notification.actor else None)
-                
-                # Get actor info (use last actor for aggregated notifications)
-                actor_data = None
-                if notification.actor:
-                    actor_data = {
-                        'user_id': str(notification.actor.user_id),
-                        'user_name': notification.actor.user_name,
-                        'profile_picture_url': notification.actor.profile_picture_url or ''
-                    }
-                
-                notification_data = {
-                    'notification_id': str(notification.notification_id),
-                    'type': notification.notification_type,
-                    'actor': actor_data,
-                    'actors_count': actors_count,
-                    'actors': actors,
-                    'target_id': notification.target_id,
-                    'target_type': notification.target_type,
-                    'conversation_id': notification.conversation_id,
-                    'message_id': notification.message_id,
-                    'created_at': notification.created_at.isoformat() if notification.created_at else None,
-                    'metadata': metadata
-                }
-                notifications_data.append(notification_data)
+            notifications_data = [
+                self._format_notification(notification, tracker.last_read_at)
+                for notification in notifications
+            ]
             
             return self.response.get_notifications_success_response(
                 notifications=notifications_data,
@@ -92,3 +89,60 @@ class GetNotificationsInteractor:
             logger = logging.getLogger(__name__)
             logger.error(f"Error in get_notifications_interactor: {e}")
             return self.error_response.server_error(str(e))
+    
+    def _get_notifications_page(self, user_id: str, limit: int, cursor: str) -> Response:
+        if limit < 1:
+            return self.response.validation_error_response("Limit must be greater than 0")
+        limit = min(limit, MAX_PAGE_SIZE)
+        
+        tracker = self.storage.get_unread_state(user_id)
+        if not tracker:
+            return self.error_response.server_error("Failed to get fetch tracker")
+        
+        try:
+            result = self.storage.get_user_notifications_page(user_id=user_id, limit=limit, cursor=cursor)
+        except ValueError:
+            return self.response.validation_error_response("Invalid cursor")
+        
+        return self.response.notifications_page_response(
+            notifications=[
+                self._format_notification(notification, tracker.last_read_at)
+                for notification in result['notifications']
+            ],
+            pagination_data={
+                'limit': result['limit'],
+                'next_cursor': result['next_cursor'],
+                'has_next': result['has_next']
+            },
+            unread_count=tracker.unread_count
+        )
+    
+    def _format_notification(self, notification, last_read_at: Optional[datetime]) -> dict:
+        metadata = notification.metadata or {}
+        # Column is authoritative; metadata only holds counts of rows aggregated before it existed
+        actors_count = max(notification.actors_count, metadata.get('actors_count', 1))
+        actors = metadata.get('actors', [])
+        
+        # Get actor info (use last actor for aggregated notifications)
+        actor_data = None
+        if notification.actor:
+            actor_data = {
+                'user_id': str(notification.actor.user_id),
+                'user_name': notification.actor.user_name,
+                'profile_picture_url': notification.actor.profile_picture_url or ''
+            }
+        
+        return {
+            'notification_id': str(notification.notification_id),
+            'type': notification.notification_type,
+            'actor': actor_data,
+            'actors_count': actors_count,
+            'actors': actors,
+            'target_id': notification.target_id,
+            'target_type': notification.target_type,
+            'conversation_id': notification.conversation_id,
+            'message_id': notification.message_id,
+            'created_at': notification.created_at.isoformat() if notification.created_at else None,
+            'is_read': bool(last_read_at and notification.created_at and notification.created_at <= last_read_at),
+            'metadata': {**metadata, 'actors_count': actors_count}
+        }
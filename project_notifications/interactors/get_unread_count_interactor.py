@@ -0,0 +1,43 @@
+"""
+Interactor for the unread notification count.
+"""
+from rest_framework.response import Response
+from project_notifications.storage import NotificationDB
+from project_notifications.presenters.notification_read_response import NotificationReadResponse
+from project_notifications.presenters.notification_error_response import NotificationErrorResponse
+
+
+class GetUnreadCountInteractor:
+    """Interactor for getting the number of unread notifications."""
+    
+    def __init__(
+        self,
+        storage: NotificationDB,
+        response: NotificationReadResponse,
+        error_response: NotificationErrorResponse
+    ):
+        self.storage = storage
+        self.response = response
+        self.error_response = error_response
+    
+    def get_unread_count_interactor(self, user_id: str) -> Response:
+        """
+        Get the user's unread notification count from the maintained counter.
+        
+        Args:
+            user_id: ID of the user
+        """
+        try:
+            tracker = self.storage.get_unread_state(user_id)
+            if not tracker:
+                return self.error_response.server_error("Failed to get fetch tracker")
+            
+            return self.response.unread_count_response(
+                unread_count=tracker.unread_count,
+                last_read_at=tracker.last_read_at
+            )
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Error in get_unread_count_interactor: {e}")
+            return self.error_response.server_error(str(e))
@@ -0,0 +1,58 @@
+"""
+Interactor for moving the notification read watermark.
+"""
+from typing import Optional
+from django.utils import timezone
+from rest_framework.response import Response
+from project_notifications.storage import NotificationDB
+from project_notifications.presenters.notification_read_response import NotificationReadResponse
+from project_notifications.presenters.notification_error_response import NotificationErrorResponse
+
+
+class MarkNotificationsReadInteractor:
+    """Interactor for marking notifications as read."""
+    
+    def __init__(
+        self,
+        storage: NotificationDB,
+        response: NotificationReadResponse,
+        error_response: NotificationErrorResponse
+    ):
+        self.storage = storage
+        self.response = response
+        self.error_response = error_response
+    
+    def mark_notifications_read_interactor(
+        self,
+        user_id: str,
+        notification_id: Optional[str] = None
+    ) -> Response:
+        """
+        Mark notifications as read up to a point.
+        
+        Args:
+            user_id: ID of the user
+            notification_id: Newest notification the client has shown; it and
+                everything older become read. Marks everything read when omitted.
+        """
+        try:
+            read_up_to = timezone.now()
+            if notification_id:
+                notification = self.storage.get_user_notification(user_id, notification_id)
+                if notification is None:
+                    return self.response.notification_not_found_response()
+                read_up_to = notification.created_at
+            
+            tracker = self.storage.mark_notifications_read(user_id, read_up_to)
+            if not tracker:
+                return self.error_response.server_error("Failed to get fetch tracker")
+            
+            return self.response.notifications_marked_read_response(
+                unread_count=tracker.unread_count,
+                last_read_at=tracker.last_read_at
+            )
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Error in mark_notifications_read_interactor: {e}")
+            return self.error_response.server_error(str(e))
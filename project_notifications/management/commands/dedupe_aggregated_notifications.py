@@ -0,0 +1,47 @@
+"""
+Merge duplicate aggregated (like) notifications.
+
+Before the unique_aggregated_notification constraint, two concurrent first
+likes on the same target could each create a notification. The migration
+adding the constraint fails while such duplicates exist, so run this first:
+each aggregation key is collapsed into its newest notification, with the
+actor counts summed and the recent actors merged.
+
+Unread counters of affected users are reset and recounted on next read.
+
+Usage:
+    python manage.py dedupe_aggregated_notifications
+    python manage.py dedupe_aggregated_notifications --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from project_notifications.storage import NotificationDB
+
+
+class Command(BaseCommand):
+    help = "Merge duplicate like notifications so the unique aggregation constraint can be applied"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report duplicate groups, do not write"
+        )
+
+    def handle(self, *args, **options):
+        storage = NotificationDB()
+        groups = storage.get_duplicate_aggregated_groups()
+        if options['dry_run']:
+            self.stdout.write(f"Found {len(groups)} duplicated aggregation key(s)")
+            return
+
+        merged = 0
+        for recipient_pk, notification_type, target_type, target_id in groups:
+            close_old_connections()
+            merged += storage.merge_aggregated_notifications(
+                recipient_pk, notification_type, target_type, target_id
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {merged} duplicate notification(s) across {len(groups)} aggregation key(s)"
+        ))
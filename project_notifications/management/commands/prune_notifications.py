@@ -0,0 +1,116 @@
+"""
+Prune and compact notifications.
+
+Two passes, each in short, bounded transactions so the notification table
+stays writable while the job runs:
+1. Purge: delete notifications older than the retention period, oldest first.
+2. Compact: collapse NEW_MESSAGE notifications older than the compaction
+   age into one per recipient and conversation (the newest one, with
+   messages_count in its metadata).
+
+Unread counters of affected users are reset and recounted on next read.
+Meant to run periodically (e.g. nightly from cron).
+
+Usage:
+    python manage.py prune_notifications
+    python manage.py prune_notifications --retention-days 30 --compaction-days 3
+    python manage.py prune_notifications --dry-run
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+from project_notifications.storage import NotificationDB
+
+
+class Command(BaseCommand):
+    help = "Delete expired notifications and collapse old message notifications per conversation"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help=f"Delete notifications older than this (default: {settings.NOTIFICATION_RETENTION_DAYS})"
+        )
+        parser.add_argument(
+            '--compaction-days',
+            type=int,
+            default=settings.NOTIFICATION_MESSAGE_COMPACTION_DAYS,
+            help=f"Compact message notifications older than this (default: {settings.NOTIFICATION_MESSAGE_COMPACTION_DAYS})"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Rows deleted per transaction (default: 1000)"
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.05,
+            help="Seconds to sleep between transactions, to leave room for other writers (default: 0.05)"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report what would be deleted, do not write"
+        )
+
+    def handle(self, *args, **options):
+        if options['retention_days'] < 1 or options['compaction_days'] < 1:
+            raise CommandError("--retention-days and --compaction-days must be at least 1")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        storage = NotificationDB()
+        now = timezone.now()
+        retention_cutoff = now - timedelta(days=options['retention_days'])
+        compaction_cutoff = now - timedelta(days=options['compaction_days'])
+
+        purged = self._purge(storage, retention_cutoff, options)
+        self.stdout.write(f"Purge: {'would delete' if options['dry_run'] else 'deleted'} {purged} notification(s)")
+
+        compacted, groups = self._compact(storage, compaction_cutoff, options)
+        self.stdout.write(
+            f"Compaction: {'would delete' if options['dry_run'] else 'deleted'} {compacted} "
+            f"message notification(s) across {groups} conversation(s)"
+        )
+
+        self.stdout.write(self.style.SUCCESS("Notification pruning complete"))
+
+    def _purge(self, storage: NotificationDB, cutoff, options) -> int:
+        if options['dry_run']:
+            return storage.count_notifications_older_than(cutoff)
+
+        purged = 0
+        while True:
+            close_old_connections()
+            deleted = storage.purge_notifications_batch(cutoff, options['batch_size'])
+            if not deleted:
+                return purged
+            purged += deleted
+            time.sleep(options['pause'])
+
+    def _compact(self, storage: NotificationDB, cutoff, options) -> tuple:
+        groups = storage.get_compactable_message_groups(cutoff)
+        if options['dry_run']:
+            return sum(total - 1 for _, _, total in groups), len(groups)
+
+        compacted = 0
+        since_pause = 0
+        for recipient_pk, conversation_id, _ in groups:
+            close_old_connections()
+            deleted = storage.compact_message_notifications(
+                recipient_pk, conversation_id, cutoff, options['batch_size']
+            )
+            compacted += deleted
+            since_pause += deleted
+            # Most groups are small; pause once per batch_size deleted rows, not per group
+            if since_pause >= options['batch_size']:
+                since_pause = 0
+                time.sleep(options['pause'])
+        return compacted, len(groups)
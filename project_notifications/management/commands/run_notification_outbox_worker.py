@@ -0,0 +1,69 @@
+"""
+Create and broadcast notifications recorded in the outbox (NotificationOutbox rows).
+
+Signal handlers only write outbox rows; this worker turns them into
+notifications in batches. Several workers can run side by side: a batch is
+claimed with SELECT ... FOR UPDATE SKIP LOCKED (where the database supports
+it), so an event is never processed twice concurrently.
+
+Usage:
+    python manage.py run_notification_outbox_worker
+    python manage.py run_notification_outbox_worker --once
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from project_notifications.storage import NotificationDB
+from project_notifications.interactors.drain_notification_outbox_interactor import DrainNotificationOutboxInteractor
+
+
+class Command(BaseCommand):
+    help = "Run the notification outbox worker (creates, aggregates and broadcasts notifications)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Drain the outbox and exit instead of polling forever"
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=0.5,
+            help="Seconds to sleep when the outbox is empty (default: 0.5)"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help="Events processed per transaction (default: 200)"
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help="Failures after which an event is left in the outbox for inspection (default: 5)"
+        )
+
+    def handle(self, *args, **options):
+        interactor = DrainNotificationOutboxInteractor(storage=NotificationDB())
+
+        self.stdout.write("Notification outbox worker started")
+
+        while True:
+            close_old_connections()
+
+            processed = interactor.drain_notification_outbox_interactor(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts']
+            )
+            if processed:
+                self.stdout.write(f"Processed {processed} outbox event(s)")
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
+
+        self.stdout.write(self.style.SUCCESS("Notification outbox drained"))
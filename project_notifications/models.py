@@ -14,6 +14,14 @@ class NotificationTypeChoices(models.TextChoices):
     COMMENT_ON_PRAYER_REQUEST = "COMMENT_ON_PRAYER_REQUEST", "Comment on Prayer Request"
 
 
+# Types aggregated into one notification per (recipient, target)
+AGGREGATED_NOTIFICATION_TYPES = [
+    NotificationTypeChoices.POST_LIKE,
+    NotificationTypeChoices.COMMENT_LIKE,
+    NotificationTypeChoices.PRAYER_REQUEST_LIKE,
+]
+
+
 class Notification(models.Model):
     notification_id = models.UUIDField(
         primary_key=True,
@@ -55,10 +63,14 @@ class Notification(models.Model):
         help_text="For message notifications"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    actors_count = models.PositiveIntegerField(
+        default=1,
+        help_text="Distinct actors of an aggregated notification (incremented atomically)"
+    )
     metadata = models.JSONField(
         default=dict,
         blank=True,
-        help_text="For storing aggregated data (actors_count, actors list, last_actor_id)"
+        help_text="For storing aggregated data (recent actors list, last_actor_id)"
     )
 
     class Meta:
@@ -68,13 +80,25 @@ class Notification(models.Model):
             models.Index(fields=['recipient', 'created_at']),
             models.Index(fields=['created_at']),
         ]
+        constraints = [
+            # One aggregated notification per target, so concurrent likes
+            # can't create duplicates and updates never need a lock
+            models.UniqueConstraint(
+                fields=['recipient', 'notification_type', 'target_type', 'target_id'],
+                condition=models.Q(notification_type__in=AGGREGATED_NOTIFICATION_TYPES),
+                name='unique_aggregated_notification'
+            ),
+        ]
 
     def __str__(self):
         return f"Notification {self.notification_id} - {self.notification_type} for {self.recipient}"
 
 
 class NotificationFetchTracker(models.Model):
-    """Tracks when each user last fetched their notifications."""
+    """
+    Tracks when each user last fetched their notifications, and the read
+    watermark: notifications created after last_read_at are unread.
+    """
     tracker_id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -86,6 +110,12 @@ class NotificationFetchTracker(models.Model):
         related_name="notification_fetch_tracker"
     )
     last_fetch_at = models.DateTimeField(null=True, blank=True)
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    unread_count = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Notifications created after last_read_at; incremented on create, null until first computed"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -97,3 +127,41 @@ class NotificationFetchTracker(models.Model):
 
     def __str__(self):
         return f"FetchTracker for {self.user.user_name} - Last fetch: {self.last_fetch_at}"
+
+
+class NotificationOutboxEventChoices(models.TextChoices):
+    FOLLOW = "FOLLOW", "Follow"
+    REACTION = "REACTION", "Reaction"
+    MESSAGE = "MESSAGE", "Message"
+
+
+class NotificationOutbox(models.Model):
+    """
+    Notification work recorded by the signal handlers, in the same transaction
+    as the follow, reaction or message that caused it.
+
+    The run_notification_outbox_worker command creates, aggregates and
+    broadcasts the notifications in batches and deletes the processed rows.
+    """
+    outbox_id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(
+        max_length=20,
+        choices=NotificationOutboxEventChoices.choices
+    )
+    payload = models.JSONField(
+        default=dict,
+        help_text="Primary keys of the objects involved (see notification_signals)"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'project_notifications_outbox'
+        ordering = ['outbox_id']
+        indexes = [
+            models.Index(fields=['attempts', 'outbox_id']),
+        ]
+
+    def __str__(self):
+        return f"Outbox {self.outbox_id} - {self.event_type}"
@@ -26,6 +26,25 @@ class GetNotificationsResponse:
             status=status.HTTP_200_OK
         )
     
+    @staticmethod
+    def notifications_page_response(
+        notifications: List[Dict[str, Any]],
+        pagination_data: Dict[str, Any],
+        unread_count: int
+    ) -> Response:
+        """Return one page of the notification history."""
+        return Response(
+            {
+                "success": True,
+                "data": {
+                    "notifications": notifications,
+                    "unread_count": unread_count,
+                    "pagination": pagination_data
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+    
     @staticmethod
     def validation_error_response(error_message: str) -> Response:
         """Return validation error response."""
@@ -0,0 +1,52 @@
+"""
+Response presenter for the notification read watermark and unread count.
+"""
+from datetime import datetime
+from typing import Optional
+from rest_framework.response import Response
+from rest_framework import status
+
+
+class NotificationReadResponse:
+    """Response formatting for unread counts and marking notifications read."""
+    
+    @staticmethod
+    def unread_count_response(unread_count: int, last_read_at: Optional[datetime]) -> Response:
+        """Return the user's unread notification count."""
+        return Response(
+            {
+                "success": True,
+                "data": {
+                    "unread_count": unread_count,
+                    "last_read_at": last_read_at.isoformat() if last_read_at else None
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    @staticmethod
+    def notifications_marked_read_response(unread_count: int, last_read_at: Optional[datetime]) -> Response:
+        """Return the read watermark after marking notifications read."""
+        return Response(
+            {
+                "success": True,
+                "message": "Notifications marked as read",
+                "data": {
+                    "unread_count": unread_count,
+                    "last_read_at": last_read_at.isoformat() if last_read_at else None
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    @staticmethod
+    def notification_not_found_response() -> Response:
+        """Return notification not found response."""
+        return Response(
+            {
+                "success": False,
+                "error": "Notification not found",
+                "error_code": "NOTIFICATION_NOT_FOUND"
+            },
+            status=status.HTTP_404_NOT_FOUND
+        )
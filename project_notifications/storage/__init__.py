@@ -4,14 +4,27 @@ Storage layer for notification-related database operations.
 Follows the existing storage pattern for database interactions.
 """
 import uuid
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional
-from django.db.models import Q
-from project_notifications.models import Notification, NotificationFetchTracker, NotificationTypeChoices
+from typing import Dict, List, Optional, Tuple
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from project_notifications.models import (
+    AGGREGATED_NOTIFICATION_TYPES,
+    Notification,
+    NotificationFetchTracker,
+    NotificationOutbox,
+    NotificationTypeChoices,
+)
 from bible_way.models import User
+from bible_way.utils.pagination import decode_cursor, encode_cursor
 from project_chat.models import ConversationMember
 from django.utils import timezone
 
+# Recent likers kept in an aggregated notification's metadata (the total is in actors_count)
+MAX_RECENT_ACTORS = 10
+
 
 class NotificationDB:
     """Database operations for notification functionality."""
@@ -48,6 +61,7 @@ class NotificationDB:
                     'last_actor_id': actor_id
                 }
             )
+            self._increment_unread_counts([recipient.pk])
             return notification
         except (User.DoesNotExist, ValueError, TypeError) as e:
             import logging
@@ -55,29 +69,344 @@ class NotificationDB:
             logger.error(f"Error creating notification: {e}")
             return None
     
+    def bulk_create_message_notifications(self, message) -> List[Notification]:
+        """
+        Create NEW_MESSAGE notifications for every active member of the
+        message's conversation except the sender, in one bulk insert.
+        
+        Returns the created notifications with recipient and actor loaded.
+        """
+        sender = message.sender
+        sender_id = str(sender.user_id)
+        members = ConversationMember.objects.filter(
+            conversation_id=message.conversation_id,
+            left_at__isnull=True
+        ).exclude(user_id=sender.pk).select_related('user')
+        
+        notifications = [
+            Notification(
+                recipient=member.user,
+                notification_type=NotificationTypeChoices.NEW_MESSAGE,
+                actor=sender,
+                target_id=str(message.conversation_id),
+                target_type='conversation',
+                conversation_id=message.conversation_id,
+                message_id=message.id,
+                metadata={
+                    'actors_count': 1,
+                    'actors': [sender_id],
+                    'last_actor_id': sender_id
+                }
+            )
+            for member in members
+        ]
+        if not notifications:
+            return []
+        notifications = Notification.objects.bulk_create(notifications)
+        self._increment_unread_counts([notification.recipient_id for notification in notifications])
+        return notifications
+    
+    def enqueue_outbox_event(self, event_type: str, payload: Dict) -> NotificationOutbox:
+        """Record notification work; runs inside the caller's transaction."""
+        return NotificationOutbox.objects.create(event_type=event_type, payload=payload)
+    
+    def claim_outbox_events(self, limit: int, max_attempts: int) -> List[NotificationOutbox]:
+        """
+        Oldest pending outbox events, locked for the current transaction.
+        
+        Rows locked by another worker are skipped; events that failed
+        max_attempts times are left for inspection.
+        """
+        return list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True).filter(
+                attempts__lt=max_attempts
+            ).order_by('outbox_id')[:limit]
+        )
+    
+    def delete_outbox_events(self, outbox_ids: List[int]) -> None:
+        NotificationOutbox.objects.filter(outbox_id__in=outbox_ids).delete()
+    
+    def record_outbox_failure(self, outbox_ids: List[int], error_message: str) -> None:
+        NotificationOutbox.objects.filter(outbox_id__in=outbox_ids).update(
+            attempts=F('attempts') + 1,
+            last_error=error_message
+        )
+    
+    def bulk_create_follow_notifications(self, follows: List[tuple]) -> List[Notification]:
+        """Create FOLLOW notifications for (follower, followed) User pairs in one bulk insert."""
+        notifications = [
+            Notification(
+                recipient=followed,
+                notification_type=NotificationTypeChoices.FOLLOW,
+                actor=follower,
+                target_id=str(followed.user_id),
+                target_type='user',
+                metadata={
+                    'actors_count': 1,
+                    'actors': [str(follower.user_id)],
+                    'last_actor_id': str(follower.user_id)
+                }
+            )
+            for follower, followed in follows
+        ]
+        if not notifications:
+            return []
+        notifications = Notification.objects.bulk_create(notifications)
+        self._increment_unread_counts([notification.recipient_id for notification in notifications])
+        return notifications
+    
+    def aggregate_like_notification(
+        self,
+        recipient: User,
+        notification_type: str,
+        target_id: str,
+        target_type: str,
+        actors: List[User]
+    ) -> Optional[Notification]:
+        """
+        Add likers to the recipient's notification for a target, creating it if needed.
+        
+        Lock-free: the notification is unique per (recipient, type, target), so
+        a concurrent first like is caught by the constraint, and actors_count
+        is incremented in SQL rather than rewritten from a stale read. Only the
+        capped recent-actors list in metadata is rewritten; under concurrent
+        likes it may miss an entry, but the count never does.
+        """
+        if not actors:
+            return None
+        actor_ids = list(dict.fromkeys(str(actor.user_id) for actor in actors))
+        latest_actor = actors[-1]
+        aggregation_key = {
+            'recipient': recipient,
+            'notification_type': notification_type,
+            'target_id': target_id,
+            'target_type': target_type
+        }
+        
+        notification = Notification.objects.filter(**aggregation_key).first()
+        if notification is None:
+            try:
+                with transaction.atomic():
+                    notification = Notification.objects.create(
+                        **aggregation_key,
+                        actor=latest_actor,
+                        actors_count=len(actor_ids),
+                        metadata={
+                            'actors': actor_ids[-MAX_RECENT_ACTORS:],
+                            'last_actor_id': actor_ids[-1]
+                        }
+                    )
+                    self._increment_unread_counts([recipient.pk])
+                    return notification
+            except IntegrityError:
+                # Created by a concurrent like; fall through to the update
+                notification = Notification.objects.get(**aggregation_key)
+        
+        metadata = notification.metadata or {}
+        recent_actor_ids = metadata.get('actors', [])
+        # Actors already in the recent list are re-likes and don't count again
+        new_actor_ids = [actor_id for actor_id in actor_ids if actor_id not in recent_actor_ids]
+        recent_actor_ids = [actor_id for actor_id in recent_actor_ids if actor_id not in actor_ids] + actor_ids
+        metadata['actors'] = recent_actor_ids[-MAX_RECENT_ACTORS:]
+        metadata['last_actor_id'] = actor_ids[-1]
+        
+        actors_count = F('actors_count')
+        legacy_count = metadata.pop('actors_count', None)  # Kept in the actors_count column
+        if legacy_count is not None:
+            # Rows aggregated before the column existed hold the real count in
+            # metadata while the column has its default; carry it over
+            actors_count = Greatest(actors_count, legacy_count)
+        
+        Notification.objects.filter(pk=notification.pk).update(
+            actors_count=actors_count + len(new_actor_ids),
+            actor=latest_actor,
+            metadata=metadata
+        )
+        notification.refresh_from_db(fields=['actors_count', 'metadata'])
+        notification.actor = latest_actor
+        return notification
+    
     def get_user_notifications(
         self,
         user_id: str,
-        last_fetch_time: Optional[datetime] = None
+        last_fetch_time: Optional[datetime] = None,
+        limit: int = 100
     ) -> tuple[List[Notification], int]:
-        """Get notifications for a user based on last fetch time."""
+        """
+        Get notifications for a user based on last fetch time, newest first.
+        
+        At most limit rows: the newest ones on the first call (no
+        last_fetch_time), otherwise the oldest ones created after
+        last_fetch_time, so a caller can resume from the newest returned.
+        """
         try:
             user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
             
-            query = Notification.objects.filter(recipient__user_id=user_uuid)
+            query = Notification.objects.filter(recipient__user_id=user_uuid).select_related('recipient', 'actor')
             
-            # If last_fetch_time is provided, return only notifications created after it
             if last_fetch_time:
-                query = query.filter(created_at__gt=last_fetch_time)
-            # If None, return all notifications (first call)
-            
-            notifications = query.select_related('recipient', 'actor').order_by('-created_at')
-            total_count = notifications.count()
+                notifications = list(query.filter(created_at__gt=last_fetch_time).order_by('created_at')[:limit])
+                notifications.reverse()
+            else:
+                notifications = list(query.order_by('-created_at')[:limit])
             
-            return list(notifications), total_count
+            return notifications, len(notifications)
         except (ValueError, TypeError):
             return [], 0
     
+    def get_user_notifications_page(
+        self,
+        user_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        Keyset-paginated notification history ordered by (created_at, notification_id) descending.
+        
+        Args:
+            user_id: ID of the recipient
+            limit: Page size
+            cursor: Opaque cursor from a previous page's next_cursor (None for the first page)
+        
+        Returns:
+            Dictionary with:
+            - notifications: List of Notification objects
+            - limit: Page size
+            - next_cursor: Cursor for the next page, or None on the last page
+            - has_next: Whether another page exists
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+        queryset = Notification.objects.filter(recipient__user_id=user_uuid)
+        
+        if cursor:
+            cursor_created_at, cursor_notification_id = decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=cursor_created_at) |
+                Q(created_at=cursor_created_at, notification_id__lt=cursor_notification_id)
+            )
+        
+        # Fetch one extra row to know whether a next page exists without a COUNT
+        notifications = list(
+            queryset.select_related('recipient', 'actor').order_by('-created_at', '-notification_id')[:limit + 1]
+        )
+        has_next = len(notifications) > limit
+        notifications = notifications[:limit]
+        
+        next_cursor = None
+        if has_next and notifications:
+            next_cursor = encode_cursor(notifications[-1].created_at, notifications[-1].notification_id)
+        
+        return {
+            'notifications': notifications,
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'has_next': has_next
+        }
+    
+    def get_user_notification(self, user_id: str, notification_id: str) -> Optional[Notification]:
+        """Get one of the user's notifications, or None if it does not exist or belongs to someone else."""
+        try:
+            user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+            notif_uuid = uuid.UUID(notification_id) if isinstance(notification_id, str) else notification_id
+            return Notification.objects.filter(
+                recipient__user_id=user_uuid,
+                notification_id=notif_uuid
+            ).first()
+        except (ValueError, TypeError):
+            return None
+    
+    def _count_unread(self, tracker: NotificationFetchTracker) -> int:
+        query = Notification.objects.filter(recipient_id=tracker.user_id)
+        if tracker.last_read_at:
+            query = query.filter(created_at__gt=tracker.last_read_at)
+        return query.count()
+    
+    def _unread_count_subquery(self, last_read_at: Optional[datetime]):
+        """
+        Unread count of the tracker row being updated, as an expression.
+        
+        Recounting inside the UPDATE that stores the count leaves no window
+        in which a concurrent F('unread_count') + n is overwritten.
+        """
+        query = Notification.objects.filter(recipient_id=OuterRef('user_id'))
+        if last_read_at:
+            query = query.filter(created_at__gt=last_read_at)
+        return Coalesce(
+            Subquery(
+                query.order_by().values('recipient_id').annotate(total=Count('pk')).values('total')[:1],
+                output_field=IntegerField()
+            ),
+            0
+        )
+    
+    def _increment_unread_counts(self, recipient_pks: List[int]) -> None:
+        """
+        Add new notifications to their recipients' unread counters.
+        
+        One UPDATE per distinct increment (usually just one). Counters that
+        were never computed stay null, since NULL + n is NULL, and are
+        counted from the database on first read.
+        """
+        recipients_by_delta: Dict[int, List[int]] = {}
+        for recipient_pk, delta in Counter(recipient_pks).items():
+            recipients_by_delta.setdefault(delta, []).append(recipient_pk)
+        for delta, pks in recipients_by_delta.items():
+            NotificationFetchTracker.objects.filter(user__in=pks).update(
+                unread_count=F('unread_count') + delta
+            )
+    
+    def get_unread_state(self, user_id: str) -> Optional[NotificationFetchTracker]:
+        """
+        Get the user's tracker with unread_count filled in.
+        
+        The counter is maintained on create and reset on read, so this is a
+        single-row read; notifications are only counted the first time.
+        """
+        tracker = self.get_or_create_fetch_tracker(user_id)
+        if tracker is None:
+            return None
+        return self._fill_unread_count(tracker)
+    
+    def _fill_unread_count(self, tracker: NotificationFetchTracker) -> NotificationFetchTracker:
+        if tracker.unread_count is None:
+            NotificationFetchTracker.objects.filter(
+                pk=tracker.pk,
+                unread_count__isnull=True,
+                last_read_at=tracker.last_read_at
+            ).update(unread_count=self._unread_count_subquery(tracker.last_read_at))
+            tracker.refresh_from_db(fields=['last_read_at', 'unread_count'])
+            if tracker.unread_count is None:
+                # Nulled again meanwhile (e.g. by pruning); count without storing
+                tracker.unread_count = self._count_unread(tracker)
+        return tracker
+    
+    def mark_notifications_read(self, user_id: str, read_up_to: datetime) -> Optional[NotificationFetchTracker]:
+        """
+        Move the user's read watermark to read_up_to and recount what is still unread.
+        
+        The watermark never moves backwards. Recounting only scans
+        notifications newer than the watermark (usually none), and repairs
+        any drift in the maintained counter.
+        """
+        tracker = self.get_or_create_fetch_tracker(user_id)
+        if tracker is None:
+            return None
+        if tracker.last_read_at and tracker.last_read_at >= read_up_to:
+            return self._fill_unread_count(tracker)
+        
+        NotificationFetchTracker.objects.filter(pk=tracker.pk).filter(
+            Q(last_read_at__isnull=True) | Q(last_read_at__lt=read_up_to)
+        ).update(
+            last_read_at=read_up_to,
+            unread_count=self._unread_count_subquery(read_up_to),
+            updated_at=timezone.now()
+        )
+        tracker.refresh_from_db(fields=['last_read_at', 'unread_count', 'updated_at'])
+        return self._fill_unread_count(tracker)
+    
     def get_or_create_fetch_tracker(self, user_id: str) -> Optional[NotificationFetchTracker]:
         """Get or create NotificationFetchTracker for a user."""
         try:
@@ -123,7 +452,7 @@ class NotificationDB:
             user_uuid = uuid.UUID(recipient_id) if isinstance(recipient_id, str) else recipient_id
             
             # Only aggregate like notifications
-            if notification_type not in ['POST_LIKE', 'COMMENT_LIKE', 'PRAYER_REQUEST_LIKE']:
+            if notification_type not in AGGREGATED_NOTIFICATION_TYPES:
                 return None
             
             notification = Notification.objects.filter(
@@ -147,23 +476,13 @@ class NotificationDB:
             actor_uuid = uuid.UUID(actor_id) if isinstance(actor_id, str) else actor_id
             actor = User.objects.get(user_id=actor_uuid)
             
-            metadata = notification.metadata or {}
-            actors = metadata.get('actors', [])
-            
-            # Add actor if not already in list
-            if actor_id not in actors:
-                actors.append(actor_id)
-            
-            # Update metadata
-            metadata['actors_count'] = len(actors)
-            metadata['actors'] = actors
-            metadata['last_actor_id'] = actor_id
-            
-            notification.metadata = metadata
-            notification.actor = actor  # Update to latest actor
-            notification.save()
-            
-            return notification
+            return self.aggregate_like_notification(
+                recipient=notification.recipient,
+                notification_type=notification.notification_type,
+                target_id=notification.target_id,
+                target_type=notification.target_type,
+                actors=[actor]
+            )
         except (User.DoesNotExist, ValueError, TypeError) as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -185,7 +504,203 @@ class NotificationDB:
         """Delete a notification (for cleanup)."""
         try:
             notif_uuid = uuid.UUID(notification_id) if isinstance(notification_id, str) else notification_id
-            Notification.objects.filter(notification_id=notif_uuid).delete()
+            notification = Notification.objects.filter(notification_id=notif_uuid).first()
+            if notification is None:
+                return True
+            notification.delete()
+            
+            # Uncount it if it was still unread
+            NotificationFetchTracker.objects.filter(
+                user_id=notification.recipient_id,
+                unread_count__gt=0
+            ).filter(
+                Q(last_read_at__isnull=True) | Q(last_read_at__lt=notification.created_at)
+            ).update(unread_count=F('unread_count') - 1)
             return True
         except (ValueError, TypeError):
             return False
+    
+    def _invalidate_unread_counts(self, recipient_pks: List[int], newest_deleted_at: datetime) -> None:
+        """
+        Drop the counters of recipients who may have lost unread notifications.
+        
+        Nulled counters are recounted from the database on next read, which
+        is cheaper than working out per recipient which deleted rows were unread.
+        """
+        NotificationFetchTracker.objects.filter(user__in=set(recipient_pks)).filter(
+            Q(last_read_at__isnull=True) | Q(last_read_at__lt=newest_deleted_at)
+        ).update(unread_count=None)
+    
+    def get_duplicate_aggregated_groups(self) -> List[Tuple[int, str, str, str]]:
+        """
+        Get (recipient_pk, notification_type, target_type, target_id) for every
+        aggregation key held by more than one notification.
+        
+        Duplicates come from concurrent first likes before the
+        unique_aggregated_notification constraint existed; they must be merged
+        before that constraint can be applied.
+        """
+        return list(
+            Notification.objects.filter(notification_type__in=AGGREGATED_NOTIFICATION_TYPES)
+            .order_by()
+            .values('recipient_id', 'notification_type', 'target_type', 'target_id')
+            .annotate(total=Count('pk'))
+            .filter(total__gt=1)
+            .values_list('recipient_id', 'notification_type', 'target_type', 'target_id')
+        )
+    
+    def merge_aggregated_notifications(
+        self,
+        recipient_pk: int,
+        notification_type: str,
+        target_type: str,
+        target_id: str
+    ) -> int:
+        """
+        Merge the notifications sharing one aggregation key into the newest.
+        
+        The survivor keeps the newest actor, gets the summed actor counts
+        (column or legacy metadata count, whichever is larger per row) and the
+        union of the recent actors. Returns the number of rows deleted.
+        """
+        with transaction.atomic():
+            rows = list(
+                Notification.objects.select_for_update().filter(
+                    recipient_id=recipient_pk,
+                    notification_type=notification_type,
+                    target_type=target_type,
+                    target_id=target_id
+                ).order_by('created_at', 'notification_id')
+            )
+            if len(rows) < 2:
+                return 0
+            survivor, duplicates = rows[-1], rows[:-1]
+            
+            actors_count = 0
+            actor_ids = []
+            for row in rows:
+                row_metadata = row.metadata or {}
+                actors_count += max(row.actors_count, row_metadata.get('actors_count', 0))
+                for actor_id in row_metadata.get('actors', []):
+                    # Oldest rows first, so the newest actors end up at the end
+                    if actor_id in actor_ids:
+                        actor_ids.remove(actor_id)
+                    actor_ids.append(actor_id)
+            
+            metadata = survivor.metadata or {}
+            metadata.pop('actors_count', None)  # Kept in the actors_count column
+            metadata['actors'] = actor_ids[-MAX_RECENT_ACTORS:]
+            if actor_ids:
+                metadata['last_actor_id'] = metadata.get('last_actor_id') or actor_ids[-1]
+            
+            Notification.objects.filter(pk__in=[row.pk for row in duplicates]).delete()
+            Notification.objects.filter(pk=survivor.pk).update(
+                actors_count=actors_count,
+                metadata=metadata
+            )
+            self._invalidate_unread_counts([recipient_pk], duplicates[-1].created_at)
+        return len(duplicates)
+    
+    def count_notifications_older_than(self, cutoff: datetime) -> int:
+        return Notification.objects.filter(created_at__lt=cutoff).count()
+    
+    def purge_notifications_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Delete up to batch_size of the oldest notifications created before cutoff.
+        
+        Returns the number of rows deleted (0 when nothing is left). Each call
+        is one short transaction on primary keys, so the table stays writable.
+        """
+        with transaction.atomic():
+            rows = list(
+                Notification.objects.filter(created_at__lt=cutoff)
+                .order_by('created_at')
+                .values_list('pk', 'recipient_id', 'created_at')[:batch_size]
+            )
+            if not rows:
+                return 0
+            Notification.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+            self._invalidate_unread_counts([recipient_pk for _, recipient_pk, _ in rows], rows[-1][2])
+        return len(rows)
+    
+    def get_compactable_message_groups(self, cutoff: datetime) -> List[Tuple[int, int, int]]:
+        """
+        Get (recipient_pk, conversation_id, count) for every recipient and
+        conversation with more than one NEW_MESSAGE notification created before cutoff.
+        
+        Read once up front (one aggregate, no row locks) so the table is not
+        scanned again for every compacted group.
+        """
+        return list(
+            Notification.objects.filter(
+                notification_type=NotificationTypeChoices.NEW_MESSAGE,
+                created_at__lt=cutoff
+            )
+            .order_by()
+            .values('recipient_id', 'conversation_id')
+            .annotate(total=Count('pk'))
+            .filter(total__gt=1)
+            .values_list('recipient_id', 'conversation_id', 'total')
+        )
+    
+    def compact_message_notifications(
+        self,
+        recipient_pk: int,
+        conversation_id: int,
+        cutoff: datetime,
+        batch_size: int
+    ) -> int:
+        """
+        Collapse a recipient's NEW_MESSAGE notifications for one conversation,
+        created before cutoff, into the newest of them.
+        
+        The survivor's metadata gets messages_count (messages it now stands
+        for) and the recent senders. Rows are deleted at most batch_size per
+        transaction. Returns the number of rows deleted.
+        """
+        old_notifications = Notification.objects.filter(
+            recipient_id=recipient_pk,
+            notification_type=NotificationTypeChoices.NEW_MESSAGE,
+            conversation_id=conversation_id,
+            created_at__lt=cutoff
+        )
+        survivor = old_notifications.order_by('-created_at', '-notification_id').first()
+        if survivor is None:
+            return 0
+        
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    old_notifications.exclude(pk=survivor.pk)
+                    .order_by('-created_at')
+                    .values_list('pk', 'created_at', 'metadata')[:batch_size]
+                )
+                if not rows:
+                    break
+                
+                metadata = survivor.metadata or {}
+                messages_count = metadata.get('messages_count', 1)
+                actor_ids = list(metadata.get('actors', []))
+                for _, _, row_metadata in rows:
+                    row_metadata = row_metadata or {}
+                    # Rows compacted by an earlier run already stand for several messages
+                    messages_count += row_metadata.get('messages_count', 1)
+                    for actor_id in row_metadata.get('actors', []):
+                        if actor_id not in actor_ids:
+                            # Older senders go first so the newest stay at the end
+                            actor_ids.insert(0, actor_id)
+                metadata['messages_count'] = messages_count
+                metadata['actors'] = actor_ids[-MAX_RECENT_ACTORS:]
+                survivor.metadata = metadata
+                survivor.actors_count = max(survivor.actors_count, len(actor_ids))
+                
+                Notification.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+                Notification.objects.filter(pk=survivor.pk).update(
+                    metadata=survivor.metadata,
+                    actors_count=survivor.actors_count
+                )
+                # Rows are newest first, so the first one bounds what may have been unread
+                self._invalidate_unread_counts([recipient_pk], rows[0][1])
+            deleted += len(rows)
+        return deleted
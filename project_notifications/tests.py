@@ -0,0 +1,52 @@
+from django.test import TestCase
+from bible_way.models import User, Post, Reaction
+from project_notifications.models import Notification, NotificationOutbox, NotificationTypeChoices
+from project_notifications.storage import NotificationDB
+from project_notifications.interactors.drain_notification_outbox_interactor import DrainNotificationOutboxInteractor
+
+
+def make_user(name: str) -> User:
+    return User.objects.create_user(
+        username=name,
+        user_name=name,
+        email=f"{name}@example.com",
+        country="US"
+    )
+
+
+class DrainNotificationOutboxLikeTests(TestCase):
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.post = Post.objects.create(user=self.owner, title="Post")
+        self.interactor = DrainNotificationOutboxInteractor(storage=NotificationDB())
+
+    def test_like_notifies_owner_who_is_not_an_actor_in_the_batch(self):
+        liker = make_user("liker")
+        Reaction.objects.create(user=liker, post=self.post, reaction_type=Reaction.LIKE)
+
+        self.interactor.drain_notification_outbox_interactor()
+
+        notification = Notification.objects.get(recipient=self.owner)
+        self.assertEqual(notification.notification_type, NotificationTypeChoices.POST_LIKE)
+        self.assertEqual(notification.target_id, str(self.post.post_id))
+        self.assertEqual(notification.actor, liker)
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    def test_likes_in_one_batch_are_aggregated(self):
+        likers = [make_user(f"liker{index}") for index in range(3)]
+        for liker in likers:
+            Reaction.objects.create(user=liker, post=self.post, reaction_type=Reaction.LIKE)
+
+        self.interactor.drain_notification_outbox_interactor()
+
+        notification = Notification.objects.get(recipient=self.owner)
+        self.assertEqual(notification.actors_count, 3)
+        self.assertEqual(notification.actor, likers[-1])
+
+    def test_self_like_creates_no_notification(self):
+        Reaction.objects.create(user=self.owner, post=self.post, reaction_type=Reaction.LIKE)
+
+        self.interactor.drain_notification_outbox_interactor()
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(NotificationOutbox.objects.exists())
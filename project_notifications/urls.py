@@ -2,8 +2,10 @@
 URL configuration for project_notifications app.
 """
 from django.urls import path
-from project_notifications.views import get_notifications_view
+from project_notifications.views import get_notifications_view, get_unread_count_view, mark_notifications_read_view
 
 urlpatterns = [
     path('', get_notifications_view, name='get_notifications'),
+    path('unread-count/', get_unread_count_view, name='get_unread_notification_count'),
+    path('read/', mark_notifications_read_view, name='mark_notifications_read'),
 ]
@@ -1,10 +1,55 @@
 """
-Utility function for broadcasting notifications via WebSocket.
+Utility functions for broadcasting notifications via WebSocket.
 """
+import asyncio
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from project_notifications.models import Notification
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+
+def _notification_group(notification: Notification) -> str:
+    recipient_id = str(notification.recipient.user_id).lower()
+    return f"notification_{recipient_id}"
+
+
+def _notification_event(notification: Notification) -> Dict[str, Any]:
+    """Format a notification as a 'notification_new' channel layer event."""
+    # Format notification data
+    metadata = notification.metadata or {}
+    # Column is authoritative; metadata only holds counts of rows aggregated before it existed
+    actors_count = max(notification.actors_count, metadata.get('actors_count', 1))
+    actors = metadata.get('actors', [])
+    
+    # Get actor info
+    actor_data = None
+    if notification.actor:
+        actor_data = {
+            'user_id': str(notification.actor.user_id),
+            'user_name': notification.actor.user_name,
+            'profile_picture_url': notification.actor.profile_picture_url or ''
+        }
+    
+    notification_data = {
+        'notification_id': str(notification.notification_id),
+        'type': notification.notification_type,
+        'actor': actor_data,
+        'actors_count': actors_count,
+        'actors': actors,
+        'target_id': notification.target_id,
+        'target_type': notification.target_type,
+        'conversation_id': notification.conversation_id,
+        'message_id': notification.message_id,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+        'metadata': {**metadata, 'actors_count': actors_count}
+    }
+    
+    return {
+        'type': 'notification_new',
+        'data': {
+            'notification': notification_data
+        }
+    }
 
 
 def broadcast_notification(notification: Notification) -> None:
@@ -19,50 +64,54 @@ def broadcast_notification(notification: Notification) -> None:
         if not channel_layer:
             return
         
-        recipient_id = str(notification.recipient.user_id).lower()
-        group_name = f"notification_{recipient_id}"
-        
-        # Format notification data
-        metadata = notification.metadata or {}
-        actors_count = metadata.get('actors_count', 1)
-        actors = metadata.get('actors', [])
-        last_actor_id = metadata.get('last_actor_id', str(notification.actor.user_id) if notification.actor else None)
-        
-        # Get actor info
-        actor_data = None
-        if notification.actor:
-            actor_data = {
-                'user_id': str(notification.actor.user_id),
-                'user_name': notification.actor.user_name,
-                'profile_picture_url': notification.actor.profile_picture_url or ''
-            }
-        
-        notification_data = {
-            'notification_id': str(notification.notification_id),
-            'type': notification.notification_type,
-            'actor': actor_data,
-            'actors_count': actors_count,
-            'actors': actors,
-            'target_id': notification.target_id,
-            'target_type': notification.target_type,
-            'conversation_id': notification.conversation_id,
-            'message_id': notification.message_id,
-            'created_at': notification.created_at.isoformat() if notification.created_at else None,
-            'metadata': metadata
-        }
-        
         # Send to channel layer group
         async_to_sync(channel_layer.group_send)(
-            group_name,
-            {
-                'type': 'notification_new',
-                'data': {
-                    'notification': notification_data
-                }
-            }
+            _notification_group(notification),
+            _notification_event(notification)
         )
     except Exception as e:
         # Log error but don't break notification creation
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Error broadcasting notification: {e}")
+
+
+def broadcast_notifications(notifications: List[Notification]) -> None:
+    """
+    Broadcast several notifications in one hop to the event loop.
+    
+    All group sends are issued concurrently instead of one blocking
+    async_to_sync call per notification.
+    
+    Args:
+        notifications: The Notification instances to broadcast
+    """
+    if not notifications:
+        return
+    try:
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            return
+        
+        messages = [
+            (_notification_group(notification), _notification_event(notification))
+            for notification in notifications
+        ]
+        
+        async def send_all():
+            return await asyncio.gather(
+                *(channel_layer.group_send(group, event) for group, event in messages),
+                return_exceptions=True
+            )
+        
+        results = async_to_sync(send_all)()
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Error broadcasting {len(failures)} of {len(messages)} notifications: {failures[0]}")
+    except Exception as e:
+        # Log error but don't break notification creation
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Error broadcasting notifications: {e}")
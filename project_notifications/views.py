@@ -1,14 +1,17 @@
 """
 HTTP views for notification operations.
 
-Handles notification retrieval via REST API endpoint.
+Handles notification retrieval, unread counts and read marking via REST API endpoints.
 """
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from project_notifications.storage import NotificationDB
-from project_notifications.interactors.get_notifications_interactor import GetNotificationsInteractor
+from project_notifications.interactors.get_notifications_interactor import GetNotificationsInteractor, DEFAULT_PAGE_SIZE
+from project_notifications.interactors.get_unread_count_interactor import GetUnreadCountInteractor
+from project_notifications.interactors.mark_notifications_read_interactor import MarkNotificationsReadInteractor
 from project_notifications.presenters.get_notifications_response import GetNotificationsResponse
+from project_notifications.presenters.notification_read_response import NotificationReadResponse
 from project_notifications.presenters.notification_error_response import NotificationErrorResponse
 
 
@@ -17,18 +20,73 @@ from project_notifications.presenters.notification_error_response import Notific
 @permission_classes([IsAuthenticated])
 def get_notifications_view(request):
     """
-    Get notifications for current user based on last fetch time.
+    Get notifications for current user.
+    
+    GET /api/notifications/?cursor=&limit=20
+    - `cursor` present (empty for the first page): one page of the full
+      history, newest first, with next_cursor for the following page
     
     GET /api/notifications/
     - First call: Returns all notifications
     - Subsequent calls: Returns only notifications created after last fetch time
     - Automatically updates last fetch time after returning notifications
+    
+    Fetching never marks notifications as read; see mark_notifications_read_view.
     """
     user_id = str(request.user.user_id)
+    limit = request.query_params.get('limit', str(DEFAULT_PAGE_SIZE))
+    # Presence of `cursor` (empty for the first page) switches to keyset pagination
+    cursor = request.query_params.get('cursor')
+    
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        limit = DEFAULT_PAGE_SIZE
     
     response = GetNotificationsInteractor(
         storage=NotificationDB(),
         response=GetNotificationsResponse(),
         error_response=NotificationErrorResponse()
-    ).get_notifications_interactor(user_id=user_id)
+    ).get_notifications_interactor(user_id=user_id, limit=limit, cursor=cursor)
+    return response
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def get_unread_count_view(request):
+    """
+    Get the number of unread notifications for the badge.
+    
+    GET /api/notifications/unread-count/
+    """
+    user_id = str(request.user.user_id)
+    
+    response = GetUnreadCountInteractor(
+        storage=NotificationDB(),
+        response=NotificationReadResponse(),
+        error_response=NotificationErrorResponse()
+    ).get_unread_count_interactor(user_id=user_id)
+    return response
+
+
+@api_view(['POST'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def mark_notifications_read_view(request):
+    """
+    Move the read watermark.
+    
+    POST /api/notifications/read/
+    Body (optional): {"notification_id": "<newest notification shown>"}
+    - Without notification_id: marks everything read
+    """
+    user_id = str(request.user.user_id)
+    notification_id = request.data.get('notification_id')
+    
+    response = MarkNotificationsReadInteractor(
+        storage=NotificationDB(),
+        response=NotificationReadResponse(),
+        error_response=NotificationErrorResponse()
+    ).mark_notifications_read_interactor(user_id=user_id, notification_id=notification_id)
     return response